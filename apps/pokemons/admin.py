@@ -24,6 +24,10 @@ class PokemonTypeInline(admin.TabularInline):
     can_delete = False
     readonly_fields = ["type", "slot"]
 
+    def get_queryset(self, request):
+        # The rows and their titles show the related names
+        return super().get_queryset(request).select_related("pokemon", "type")
+
     def has_add_permission(self, request, obj=None):
         return False
 
@@ -38,6 +42,10 @@ class PokemonAbilityInline(admin.TabularInline):
     verbose_name_plural = "Abilities"
     readonly_fields = ["ability", "slot", "is_hidden"]
 
+    def get_queryset(self, request):
+        # The rows and their titles show the related names
+        return super().get_queryset(request).select_related("pokemon", "ability")
+
     def has_add_permission(self, request, obj=None):
         return False
 
@@ -0,0 +1,233 @@
+import logging
+import math
+import random
+from urllib.parse import urlencode
+
+import factory.random
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max, Min, QuerySet
+from django.urls import reverse
+from pokemons.models import Ability, Pokemon, PokemonAbility, PokemonType, Type
+
+from core.benchmarks.load import Scenario
+from core.caching import bump_dataset_version
+from core.keyset import Cursor, encode_cursor
+
+logger = logging.getLogger(__name__)
+
+HTMX = {"HX-Request": "true"}
+
+# The name filters of the list views, by the model and the field path
+SEARCHES = {
+    "pokemon.name": (Pokemon, "name"),
+    "pokemon.types__name": (Pokemon, "types__name"),
+    "pokemon.abilities__name": (Pokemon, "abilities__name"),
+    "type.name": (Type, "name"),
+    "ability.name": (Ability, "name"),
+}
+# A term matching no name, whose search reads the whole table without an index
+MISSING_TERM = "qzxj"
+
+
+def flush() -> None:
+    """
+    Delete all Pokémon, types and abilities.
+    """
+    PokemonType.objects.all().delete()
+    PokemonAbility.objects.all().delete()
+    Pokemon.objects.all().delete()
+    Type.objects.all().delete()
+    Ability.objects.all().delete()
+    bump_dataset_version()
+
+
+def seed(
+    pokemons: int,
+    types: int = 18,
+    abilities: int = 300,
+    batch_size: int = 5000,
+    seed: int | None = None,
+) -> None:
+    """
+    Bulk insert a synthetic dataset built by the test factories.
+
+    Every Pokémon gets one or two types and one to three abilities, like in
+    PokéAPI. The Pokémon are inserted in batches, each in its own transaction.
+
+    Args:
+        pokemons: The number of Pokémon
+        types: The number of types
+        abilities: The number of abilities
+        batch_size: The number of Pokémon inserted at once
+        seed: The seed of the random data, None for a random seed
+    """
+    # The factories are test utilities, imported only when seeding
+    from tests.factories.pokemons import AbilityFactory, PokemonFactory, TypeFactory
+
+    rng = random.Random(seed)
+    if seed is not None:
+        factory.random.reseed_random(seed)
+
+    type_objects = Type.objects.bulk_create(TypeFactory.build_batch(types))
+    ability_objects = Ability.objects.bulk_create(AbilityFactory.build_batch(abilities))
+
+    for start in range(0, pokemons, batch_size):
+        batch = PokemonFactory.build_batch(min(batch_size, pokemons - start))
+        for pokemon in batch:
+            pokemon.weight = rng.randint(1, 10000)
+            pokemon.height = rng.randint(1, 200)
+        with transaction.atomic():
+            Pokemon.objects.bulk_create(batch)
+            PokemonType.objects.bulk_create(
+                PokemonType(pokemon=pokemon, type=type, slot=slot)
+                for pokemon in batch
+                for slot, type in enumerate(
+                    rng.sample(type_objects, rng.randint(1, min(2, types))), start=1
+                )
+            )
+            PokemonAbility.objects.bulk_create(
+                PokemonAbility(
+                    pokemon=pokemon, ability=ability, slot=slot, is_hidden=slot == 3
+                )
+                for pokemon in batch
+                for slot, ability in enumerate(
+                    rng.sample(ability_objects, rng.randint(1, min(3, abilities))),
+                    start=1,
+                )
+            )
+        logger.info("Benchmark data seeded.", extra={"pokemons": start + len(batch)})
+    bump_dataset_version()
+
+
+def get_scenarios(seed: int | None = None) -> list[Scenario]:
+    """
+    Build the scenarios of the read benchmark from the seeded dataset.
+
+    The scenarios request the lists of the HTML views and the API, their random
+    pages, filtered and ordered lists and the details of random Pokémon.
+
+    Args:
+        seed: The seed of the random requests, None for a random seed
+
+    Returns:
+        The scenarios
+    """
+    rng = random.Random(seed)
+    ids = Pokemon.objects.aggregate(first=Min("id"), last=Max("id"))
+    pages = max(math.ceil(Pokemon.objects.count() / settings.PAGE_SIZE), 1)
+    # Positions of random deep pages of the API in the default ordering
+    cursors = [
+        encode_cursor(["name", "id"], Cursor(values))
+        for values in Pokemon.objects.filter(
+            id__in=[
+                rng.randint(ids["first"] or 1, ids["last"] or 1) for _ in range(100)
+            ]
+        ).values_list("name", "id")
+    ]
+    names = list(Pokemon.objects.values_list("name", flat=True)[:1000]) or ["a"]
+    type_names = list(Type.objects.values_list("name", flat=True)) or ["a"]
+
+    pokemon_list = reverse("pokemons:pokemon_list")
+    typeahead = reverse("pokemons:pokemon_typeahead")
+    api_pokemon_list = reverse("pokemons_api:pokemon-list")
+
+    def pokemon_id() -> int:
+        return rng.randint(ids["first"] or 1, ids["last"] or 1)
+
+    def name_fragment() -> str:
+        return rng.choice(names)[:3]
+
+    def query(path: str, **params) -> str:
+        return f"{path}?{urlencode(params)}"
+
+    return [
+        Scenario("html.pokemon_list", lambda: pokemon_list),
+        Scenario(
+            "html.pokemon_list.page",
+            lambda: query(pokemon_list, page=rng.randint(1, pages)),
+            HTMX,
+        ),
+        Scenario(
+            "html.pokemon_list.filter",
+            lambda: query(pokemon_list, name__icontains=name_fragment()),
+            HTMX,
+        ),
+        Scenario(
+            "html.pokemon_list.type_filter",
+            lambda: query(pokemon_list, types__name__icontains=rng.choice(type_names)),
+            HTMX,
+        ),
+        Scenario(
+            "html.pokemon_list.order",
+            lambda: query(pokemon_list, o="-name", page=rng.randint(1, pages)),
+            HTMX,
+        ),
+        Scenario(
+            "html.pokemon_detail",
+            lambda: reverse("pokemons:pokemon_detail", args=[pokemon_id()]),
+        ),
+        Scenario("html.type_list", lambda: reverse("pokemons:type_list")),
+        Scenario("html.ability_list", lambda: reverse("pokemons:ability_list")),
+        Scenario("html.comparison", lambda: reverse("pokemons:comparison")),
+        Scenario(
+            "html.pokemon_typeahead",
+            lambda: query(typeahead, q=name_fragment()),
+            HTMX,
+        ),
+        Scenario("api.pokemon_list", lambda: api_pokemon_list),
+        Scenario(
+            "api.pokemon_list.page",
+            lambda: query(api_pokemon_list, cursor=rng.choice(cursors), count="false"),
+        ),
+        Scenario(
+            "api.pokemon_list.filter",
+            lambda: query(api_pokemon_list, name__icontains=name_fragment()),
+        ),
+        Scenario(
+            "api.pokemon_list.order",
+            lambda: query(api_pokemon_list, o="-id", count="false"),
+        ),
+        Scenario(
+            "api.pokemon_detail",
+            lambda: reverse("pokemons_api:pokemon-detail", args=[pokemon_id()]),
+        ),
+        Scenario("api.type_list", lambda: reverse("pokemons_api:type-list")),
+        Scenario("api.ability_list", lambda: reverse("pokemons_api:ability-list")),
+    ]
+
+
+def get_search_terms(seed: int | None = None) -> list[str]:
+    """
+    Pick the terms of the search benchmark from the seeded names.
+
+    Returns:
+        A three letter fragment and a whole random Pokémon name, and a term
+        matching no name
+    """
+    rng = random.Random(seed)
+    names = list(Pokemon.objects.values_list("name", flat=True)[:1000]) or ["abc"]
+    name = rng.choice(names).lower()
+    start = rng.randint(0, max(len(name) - 3, 0))
+    return [name[start : start + 3], name, MISSING_TERM]
+
+
+def get_search_queryset(search: str, lookup: str, term: str) -> QuerySet:
+    """
+    Build the query of a name filter, selecting only the IDs of the matches.
+
+    Args:
+        search: The name of the filter, see SEARCHES
+        lookup: The lookup, e.g. "icontains" or "trigram_icontains"
+        term: The searched term
+
+    Returns:
+        The queryset
+    """
+    model, path = SEARCHES[search]
+    return (
+        model.objects.filter(**{f"{path}__{lookup}": term})
+        .order_by()
+        .values("pk")
+        .distinct()
+    )
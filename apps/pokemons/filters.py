@@ -1,13 +1,16 @@
 import django_filters
 from pokemons.models import Ability, Pokemon, Type
 
+from core.filters import TrigramFilterSet
 
-class PokemonFilter(django_filters.FilterSet):
+
+class PokemonFilter(TrigramFilterSet):
     """
     Filter for Pokemon model.
 
     This filter allows filtering Pokemon by name, type name, and ability name,
-    as well as ordering by ID and name.
+    as well as ordering by ID and name. The name filters are served by trigram
+    indexes, see TrigramFilterSet.
 
     Attributes:
         o: Ordering filter for ID and name fields.
@@ -29,7 +32,7 @@ class PokemonFilter(django_filters.FilterSet):
         }
 
 
-class TypeFilter(django_filters.FilterSet):
+class TypeFilter(TrigramFilterSet):
     """
     Filter for Type model.
 
@@ -53,7 +56,7 @@ class TypeFilter(django_filters.FilterSet):
         }
 
 
-class AbilityFilter(django_filters.FilterSet):
+class AbilityFilter(TrigramFilterSet):
     """
     Filter for Ability model.
 
@@ -11,6 +11,19 @@ def get_id_from_url(url: str) -> int:
 
 
 class PokemonTransformer(BaseTransformer):
+    projection = (
+        "id",
+        "name",
+        "height",
+        "weight",
+        "sprites.front_default",
+        "types.slot",
+        "types.type",
+        "abilities.slot",
+        "abilities.is_hidden",
+        "abilities.ability",
+    )
+
     def transform(self) -> dict:
         types = [
             {
@@ -45,6 +58,8 @@ class PokemonTransformer(BaseTransformer):
 
 
 class AbilityTransformer(BaseTransformer):
+    projection = ("id", "name", "is_main_series")
+
     def transform(self) -> dict:
         return {
             "id": self.data["id"],
@@ -1,33 +1,80 @@
+from django.utils import timezone
 from pokemons.models import Ability, PokemonAbility, PokemonType, Type
 
-from core.integrations.updaters import DefaultUpdater
+from core.integrations.diffs import ThroughDiff
+from core.integrations.updaters import BulkUpdater, DefaultUpdater
 
 
 class PokemonUpdater(DefaultUpdater):
     many_to_many_fields = ["types", "abilities"]
 
     def handle_many_to_many_fields(self) -> None:
-        for ability_slot_data in self.data["types"]:
-            slot = ability_slot_data["slot"]
-            ability_data = ability_slot_data["type"]
-            type_ = self.create_or_update_without_race_condition(
-                model=Type, data=ability_data
-            )
-            PokemonType.objects.update_or_create(
-                pokemon=self.instance,
-                type=type_,
-                defaults={"slot": slot},
-            )
-
-        for ability_slot_data in self.data["abilities"]:
-            slot = ability_slot_data["slot"]
-            is_hidden = ability_slot_data["is_hidden"]
-            ability_data = ability_slot_data["ability"]
-            ability = self.create_or_update_without_race_condition(
-                model=Ability, data=ability_data
-            )
-            PokemonAbility.objects.update_or_create(
-                pokemon=self.instance,
-                ability=ability,
-                defaults={"slot": slot, "is_hidden": is_hidden},
-            )
+        types = {
+            t["type"]["id"]: t["type"]
+            for entity in self.changed_entities
+            for t in entity["types"]
+        }
+        abilities = {
+            a["ability"]["id"]: a["ability"]
+            for entity in self.changed_entities
+            for a in entity["abilities"]
+        }
+        self.upsert(model=Type, rows=list(types.values()))
+        self.upsert(model=Ability, rows=list(abilities.values()))
+
+        pokemon_ids = [entity["id"] for entity in self.changed_entities]
+        type_diff = ThroughDiff(
+            model=PokemonType,
+            parent_field="pokemon_id",
+            parent_ids=pokemon_ids,
+            rows=[
+                {
+                    "pokemon_id": entity["id"],
+                    "type_id": type_slot_data["type"]["id"],
+                    "slot": type_slot_data["slot"],
+                }
+                for entity in self.changed_entities
+                for type_slot_data in entity["types"]
+            ],
+            key_fields=("pokemon_id", "type_id", "slot"),
+        ).compute()
+        type_diff.apply()
+        ability_diff = ThroughDiff(
+            model=PokemonAbility,
+            parent_field="pokemon_id",
+            parent_ids=pokemon_ids,
+            rows=[
+                {
+                    "pokemon_id": entity["id"],
+                    "ability_id": ability_slot_data["ability"]["id"],
+                    "slot": ability_slot_data["slot"],
+                    "is_hidden": ability_slot_data["is_hidden"],
+                }
+                for entity in self.changed_entities
+                for ability_slot_data in entity["abilities"]
+            ],
+            key_fields=("pokemon_id", "ability_id", "slot"),
+            update_fields=("is_hidden",),
+        ).compute()
+        ability_diff.apply()
+
+        # The types and abilities in the data are upserted above, those the Pokemon
+        # lost are marked as modified here
+        self.touch(Type, {row.type_id for row in type_diff.to_delete})
+        self.touch(Ability, {row.ability_id for row in ability_diff.to_delete})
+
+    @staticmethod
+    def touch(model: type, ids: set[int]) -> None:
+        """
+        Set the modification time of model instances to now.
+
+        Args:
+            model: The model class with an updated_at field
+            ids: The IDs of the instances
+        """
+        if ids:
+            model.objects.filter(id__in=ids).update(updated_at=timezone.now())
+
+
+class PokemonBulkUpdater(BulkUpdater, PokemonUpdater):
+    pass
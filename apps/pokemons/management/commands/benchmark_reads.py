@@ -0,0 +1,94 @@
+from dataclasses import asdict
+from fnmatch import fnmatch
+
+from django.core.management.base import BaseCommand, CommandError
+from pokemons.benchmarks import get_scenarios
+
+from core.benchmarks.load import HTTPTarget, InProcessTarget, run_scenario
+from core.benchmarks.report import (
+    build_report,
+    compare_reports,
+    format_comparison,
+    load_report,
+    save_report,
+)
+
+COLUMNS = (
+    ("name", "{:<32}"),
+    ("requests", "{:>8}"),
+    ("errors", "{:>6}"),
+    ("requests_per_second", "{:>8.1f}"),
+    ("p50", "{:>8.1f}"),
+    ("p95", "{:>8.1f}"),
+    ("p99", "{:>8.1f}"),
+    ("queries_per_request", "{:>7.1f}"),
+)
+HEADER = "scenario                         requests errors    req/s  p50 ms  p95 ms  p99 ms queries"
+
+
+class Command(BaseCommand):
+    help = "Benchmarks the latency of the HTML and API read endpoints"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument("--warmup", type=int, default=20)
+        parser.add_argument(
+            "--url",
+            help="URL of a running server, e.g. http://localhost:8000, "
+            "by default the requests are handled in this process",
+        )
+        parser.add_argument(
+            "--scenarios",
+            nargs="+",
+            default=["*"],
+            help="Patterns of the scenario names, e.g. 'api.*'",
+        )
+        parser.add_argument("--seed", type=int, help="Seed of the random requests")
+        parser.add_argument("--output", help="Path of the JSON report")
+        parser.add_argument("--compare", help="Path of a JSON report to compare with")
+
+    def handle(self, *args, **options):
+        scenarios = [
+            scenario
+            for scenario in get_scenarios(options["seed"])
+            if any(fnmatch(scenario.name, pattern) for pattern in options["scenarios"])
+        ]
+        if not scenarios:
+            raise CommandError("No scenario matches the patterns")
+        target = HTTPTarget(options["url"]) if options["url"] else InProcessTarget()
+
+        self.stdout.write(HEADER)
+        results = {}
+        for scenario in scenarios:
+            result = run_scenario(
+                target,
+                scenario,
+                requests=options["requests"],
+                concurrency=options["concurrency"],
+                warmup=options["warmup"],
+            )
+            self.stdout.write(self.format_result(asdict(result)))
+            results[scenario.name] = {
+                key: value for key, value in asdict(result).items() if key != "name"
+            }
+
+        parameters = {
+            key: options[key]
+            for key in ("requests", "concurrency", "warmup", "url", "scenarios", "seed")
+        }
+        report = build_report("reads", parameters, {"scenarios": results})
+        if options["output"]:
+            save_report(report, options["output"])
+            self.stdout.write(f"Report saved to {options['output']}")
+        if options["compare"]:
+            rows = compare_reports(report, load_report(options["compare"]))
+            self.stdout.write(format_comparison(rows))
+        self.stdout.write(self.style.SUCCESS("Benchmark finished"))
+
+    @staticmethod
+    def format_result(result: dict) -> str:
+        return " ".join(
+            template.format(result[key]) if result[key] is not None else f"{'n/a':>7}"
+            for key, template in COLUMNS
+        )
@@ -0,0 +1,85 @@
+from dataclasses import asdict
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from pokemons.benchmarks import SEARCHES, get_search_queryset, get_search_terms
+
+from core.benchmarks.explain import explain
+from core.benchmarks.report import (
+    build_report,
+    compare_reports,
+    format_comparison,
+    load_report,
+    save_report,
+)
+from core.lookups import TrigramIContains
+
+LOOKUPS = ("icontains", TrigramIContains.lookup_name)
+ROW = "{:<24} {:<12} {:<18} {:>10} {:<20} {}"
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the query plans of the name filters with and without trigram indexes"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--terms",
+            nargs="+",
+            help="The searched terms, by default picked from the seeded names",
+        )
+        parser.add_argument(
+            "--searches",
+            nargs="+",
+            choices=list(SEARCHES),
+            default=list(SEARCHES),
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=3, help="Executions of each query"
+        )
+        parser.add_argument("--seed", type=int, help="Seed of the picked terms")
+        parser.add_argument("--output", help="Path of the JSON report")
+        parser.add_argument("--compare", help="Path of a JSON report to compare with")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("The search benchmark needs PostgreSQL")
+
+        terms = options["terms"] or get_search_terms(options["seed"])
+        self.stdout.write(
+            ROW.format("search", "term", "lookup", "ms", "seq scans", "indexes")
+        )
+        results = {}
+        for search in options["searches"]:
+            for term in terms:
+                for lookup in LOOKUPS:
+                    queryset = get_search_queryset(search, lookup, term)
+                    summary = explain(queryset, repeat=options["repeat"])
+                    self.stdout.write(
+                        ROW.format(
+                            search,
+                            term[:12],
+                            lookup,
+                            f"{summary.execution_ms:.2f}",
+                            ",".join(summary.seq_scans) or "-",
+                            ",".join(summary.index_scans) or "-",
+                        )
+                    )
+                    results.setdefault(search, {}).setdefault(term, {})[lookup] = (
+                        asdict(summary)
+                    )
+
+        parameters = {
+            "terms": terms,
+            "searches": options["searches"],
+            "repeat": options["repeat"],
+        }
+        report = build_report("search", parameters, {"searches": results})
+        if options["output"]:
+            save_report(report, options["output"])
+            self.stdout.write(f"Report saved to {options['output']}")
+        if options["compare"]:
+            rows = compare_reports(report, load_report(options["compare"]))
+            self.stdout.write(format_comparison(rows))
+        self.stdout.write(self.style.SUCCESS("Benchmark finished"))
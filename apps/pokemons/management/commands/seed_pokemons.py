@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from pokemons.benchmarks import flush, seed
+
+
+class Command(BaseCommand):
+    help = "Seeds a synthetic dataset of Pokémon, types and abilities for benchmarks"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--pokemons", type=int, default=10000)
+        parser.add_argument("--types", type=int, default=18)
+        parser.add_argument("--abilities", type=int, default=300)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--seed", type=int, help="Seed of the random data")
+        parser.add_argument(
+            "--no-flush",
+            dest="flush",
+            action="store_false",
+            help="Keep the existing Pokémon, types and abilities",
+        )
+
+    def handle(self, *args, **options):
+        if options["flush"]:
+            self.stdout.write("Deleting Pokémon, types and abilities...")
+            flush()
+        self.stdout.write(f"Seeding {options['pokemons']} Pokémon...")
+        seed(
+            options["pokemons"],
+            types=options["types"],
+            abilities=options["abilities"],
+            batch_size=options["batch_size"],
+            seed=options["seed"],
+        )
+        self.stdout.write(self.style.SUCCESS("Successfully seeded the dataset"))
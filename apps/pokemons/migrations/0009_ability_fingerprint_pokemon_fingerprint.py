@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-18 20:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pokemons", "0008_pokemon_abilities"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ability",
+            name="fingerprint",
+            field=models.CharField(blank=True, default="", max_length=64),
+        ),
+        migrations.AddField(
+            model_name="pokemon",
+            name="fingerprint",
+            field=models.CharField(blank=True, default="", max_length=64),
+        ),
+    ]
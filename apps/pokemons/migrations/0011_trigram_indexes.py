@@ -0,0 +1,34 @@
+# Generated by Django 5.2.1 on 2026-10-18 22:10
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pokemons", "0010_ability_updated_at_pokemon_updated_at_type_updated_at"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name="ability",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["name"], name="ability_name_trgm", opclasses=["gin_trgm_ops"]
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="pokemon",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["name"], name="pokemon_name_trgm", opclasses=["gin_trgm_ops"]
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="type",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["name"], name="type_name_trgm", opclasses=["gin_trgm_ops"]
+            ),
+        ),
+    ]
@@ -1,3 +1,4 @@
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from pokemons.querysets import PokemonQuerySet
 
@@ -10,12 +11,19 @@ class Type(models.Model):
 
     Attributes:
         name: The name of the type (e.g., "Fire", "Water", "Electric").
+        updated_at: When the type was last written.
     """
 
     name = models.CharField(max_length=100, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         ordering = ["name"]
+        indexes = [
+            GinIndex(
+                fields=["name"], name="type_name_trgm", opclasses=["gin_trgm_ops"]
+            ),
+        ]
 
     def __str__(self):
         """
@@ -34,14 +42,23 @@ class Ability(models.Model):
     Attributes:
         name: The name of the ability.
         is_main_series: Whether the ability appears in the main series games.
+        fingerprint: Hash of the synchronized data the ability was last saved from.
+        updated_at: When the ability or the Pokemon having it were last written.
     """
 
     name = models.CharField(max_length=100, db_index=True)
     is_main_series = models.BooleanField(default=False)
+    fingerprint = models.CharField(max_length=64, blank=True, default="")
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         ordering = ["name"]
         verbose_name_plural = "abilities"
+        indexes = [
+            GinIndex(
+                fields=["name"], name="ability_name_trgm", opclasses=["gin_trgm_ops"]
+            ),
+        ]
 
     def __str__(self):
         """
@@ -64,6 +81,9 @@ class Pokemon(models.Model):
         front_sprite: URL to the front sprite image of the Pokemon.
         types: Many-to-many relationship with Type model through PokemonType.
         abilities: Many-to-many relationship with Ability model through PokemonAbility.
+        fingerprint: Hash of the synchronized data the Pokemon was last saved from.
+        updated_at: When the Pokemon, including its types and abilities, was last
+            written.
     """
 
     name = models.CharField(max_length=100, db_index=True)
@@ -80,11 +100,18 @@ class Pokemon(models.Model):
         through="PokemonAbility",
         related_name="pokemons",
     )
+    fingerprint = models.CharField(max_length=64, blank=True, default="")
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     objects = PokemonQuerySet.as_manager()
 
     class Meta:
         ordering = ["name"]
+        indexes = [
+            GinIndex(
+                fields=["name"], name="pokemon_name_trgm", opclasses=["gin_trgm_ops"]
+            ),
+        ]
 
     def __str__(self):
         """
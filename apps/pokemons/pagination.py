@@ -0,0 +1,178 @@
+import hashlib
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import QuerySet
+
+from core.caching import get_dataset_version
+from core.keyset import (
+    Cursor,
+    InvalidCursor,
+    decode_cursor,
+    encode_cursor,
+    get_ordering,
+    get_page,
+)
+from core.metrics import record_cache_lookup
+
+
+@dataclass
+class KeysetPage:
+    """
+    A page of a keyset paginated list view, the counterpart of Django's Page.
+
+    Attributes:
+        object_list: The objects of the page
+        next_cursor: The encoded cursor of the next page, None on the last page
+        previous_cursor: The encoded cursor of the previous page, None on the first page
+        count: The total number of objects, None if not counted
+        approximate: Whether the count is an estimate of the database
+    """
+
+    object_list: list
+    next_cursor: str | None
+    previous_cursor: str | None
+    count: int | None = None
+    approximate: bool = False
+
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+    def has_other_pages(self) -> bool:
+        return self.has_next() or self.has_previous()
+
+
+def get_estimated_count(queryset: QuerySet) -> tuple[int, bool] | None:
+    """
+    Return the row count of the table of an unfiltered queryset estimated by Postgres.
+
+    The estimate is kept up to date by autovacuum, so it is read from pg_class
+    instead of counting all rows. A table that was never analyzed has no estimate
+    yet, its reltuples is -1, so the same query counts its rows instead and the
+    count costs one query either way.
+
+    Args:
+        queryset: The queryset
+
+    Returns:
+        The count and whether it is an estimate, None if the queryset is filtered
+        or the database isn't Postgres
+    """
+    connection = connections[queryset.db]
+    if queryset.query.where or connection.vendor != "postgresql":
+        return None
+    table = queryset.model._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT CASE WHEN reltuples >= 0 THEN reltuples::bigint "
+            f"ELSE (SELECT COUNT(*) FROM {connection.ops.quote_name(table)}) END, "
+            "reltuples >= 0 "
+            "FROM pg_class WHERE oid = %s::regclass",
+            [table],
+        )
+        row = cursor.fetchone()
+    if row is None:
+        return None
+    count, approximate = row
+    return count, approximate
+
+
+def get_cached_count(queryset: QuerySet, timeout: int) -> int:
+    """
+    Return the number of rows of a queryset, cached by its SQL until the dataset
+    changes.
+
+    Args:
+        queryset: The filtered queryset
+        timeout: The lifetime of the cached count in seconds
+
+    Returns:
+        The count
+    """
+    sql = str(queryset.order_by().query)
+    digest = hashlib.sha256(sql.encode()).hexdigest()
+    key = f"keyset-count:{get_dataset_version()}:{digest}"
+    count = cache.get(key)
+    record_cache_lookup("count", count is not None)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, timeout)
+    return count
+
+
+class KeysetPaginationMixin:
+    """
+    Mixin of the HTMX list views switching their pagination to keyset (cursor)
+    pagination with settings.HTML_KEYSET_PAGINATION.
+
+    Instead of the COUNT(*) and OFFSET queries of Django's Paginator, the page
+    after or before the cursor in the request is selected by the values of the
+    current "o" ordering, see core.keyset, and only previous and next links are
+    shown. An invalid cursor, e.g. of another ordering, shows the first page.
+
+    The total count is optional: with settings.HTML_KEYSET_COUNT_TIMEOUT set, the
+    count of the filtered list is cached for that many seconds, and an unfiltered
+    list on Postgres shows the estimate of the database instead.
+
+    Attributes:
+        keyset_template_name: The template of the previous and next links
+        cursor_param: The name of the cursor query parameter
+    """
+
+    keyset_template_name = "pokemons/keyset_pagination.html"
+    cursor_param = "cursor"
+
+    @property
+    def keyset_pagination(self) -> bool:
+        return settings.HTML_KEYSET_PAGINATION
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.keyset_pagination:
+            return super().paginate_queryset(queryset, page_size)
+
+        ordering = get_ordering(queryset)
+        cursor = None
+        encoded = self.request.GET.get(self.cursor_param)
+        if encoded:
+            try:
+                cursor = decode_cursor(ordering, encoded)
+            except InvalidCursor:
+                pass
+
+        rows, next_cursor, previous_cursor = get_page(
+            queryset, ordering, cursor, page_size
+        )
+        page = KeysetPage(
+            object_list=rows,
+            next_cursor=self.encode(ordering, next_cursor),
+            previous_cursor=self.encode(ordering, previous_cursor),
+        )
+        page.count, page.approximate = self.get_count(queryset)
+        return None, page, rows, page.has_other_pages()
+
+    @staticmethod
+    def encode(ordering: list[str], cursor: Cursor | None) -> str | None:
+        return encode_cursor(ordering, cursor) if cursor else None
+
+    def get_count(self, queryset) -> tuple[int | None, bool]:
+        timeout = settings.HTML_KEYSET_COUNT_TIMEOUT
+        if not timeout:
+            return None, False
+        counted = get_estimated_count(queryset)
+        if counted is not None:
+            return counted
+        return get_cached_count(queryset, timeout), False
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["pagination_template"] = (
+            self.keyset_template_name
+            if self.keyset_pagination
+            else "pokemons/pagination.html"
+        )
+        return context
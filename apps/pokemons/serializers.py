@@ -9,7 +9,7 @@ class TypeSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Type
-        fields = "__all__"
+        exclude = ["updated_at"]
 
 
 class AbilitySerializer(serializers.ModelSerializer):
@@ -19,7 +19,7 @@ class AbilitySerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Ability
-        fields = "__all__"
+        exclude = ["fingerprint", "updated_at"]
 
 
 class PokemonSerializer(serializers.ModelSerializer):
@@ -34,4 +34,4 @@ class PokemonSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Pokemon
-        fields = "__all__"
+        exclude = ["fingerprint", "updated_at"]
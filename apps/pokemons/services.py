@@ -1,11 +1,18 @@
 # The module contains business logic that is directly tied to app
+import hashlib
 import re
 from typing import List
 
 from django.conf import settings
+from django.core.cache import cache
 from django.http import HttpRequest
 from pokemons.models import Pokemon
 
+from core.caching import get_dataset_version
+from core.metrics import record_cache_lookup
+from core.prefix_index import get_prefix_index
+from core.search import rank_matches
+
 
 def change_filter_ordering(ordering: str | None, field: str) -> str:
     """
@@ -41,6 +48,40 @@ def change_filter_ordering(ordering: str | None, field: str) -> str:
     return ordering
 
 
+def search_pokemons(term: str, limit: int = settings.TYPEAHEAD_LIMIT) -> list[dict]:
+    """
+    Find the Pokemon matching the name typed in a typeahead.
+
+    The matches are ranked by prefix match, then similarity, see
+    core.search.rank_matches, and the prefix matches are looked up in the prefix
+    index of this process. Only the fields shown in a typeahead are loaded. The
+    results are cached per term for settings.TYPEAHEAD_CACHE_TIMEOUT seconds, and
+    until the next sync, as every keystroke requests the next prefix.
+
+    Args:
+        term: The typed name, case-insensitive
+        limit: The maximum number of matches
+
+    Returns:
+        The ID, the name and the front sprite URL of the matching Pokemon
+    """
+    term = term.strip().lower()
+    if not term:
+        return []
+
+    version = get_dataset_version()
+    digest = hashlib.sha256(term.encode()).hexdigest()
+    key = f"typeahead:{version}:{limit}:{digest}"
+    pokemons = cache.get(key)
+    record_cache_lookup("typeahead", pokemons is not None)
+    if pokemons is None:
+        queryset = Pokemon.objects.values("id", "name", "front_sprite")
+        index = get_prefix_index(Pokemon, version)
+        pokemons = rank_matches(queryset, term, limit, index=index)
+        cache.set(key, pokemons, settings.TYPEAHEAD_CACHE_TIMEOUT)
+    return pokemons
+
+
 class PokemonComparisonInformation:
     """
     Class to manage a session of Pokemon comparisons.
@@ -128,8 +169,17 @@ class PokemonComparisonInformation:
             self.pokemon_ids = ids
 
     def get_pokemons(self) -> list[Pokemon]:
-        pokemons = [Pokemon.objects.get(id=id) for id in self.pokemon_ids]
-        return pokemons
+        """
+        Get the Pokemon in the comparison in the order they were added.
+
+        The Pokemon are fetched with a single query with prefetched types and
+        abilities, Pokemon that don't exist anymore are skipped.
+
+        Returns:
+            List of Pokemon currently in the comparison.
+        """
+        pokemons = Pokemon.objects.prefetched().in_bulk(self.pokemon_ids)
+        return [pokemons[id] for id in self.pokemon_ids if id in pokemons]
 
     def is_full(self) -> bool:
         return len(self.pokemon_ids) >= self.max_number
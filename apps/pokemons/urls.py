@@ -21,6 +21,11 @@ urlpatterns = [
         views.ComparisonPokemonListView.as_view(),
         name="comparison_pokemon_list",
     ),
+    path(
+        "comparison/typeahead/",
+        views.PokemonTypeaheadView.as_view(),
+        name="pokemon_typeahead",
+    ),
     path(
         "comparison/add-pokemon/<int:pk>/",
         views.comparison_add_pokemon,
@@ -1,15 +1,23 @@
 from django.conf import settings
+from django.db.models import Prefetch
 from django.http import HttpResponse
 from django.views.generic import DetailView, ListView, TemplateView
 from django_filters.views import FilterView
 from pokemons import services
 from pokemons.filters import AbilityFilter, PokemonFilter, TypeFilter
-from pokemons.models import Ability, Pokemon, Type
+from pokemons.models import Ability, Pokemon, PokemonAbility, PokemonType, Type
+from pokemons.pagination import KeysetPaginationMixin
 
+from core.caching import VersionedCacheMixin
+from core.conditional import ConditionalObjectMixin
 
-class PokemonListView(FilterView, ListView):
+
+class PokemonListView(VersionedCacheMixin, KeysetPaginationMixin, FilterView, ListView):
     """
     HTMX-based list view for Pokemon model with filtering and pagination.
+
+    The pagination is switched to keyset pagination by settings.HTML_KEYSET_PAGINATION.
+    The responses are cached until the next sync, see VersionedCacheMixin.
     """
 
     model = Pokemon
@@ -18,6 +26,7 @@ class PokemonListView(FilterView, ListView):
     context_object_name = "pokemons"
     paginate_by = settings.PAGE_SIZE
     filterset_class = PokemonFilter
+    query_budget = 4
 
     def get_template_names(self):
         """
@@ -28,9 +37,27 @@ class PokemonListView(FilterView, ListView):
         return [self.template_name]
 
 
-class PokemonDetailView(DetailView):
+class PokemonDetailView(ConditionalObjectMixin, VersionedCacheMixin, DetailView):
+    """
+    Detail view of a Pokemon with its types and abilities in the order of their slots,
+    cached until the next sync.
+
+    Conditional requests are answered with 304 Not Modified, see core.conditional.
+    """
+
     model = Pokemon
+    queryset = Pokemon.objects.prefetch_related(
+        Prefetch(
+            "pokemontype_set",
+            queryset=PokemonType.objects.select_related("type").order_by("slot"),
+        ),
+        Prefetch(
+            "pokemonability_set",
+            queryset=PokemonAbility.objects.select_related("ability").order_by("slot"),
+        ),
+    )
     template_name = "pokemons/pokemon_detail.html"
+    query_budget = 4
 
 
 def change_page(request, page: int) -> HttpResponse:
@@ -47,9 +74,12 @@ def change_order(request, field: str) -> HttpResponse:
     return HttpResponse(html, headers={"HX-Trigger-After-Swap": "page-changed"})
 
 
-class TypeListView(FilterView, ListView):
+class TypeListView(VersionedCacheMixin, KeysetPaginationMixin, FilterView, ListView):
     """
     HTMX-based list view for Type model with filtering and pagination.
+
+    The pagination is switched to keyset pagination by settings.HTML_KEYSET_PAGINATION.
+    The responses are cached until the next sync, see VersionedCacheMixin.
     """
 
     model = Type
@@ -58,6 +88,7 @@ class TypeListView(FilterView, ListView):
     context_object_name = "types"
     paginate_by = settings.PAGE_SIZE
     filterset_class = TypeFilter
+    query_budget = 2
 
     def get_template_names(self):
         """
@@ -68,14 +99,22 @@ class TypeListView(FilterView, ListView):
         return [self.template_name]
 
 
-class TypeDetailView(DetailView):
+class TypeDetailView(VersionedCacheMixin, DetailView):
+    """
+    Detail view of a Type, cached until the next sync.
+    """
+
     model = Type
     template_name = "pokemons/type_detail.html"
+    query_budget = 1
 
 
-class AbilityListView(FilterView, ListView):
+class AbilityListView(VersionedCacheMixin, KeysetPaginationMixin, FilterView, ListView):
     """
     HTMX-based list view for Ability model with filtering and pagination.
+
+    The pagination is switched to keyset pagination by settings.HTML_KEYSET_PAGINATION.
+    The responses are cached until the next sync, see VersionedCacheMixin.
     """
 
     model = Ability
@@ -84,6 +123,7 @@ class AbilityListView(FilterView, ListView):
     context_object_name = "abilities"
     paginate_by = settings.PAGE_SIZE
     filterset_class = AbilityFilter
+    query_budget = 2
 
     def get_template_names(self):
         """
@@ -94,9 +134,20 @@ class AbilityListView(FilterView, ListView):
         return [self.template_name]
 
 
-class AbilityDetailView(DetailView):
+class AbilityDetailView(VersionedCacheMixin, DetailView):
+    """
+    Detail view of an Ability with the Pokemon having it, cached until the next sync.
+    """
+
     model = Ability
+    queryset = Ability.objects.prefetch_related(
+        Prefetch(
+            "pokemonability_set",
+            queryset=PokemonAbility.objects.select_related("pokemon"),
+        )
+    )
     template_name = "pokemons/ability_detail.html"
+    query_budget = 2
 
 
 class ComparisonView(TemplateView):
@@ -105,6 +156,7 @@ class ComparisonView(TemplateView):
     """
 
     template_name = "pokemons/comparison.html"
+    query_budget = 4
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -123,12 +175,18 @@ class ComparisonView(TemplateView):
 
 
 class ComparisonPokemonListView(FilterView, ListView):
+    """
+    HTMX-based list of Pokemon matching the name typed in the comparison picker.
+
+    The picker shows only the names, so the related objects are not prefetched.
+    """
 
     model = Pokemon
-    queryset = Pokemon.objects.prefetched()
+    queryset = Pokemon.objects.only("id", "name")
     template_name = "pokemons/comparison_pokemon_list.html"
     context_object_name = "pokemons"
     filterset_class = PokemonFilter
+    query_budget = 1
 
     def get_queryset(self):
         if not self.request.GET.get("name__icontains", ""):
@@ -137,6 +195,22 @@ class ComparisonPokemonListView(FilterView, ListView):
         return super().get_queryset()
 
 
+class PokemonTypeaheadView(TemplateView):
+    """
+    HTMX-based list of the Pokemon best matching the name typed in the comparison
+    picker, see services.search_pokemons. The budget includes the rebuild of the
+    prefix index after a sync.
+    """
+
+    template_name = "pokemons/pokemon_typeahead.html"
+    query_budget = 3
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["pokemons"] = services.search_pokemons(self.request.GET.get("q", ""))
+        return context
+
+
 def comparison_add_pokemon(request, pk: int) -> HttpResponse:
     comparison_info = services.PokemonComparisonInformation(request=request)
     comparison_info.add_pokemon(pk)
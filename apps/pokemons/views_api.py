@@ -1,24 +1,34 @@
+from pokemons.filters import AbilityFilter, PokemonFilter, TypeFilter
 from pokemons.models import Ability, Pokemon, Type
 from pokemons.serializers import AbilitySerializer, PokemonSerializer, TypeSerializer
 from rest_framework.generics import ListAPIView, RetrieveAPIView
 
+from core.conditional import ConditionalListMixin, ConditionalObjectMixin
+from core.querybudget import AUTHENTICATION_QUERIES
 
-class TypeListAPIView(ListAPIView):
+
+class TypeListAPIView(ConditionalListMixin, ListAPIView):
     """
     API view that returns a list of all Pokemon types.
 
-    This view provides a paginated list of all Pokemon types in the database.
+    This view provides a keyset paginated list of all Pokemon types in the database.
 
     Attributes:
         queryset: All Type objects.
         serializer_class: The serializer class used to convert Type objects to JSON.
+        filterset_class: The filter of the types by name and their ordering.
+        query_budget: The maximum number of queries of a request.
+
+    Conditional requests are answered with 304 Not Modified, see core.conditional.
     """
 
     queryset = Type.objects.all()
     serializer_class = TypeSerializer
+    filterset_class = TypeFilter
+    query_budget = 2 + AUTHENTICATION_QUERIES
 
 
-class TypeDetailAPIView(RetrieveAPIView):
+class TypeDetailAPIView(ConditionalObjectMixin, RetrieveAPIView):
     """
     API view that returns details of a specific Pokemon type.
 
@@ -27,29 +37,40 @@ class TypeDetailAPIView(RetrieveAPIView):
     Attributes:
         queryset: All Type objects.
         serializer_class: The serializer class used to convert Type objects to JSON.
+        query_budget: The maximum number of queries of a request.
+
+    Conditional requests are answered with 304 Not Modified, see core.conditional.
     """
 
     queryset = Type.objects.all()
     serializer_class = TypeSerializer
+    query_budget = 2 + AUTHENTICATION_QUERIES
 
 
-class PokemonListView(ListAPIView):
+class PokemonListView(ConditionalListMixin, ListAPIView):
     """
     API view that returns a list of all Pokemon.
 
-    This view provides a paginated list of all Pokemon in the database,
+    This view provides a keyset paginated list of all Pokemon in the database,
     with types prefetched to optimize performance.
 
     Attributes:
         queryset: All Pokemon objects with prefetched related objects.
         serializer_class: The serializer class used to convert Pokemon objects to JSON.
+        filterset_class: The filter of the Pokemon by name, type and ability, and
+            their ordering.
+        query_budget: The maximum number of queries of a request.
+
+    Conditional requests are answered with 304 Not Modified, see core.conditional.
     """
 
     queryset = Pokemon.objects.prefetched()
     serializer_class = PokemonSerializer
+    filterset_class = PokemonFilter
+    query_budget = 4 + AUTHENTICATION_QUERIES
 
 
-class PokemonDetailView(RetrieveAPIView):
+class PokemonDetailView(ConditionalObjectMixin, RetrieveAPIView):
     """
     API view that returns details of a specific Pokemon.
 
@@ -59,28 +80,39 @@ class PokemonDetailView(RetrieveAPIView):
     Attributes:
         queryset: All Pokemon objects with prefetched related objects.
         serializer_class: The serializer class used to convert Pokemon objects to JSON.
+        query_budget: The maximum number of queries of a request.
+
+    Conditional requests are answered with 304 Not Modified, see core.conditional.
     """
 
     queryset = Pokemon.objects.prefetched()
     serializer_class = PokemonSerializer
+    query_budget = 4 + AUTHENTICATION_QUERIES
 
 
-class AbilityListAPIView(ListAPIView):
+class AbilityListAPIView(ConditionalListMixin, ListAPIView):
     """
     API view that returns a list of all Pokemon abilities.
 
-    This view provides a paginated list of all Pokemon abilities in the database.
+    This view provides a keyset paginated list of all Pokemon abilities in the
+    database.
 
     Attributes:
         queryset: All Ability objects.
         serializer_class: The serializer class used to convert Ability objects to JSON.
+        filterset_class: The filter of the abilities by name and their ordering.
+        query_budget: The maximum number of queries of a request.
+
+    Conditional requests are answered with 304 Not Modified, see core.conditional.
     """
 
     queryset = Ability.objects.all()
     serializer_class = AbilitySerializer
+    filterset_class = AbilityFilter
+    query_budget = 2 + AUTHENTICATION_QUERIES
 
 
-class AbilityDetailAPIView(RetrieveAPIView):
+class AbilityDetailAPIView(ConditionalObjectMixin, RetrieveAPIView):
     """
     API view that returns details of a specific Pokemon ability.
 
@@ -89,7 +121,11 @@ class AbilityDetailAPIView(RetrieveAPIView):
     Attributes:
         queryset: All Ability objects.
         serializer_class: The serializer class used to convert Ability objects to JSON.
+        query_budget: The maximum number of queries of a request.
+
+    Conditional requests are answered with 304 Not Modified, see core.conditional.
     """
 
     queryset = Ability.objects.all()
     serializer_class = AbilitySerializer
+    query_budget = 2 + AUTHENTICATION_QUERIES
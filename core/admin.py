@@ -0,0 +1,59 @@
+from django.contrib import admin
+
+from .models import ResponseValidator, SyncRun, SyncStage
+
+
+@admin.register(ResponseValidator)
+class ResponseValidatorAdmin(admin.ModelAdmin):
+    list_display = ["url", "etag", "last_modified", "model", "object_id", "updated_at"]
+    search_fields = ["url"]
+
+
+class SyncStageInline(admin.TabularInline):
+    model = SyncStage
+    fields = [
+        "name",
+        "tasks",
+        "items",
+        "failures",
+        "bytes_downloaded",
+        "queries",
+        "seconds_mean",
+        "seconds_max",
+        *(field for _, field in SyncStage.BUCKETS),
+    ]
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(SyncRun)
+class SyncRunAdmin(admin.ModelAdmin):
+    list_display = [
+        "id",
+        "source",
+        "status",
+        "entity_count",
+        "processed",
+        "failures",
+        "started_at",
+        "duration",
+        "entities_per_second",
+    ]
+    list_filter = ["status", "source"]
+    readonly_fields = [
+        "source",
+        "status",
+        "entity_count",
+        "processed",
+        "failures",
+        "started_at",
+        "updated_at",
+        "finished_at",
+        "duration",
+        "entities_per_second",
+    ]
+    inlines = [SyncStageInline]
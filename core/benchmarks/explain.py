@@ -0,0 +1,80 @@
+import json
+import statistics
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+
+from django.db import connections
+from django.db.models import QuerySet
+
+SCAN_NODES = ("Seq Scan", "Parallel Seq Scan")
+
+
+@dataclass
+class PlanSummary:
+    """
+    The scans and the execution time of an analyzed query plan.
+
+    Attributes:
+        execution_ms: The median execution time in milliseconds
+        seq_scans: The tables read sequentially
+        index_scans: The indexes used
+    """
+
+    execution_ms: float
+    seq_scans: list[str] = field(default_factory=list)
+    index_scans: list[str] = field(default_factory=list)
+
+
+def walk(plan: dict) -> Iterator[dict]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from walk(child)
+
+
+def summarize_plan(explained: str | list) -> tuple[float, list[str], list[str]]:
+    """
+    Summarize a plan of EXPLAIN (ANALYZE, FORMAT JSON) of PostgreSQL.
+
+    Args:
+        explained: The plan as returned by QuerySet.explain
+
+    Returns:
+        The execution time in milliseconds, the sequentially scanned tables and
+        the used indexes
+    """
+    data = json.loads(explained) if isinstance(explained, str) else explained
+    root = data[0]
+    seq_scans, index_scans = [], []
+    for node in walk(root["Plan"]):
+        if node["Node Type"] in SCAN_NODES:
+            seq_scans.append(node["Relation Name"])
+        elif "Index Name" in node:
+            index_scans.append(node["Index Name"])
+    return root["Execution Time"], sorted(set(seq_scans)), sorted(set(index_scans))
+
+
+def explain(queryset: QuerySet, repeat: int = 3) -> PlanSummary:
+    """
+    Analyze the plan of a queryset on PostgreSQL.
+
+    The query is executed repeat times, the first run warms up the buffers.
+
+    Args:
+        queryset: The queryset
+        repeat: The number of executions
+
+    Raises:
+        ValueError: If the database isn't PostgreSQL.
+
+    Returns:
+        The summary of the plan with the median execution time
+    """
+    if connections[queryset.db].vendor != "postgresql":
+        raise ValueError("Analyzed plans are supported only on PostgreSQL")
+
+    times = []
+    for _ in range(max(repeat, 1)):
+        explained = queryset.explain(analyze=True, format="json")
+        execution_ms, seq_scans, index_scans = summarize_plan(explained)
+        times.append(execution_ms)
+    return PlanSummary(statistics.median(times), seq_scans, index_scans)
@@ -0,0 +1,183 @@
+import json
+
+# Sizes of the synthetic payloads, close to the median PokéAPI Pokémon
+MOVES = 80
+VERSION_GROUPS = 4
+GAME_INDICES = 20
+TYPES = 18
+ABILITIES = 300
+
+
+def named(name: str, url: str) -> dict:
+    return {"name": name, "url": url}
+
+
+def make_page(
+    base_url: str, resource: str, count: int, offset: int, limit: int
+) -> dict:
+    """
+    Build a listing page of a resource in the format of PokéAPI.
+
+    Args:
+        base_url: The API root, e.g. "http://127.0.0.1:8765/api/v2"
+        resource: The resource name, e.g. "pokemon"
+        count: The total number of entities
+        offset: The offset of the page
+        limit: The size of the page
+
+    Returns:
+        The page data
+    """
+    url = f"{base_url}/{resource}/"
+    ids = range(offset + 1, min(offset + limit, count) + 1)
+    next_offset = offset + limit
+    return {
+        "count": count,
+        "next": (
+            f"{url}?offset={next_offset}&limit={limit}" if next_offset < count else None
+        ),
+        "previous": (
+            f"{url}?offset={max(offset - limit, 0)}&limit={limit}" if offset else None
+        ),
+        "results": [named(f"{resource}-{id}", f"{url}{id}/") for id in ids],
+    }
+
+
+def make_pokemon(base_url: str, id: int) -> dict:
+    """
+    Build a Pokémon in the format of PokéAPI.
+
+    Besides the fields read by the transformer, the payload contains the large
+    lists of moves and game indices of the real API, so the loading and the
+    projection are measured on payloads of a realistic size.
+
+    Args:
+        base_url: The API root
+        id: The ID of the Pokémon
+
+    Returns:
+        The Pokémon data
+    """
+    sprite = f"{base_url}/sprites/pokemon/{id}.png"
+    return {
+        "id": id,
+        "name": f"pokemon-{id}",
+        "base_experience": 64,
+        "height": 7 + id % 10,
+        "weight": 69 + id % 100,
+        "is_default": True,
+        "order": id,
+        "abilities": [
+            {
+                "ability": named(
+                    f"ability-{ability_id}", f"{base_url}/ability/{ability_id}/"
+                ),
+                "is_hidden": slot == 2,
+                "slot": slot,
+            }
+            for slot, ability_id in enumerate(
+                [id % ABILITIES + 1, (id + 7) % ABILITIES + 1], start=1
+            )
+        ],
+        "types": [
+            {
+                "slot": slot,
+                "type": named(f"type-{type_id}", f"{base_url}/type/{type_id}/"),
+            }
+            for slot, type_id in enumerate(
+                [id % TYPES + 1, (id + 5) % TYPES + 1], start=1
+            )
+        ],
+        "moves": [
+            {
+                "move": named(f"move-{move}", f"{base_url}/move/{move}/"),
+                "version_group_details": [
+                    {
+                        "level_learned_at": move % 50,
+                        "move_learn_method": named(
+                            "level-up", f"{base_url}/move-learn-method/1/"
+                        ),
+                        "version_group": named(
+                            f"version-group-{group}",
+                            f"{base_url}/version-group/{group}/",
+                        ),
+                    }
+                    for group in range(1, VERSION_GROUPS + 1)
+                ],
+            }
+            for move in range(1, MOVES + 1)
+        ],
+        "game_indices": [
+            {
+                "game_index": id,
+                "version": named(
+                    f"version-{version}", f"{base_url}/version/{version}/"
+                ),
+            }
+            for version in range(1, GAME_INDICES + 1)
+        ],
+        "sprites": {
+            "front_default": sprite,
+            "back_default": sprite,
+            "front_shiny": sprite,
+            "back_shiny": sprite,
+            "other": {"official-artwork": {"front_default": sprite}},
+        },
+        "stats": [
+            {"base_stat": 45, "effort": 0, "stat": named(stat, f"{base_url}/stat/{n}/")}
+            for n, stat in enumerate(
+                [
+                    "hp",
+                    "attack",
+                    "defense",
+                    "special-attack",
+                    "special-defense",
+                    "speed",
+                ],
+                start=1,
+            )
+        ],
+        "species": named(f"pokemon-{id}", f"{base_url}/pokemon-species/{id}/"),
+    }
+
+
+def make_ability(base_url: str, id: int) -> dict:
+    """
+    Build an ability in the format of PokéAPI.
+
+    Args:
+        base_url: The API root
+        id: The ID of the ability
+
+    Returns:
+        The ability data
+    """
+    return {
+        "id": id,
+        "name": f"ability-{id}",
+        "is_main_series": id % 3 != 0,
+        "generation": named("generation-iii", f"{base_url}/generation/3/"),
+        "effect_entries": [
+            {
+                "effect": "Powers up moves of a type when the Pokémon is in trouble. "
+                * 4,
+                "language": named("en", f"{base_url}/language/9/"),
+                "short_effect": "Powers up moves in a pinch.",
+            }
+        ],
+        "pokemon": [
+            {
+                "is_hidden": False,
+                "pokemon": named(f"pokemon-{n}", f"{base_url}/pokemon/{n}/"),
+                "slot": 1,
+            }
+            for n in range(id, id + 10)
+        ],
+    }
+
+
+ENTITIES = {"pokemon": make_pokemon, "ability": make_ability}
+
+
+def render(data: dict) -> bytes:
+    return json.dumps(data).encode()
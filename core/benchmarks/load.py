@@ -0,0 +1,258 @@
+import logging
+import statistics
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+import requests
+from django.conf import settings
+from django.db import connection
+from django.test import Client, override_settings
+from prometheus_client.parser import text_string_to_metric_families
+
+from core.metrics import QueryStats
+
+logger = logging.getLogger(__name__)
+
+PERCENTILES = (50, 95, 99)
+
+
+@dataclass
+class Scenario:
+    """
+    A kind of request sent repeatedly by the load benchmark.
+
+    Attributes:
+        name: The name of the scenario, e.g. "api.pokemon_list"
+        get_path: Returns the path and the query string of the next request, so
+            the requests of a scenario can vary, e.g. in the requested ID
+        headers: The headers of the requests, e.g. HX-Request of the HTMX views
+    """
+
+    name: str
+    get_path: Callable[[], str]
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class Sample:
+    seconds: float
+    status: int
+    queries: int | None = None
+
+
+@dataclass
+class ScenarioResult:
+    """
+    Latency and database queries of the requests of a scenario.
+
+    Attributes:
+        name: The name of the scenario
+        requests: The number of measured requests
+        errors: The number of responses with other status than 200
+        requests_per_second: The throughput of all clients
+        mean: The mean latency in milliseconds
+        p50: The median latency in milliseconds
+        p95: The 95th percentile of the latency in milliseconds
+        p99: The 99th percentile of the latency in milliseconds
+        queries_per_request: The mean number of database queries, None if unknown
+    """
+
+    name: str
+    requests: int
+    errors: int
+    requests_per_second: float
+    mean: float
+    p50: float
+    p95: float
+    p99: float
+    queries_per_request: float | None
+
+
+def get_percentiles(values: list[float]) -> dict[int, float]:
+    """
+    Return the percentiles of the values, see PERCENTILES.
+    """
+    if len(values) == 1:
+        return {p: values[0] for p in PERCENTILES}
+    cuts = statistics.quantiles(values, n=100, method="inclusive")
+    return {p: cuts[p - 1] for p in PERCENTILES}
+
+
+def summarize(
+    name: str, samples: list[Sample], seconds: float, queries: float | None = None
+) -> ScenarioResult:
+    latencies = [sample.seconds * 1000 for sample in samples]
+    percentiles = get_percentiles(latencies)
+    if queries is None and all(sample.queries is not None for sample in samples):
+        queries = statistics.mean(sample.queries for sample in samples)
+    return ScenarioResult(
+        name=name,
+        requests=len(samples),
+        errors=sum(sample.status != 200 for sample in samples),
+        requests_per_second=len(samples) / seconds if seconds else 0.0,
+        mean=statistics.mean(latencies),
+        p50=percentiles[50],
+        p95=percentiles[95],
+        p99=percentiles[99],
+        queries_per_request=queries,
+    )
+
+
+class InProcessTarget:
+    """
+    Sends the requests through the Django test client in the current process.
+
+    Every client thread has its own database connection, so the queries of each
+    request are counted exactly. The latency excludes the HTTP server.
+    """
+
+    def __init__(self):
+        self.local = threading.local()
+
+    def get_client(self) -> Client:
+        if not hasattr(self.local, "client"):
+            self.local.client = Client()
+        return self.local.client
+
+    def request(self, path: str, headers: dict[str, str]) -> Sample:
+        stats = QueryStats()
+        started = time.perf_counter()
+        with connection.execute_wrapper(stats):
+            response = self.get_client().get(path, headers=headers)
+        return Sample(time.perf_counter() - started, response.status_code, stats.count)
+
+    def run(self, function: Callable):
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+            return function()
+
+    def close(self) -> None:
+        # Called by every client thread, as the connections are per thread
+        connection.close()
+
+    def get_queries(self) -> None:
+        return None
+
+
+class HTTPTarget:
+    """
+    Sends the requests to a running server, e.g. gunicorn.
+
+    The database queries are read from the http_request_db_queries histogram of
+    the /metrics endpoint of the server, before and after each scenario.
+    """
+
+    def __init__(self, url: str, timeout: float = 30):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self.local = threading.local()
+
+    def get_session(self) -> requests.Session:
+        if not hasattr(self.local, "session"):
+            self.local.session = requests.Session()
+        return self.local.session
+
+    def request(self, path: str, headers: dict[str, str]) -> Sample:
+        started = time.perf_counter()
+        try:
+            response = self.get_session().get(
+                f"{self.url}{path}", headers=headers, timeout=self.timeout
+            )
+        except requests.RequestException:
+            return Sample(time.perf_counter() - started, 0)
+        return Sample(time.perf_counter() - started, response.status_code)
+
+    def run(self, function: Callable):
+        return function()
+
+    def close(self) -> None:
+        pass
+
+    def get_queries(self) -> tuple[float, float] | None:
+        """
+        Return the total number of queries and requests counted by the server.
+        """
+        try:
+            response = requests.get(f"{self.url}/metrics", timeout=self.timeout)
+            response.raise_for_status()
+        except requests.RequestException:
+            return None
+
+        total = {"sum": 0.0, "count": 0.0}
+        for family in text_string_to_metric_families(response.text):
+            if family.name != "http_request_db_queries":
+                continue
+            for sample in family.samples:
+                suffix = sample.name.rsplit("_", 1)[-1]
+                # Skip the scrapes of the benchmark itself
+                if suffix in total and sample.labels.get("view") != "metrics":
+                    total[suffix] += sample.value
+        return total["sum"], total["count"]
+
+
+def split(total: int, parts: int) -> list[int]:
+    return [total // parts + (i < total % parts) for i in range(parts)]
+
+
+def run_scenario(
+    target: InProcessTarget | HTTPTarget,
+    scenario: Scenario,
+    requests: int,
+    concurrency: int,
+    warmup: int = 0,
+) -> ScenarioResult:
+    """
+    Send the requests of a scenario from concurrent clients and measure them.
+
+    Every client is a thread sending its share of the warm-up requests, then,
+    after all clients are warmed up, its share of the measured requests.
+
+    Args:
+        target: Where to send the requests
+        scenario: The scenario
+        requests: The number of measured requests
+        concurrency: The number of concurrent clients
+        warmup: The number of requests sent before the measurement
+
+    Returns:
+        The latency and the database queries of the requests
+    """
+    samples: list[Sample] = []
+    measurement = {}
+
+    def start():
+        measurement["before"] = target.get_queries()
+        measurement["started"] = time.perf_counter()
+
+    barrier = threading.Barrier(concurrency, action=start)
+
+    def client(warmup: int, requests: int):
+        try:
+            for _ in range(warmup):
+                target.request(scenario.get_path(), scenario.headers)
+            barrier.wait()
+            for _ in range(requests):
+                samples.append(target.request(scenario.get_path(), scenario.headers))
+        finally:
+            target.close()
+
+    def measure():
+        threads = [
+            threading.Thread(target=client, args=args)
+            for args in zip(split(warmup, concurrency), split(requests, concurrency))
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    target.run(measure)
+    seconds = time.perf_counter() - measurement["started"]
+    before, after = measurement["before"], target.get_queries()
+    queries = None
+    if before is not None and after is not None and after[1] > before[1]:
+        queries = (after[0] - before[0]) / (after[1] - before[1])
+    result = summarize(scenario.name, samples, seconds, queries)
+    logger.info("Benchmark scenario finished.", extra={"scenario": scenario.name})
+    return result
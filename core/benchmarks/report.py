@@ -0,0 +1,119 @@
+import json
+import os
+import platform
+import subprocess
+from datetime import UTC, datetime
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connection
+
+
+def git(*args: str) -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", *args],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def get_environment() -> dict:
+    """
+    Describe the code and the machine a benchmark runs on.
+
+    Returns:
+        The git commit and branch, the Python version, the CPU count and the database
+    """
+    return {
+        "commit": git("rev-parse", "HEAD"),
+        "branch": git("rev-parse", "--abbrev-ref", "HEAD"),
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "database": connection.vendor,
+        "created_at": datetime.now(UTC).isoformat(),
+    }
+
+
+def build_report(benchmark: str, parameters: dict, results: dict) -> dict:
+    """
+    Build a benchmark report.
+
+    Args:
+        benchmark: The name of the benchmark, e.g. "sync"
+        parameters: The parameters of the benchmark
+        results: The measurements, numeric values are compared by compare_reports
+
+    Returns:
+        The report
+    """
+    return {
+        "benchmark": benchmark,
+        "environment": get_environment(),
+        "parameters": parameters,
+        "results": results,
+    }
+
+
+def save_report(report: dict, path: str | Path) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2))
+
+
+def load_report(path: str | Path) -> dict:
+    return json.loads(Path(path).read_text())
+
+
+def flatten(results: dict, prefix: str = "") -> dict[str, float]:
+    """
+    Flatten the numeric measurements of nested results to dotted keys.
+    """
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def compare_reports(
+    report: dict, baseline: dict
+) -> list[tuple[str, float, float, float | None]]:
+    """
+    Compare the numeric measurements of a report with a baseline report.
+
+    Args:
+        report: The current report
+        baseline: The report to compare with, e.g. of the main branch
+
+    Returns:
+        Tuples of the measurement name, the baseline value, the current value and
+        the relative change, None if the baseline value is zero
+    """
+    current = flatten(report["results"])
+    previous = flatten(baseline["results"])
+    rows = []
+    for name, value in current.items():
+        if name not in previous:
+            continue
+        base = previous[name]
+        change = (value - base) / base if base else None
+        rows.append((name, base, value, change))
+    return rows
+
+
+def format_comparison(rows: list[tuple[str, float, float, float | None]]) -> str:
+    width = max((len(name) for name, *_ in rows), default=0)
+    lines = []
+    for name, base, value, change in rows:
+        change = f"{change:+.1%}" if change is not None else "n/a"
+        lines.append(f"{name:<{width}}  {base:>14.4g}  {value:>14.4g}  {change:>8}")
+    return "\n".join(lines)
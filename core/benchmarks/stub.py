@@ -0,0 +1,153 @@
+import logging
+import re
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from core.benchmarks.fixtures import ENTITIES, make_page, render
+from core.integrations.cache import REPLAY, ResponseCache
+
+logger = logging.getLogger(__name__)
+
+API_PATH = "/api/v2"
+UPSTREAM = "https://pokeapi.co"
+DEFAULT_LIMIT = 20
+
+PAGE_RE = re.compile(rf"^{API_PATH}/(?P<resource>[\w-]+)/$")
+ENTITY_RE = re.compile(rf"^{API_PATH}/(?P<resource>[\w-]+)/(?P<id>\d+)/$")
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    server: "StubServer"
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        stub = self.server.stub
+        if stub.latency:
+            time.sleep(stub.latency)
+        body = stub.get_body(self.path)
+        if body is None:
+            self.send_response(HTTPStatus.NOT_FOUND)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, stub: "StubPokeAPI"):
+        super().__init__(address, StubHandler)
+        self.stub = stub
+
+
+class StubPokeAPI:
+    """
+    Local HTTP server imitating PokéAPI for the sync benchmark.
+
+    The server replays the bodies recorded by a ResponseCache, rewriting the
+    upstream URLs in them to the server, or, without recordings, serves synthetic
+    pages and entities, see core.benchmarks.fixtures. The server runs in a
+    background thread, use it as a context manager:
+
+        with StubPokeAPI(count=1000) as stub:
+            sync(stub.url)
+    """
+
+    def __init__(
+        self,
+        count: int = 100,
+        recordings: str | Path | None = None,
+        latency: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        """
+        Initialize the server.
+
+        Args:
+            count: The number of synthetic entities of every resource
+            recordings: The directory of a ResponseCache with recorded responses,
+                None to serve synthetic data
+            latency: The delay of every response in seconds, imitating the network
+            host: The address to listen on
+            port: The port to listen on, 0 for any free port
+        """
+        self.count = count
+        self.recordings = ResponseCache(recordings, mode=REPLAY) if recordings else None
+        self.latency = latency
+        self.server = StubServer((host, port), self)
+        self.thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def url(self) -> str:
+        """
+        Return the API root of the server, the counterpart of settings.POKEAPI_URL.
+        """
+        return f"{self.base_url}{API_PATH}"
+
+    def get_body(self, path: str) -> bytes | None:
+        """
+        Return the response body of a request path, None if there is none.
+        """
+        if self.recordings:
+            return self.get_recorded(path)
+        return self.get_synthetic(path)
+
+    def get_recorded(self, path: str) -> bytes | None:
+        body = self.recordings.get(f"{UPSTREAM}{path}")
+        if body is None:
+            logger.warning("Stub response not recorded.", extra={"path": path})
+            return None
+        return body.replace(UPSTREAM.encode(), self.base_url.encode())
+
+    def get_synthetic(self, path: str) -> bytes | None:
+        parts = urlsplit(path)
+        if match := PAGE_RE.match(parts.path):
+            query = parse_qs(parts.query)
+            offset = int(query.get("offset", [0])[0])
+            limit = int(query.get("limit", [DEFAULT_LIMIT])[0])
+            return render(
+                make_page(self.url, match["resource"], self.count, offset, limit)
+            )
+        if match := ENTITY_RE.match(parts.path):
+            make_entity = ENTITIES.get(match["resource"])
+            id = int(match["id"])
+            if make_entity and 1 <= id <= self.count:
+                return render(make_entity(self.url, id))
+        return None
+
+    def start(self) -> None:
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        logger.info("Stub PokéAPI started.", extra={"url": self.url})
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        if self.thread:
+            self.thread.join()
+
+    def __enter__(self) -> "StubPokeAPI":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,278 @@
+import copy
+import logging
+import resource
+import time
+from dataclasses import dataclass, field
+
+import redis
+from celery import current_app
+from celery.contrib.testing.worker import start_worker
+from django.apps import apps
+from django.conf import settings
+from django.test import override_settings
+from django.utils import timezone
+
+from core.integrations.tasks import sync_data
+from core.integrations.throttling import get_redis
+from core.models import ResponseValidator, SyncRun
+
+logger = logging.getLogger(__name__)
+
+LOCAL = "local"
+WORKER = "worker"
+MODES = (LOCAL, WORKER)
+
+
+class BenchmarkError(Exception):
+    """
+    Raised when a benchmarked synchronization fails or doesn't finish in time.
+    """
+
+
+@dataclass
+class SyncResult:
+    """
+    Measurements of a benchmarked synchronization.
+
+    Attributes:
+        source: The identifier of the data source
+        mode: Either "local" or "worker"
+        pipeline: The pipeline of the data source
+        entities: The number of processed entities
+        failures: The number of failed entities
+        seconds: The duration of the run
+        entities_per_second: The throughput of the run
+        queries: The number of database queries of all tasks
+        queries_per_entity: The number of database queries per processed entity
+        bytes_downloaded: The size of the downloaded response bodies
+        broker_bytes: The traffic received by the Redis broker, None if unavailable
+        peak_rss: The peak resident set size in bytes of the process running the
+            tasks, None if unavailable
+        stages: The statistics of every stage, see SyncStage
+    """
+
+    source: str
+    mode: str
+    pipeline: str
+    entities: int
+    failures: int
+    seconds: float
+    entities_per_second: float | None
+    queries: int
+    queries_per_entity: float | None
+    bytes_downloaded: int
+    broker_bytes: int | None
+    peak_rss: int | None
+    stages: dict[str, dict] = field(default_factory=dict)
+
+
+def get_benchmark_sources(url: str, pipeline: str | None = None) -> dict:
+    """
+    Return settings.DATA_SOURCES pointing to a stub server.
+
+    The rate limiter and the response cache are disabled, so the benchmark measures
+    the pipeline rather than the throttling or the disk.
+
+    Args:
+        url: The API root of the stub server, replacing settings.POKEAPI_URL
+        pipeline: The pipeline of all sources, None to keep the configured ones
+
+    Returns:
+        The data sources configuration
+    """
+    sources = copy.deepcopy(settings.DATA_SOURCES)
+    for config in sources.values():
+        kwargs = config["page_loader"]["kwargs"]
+        kwargs["url"] = kwargs["url"].replace(settings.POKEAPI_URL, url)
+        config["rate_limiter"] = None
+        config["response_cache"] = None
+        if pipeline:
+            config["pipeline"] = pipeline
+    return sources
+
+
+def flush_source(source: str) -> None:
+    """
+    Delete the entities saved by a data source, so its synchronization inserts them.
+
+    The stored response validators of the entities are deleted too, so the
+    entities are downloaded again instead of answered by 304 Not Modified.
+
+    Args:
+        source: The identifier of the data source
+    """
+    model_name = settings.DATA_SOURCES[source]["updater"]["kwargs"]["model_name"]
+    model = apps.get_model(model_name)
+    deleted, _ = model.objects.all().delete()
+    ResponseValidator.objects.filter(model=model._meta.label).delete()
+    logger.info("Benchmark data flushed.", extra={"source": source, "deleted": deleted})
+
+
+def get_broker_bytes() -> int | None:
+    """
+    Return the total traffic received by the Redis broker, None if unavailable.
+    """
+    try:
+        info = get_redis(settings.CELERY_BROKER_URL).info("stats")
+    except (redis.RedisError, ValueError):
+        return None
+    return info.get("total_net_input_bytes")
+
+
+def get_own_peak_rss() -> int:
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def get_worker_peak_rss(timeout: float = 2.0) -> int | None:
+    """
+    Return the highest peak resident set size of the running Celery workers.
+
+    Celery reports the usage of the main worker process, which runs the tasks with
+    the solo or threads pool, but not with the prefork pool.
+
+    Args:
+        timeout: The time to wait for the replies of the workers
+
+    Returns:
+        The peak resident set size in bytes, None if no worker replied
+    """
+    stats = current_app.control.inspect(timeout=timeout).stats() or {}
+    peaks = [
+        worker["rusage"]["maxrss"] * 1024
+        for worker in stats.values()
+        if "maxrss" in worker.get("rusage", {})
+    ]
+    return max(peaks, default=None)
+
+
+def wait_for_run(
+    source: str, since, timeout: float, poll_interval: float = 0.5
+) -> SyncRun:
+    """
+    Wait until the run of a source started by the workers is no longer running.
+
+    Args:
+        source: The identifier of the data source
+        since: The time before the run was started
+        timeout: The maximum time to wait in seconds
+        poll_interval: The time between checks in seconds
+
+    Raises:
+        BenchmarkError: If the run doesn't finish in time.
+
+    Returns:
+        The finished or failed run
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        run = SyncRun.objects.filter(source=source, started_at__gte=since).first()
+        if run and run.status != SyncRun.Status.RUNNING:
+            return run
+        time.sleep(poll_interval)
+    raise BenchmarkError(f"Sync of '{source}' didn't finish in {timeout} seconds")
+
+
+def get_result(
+    run: SyncRun,
+    mode: str,
+    pipeline: str,
+    broker_bytes: int | None,
+    peak_rss: int | None,
+) -> SyncResult:
+    stages = {stage.name: stage for stage in run.stages.all()}
+    queries = sum(stage.queries for stage in stages.values())
+    return SyncResult(
+        source=run.source,
+        mode=mode,
+        pipeline=pipeline,
+        entities=run.processed,
+        failures=run.failures,
+        seconds=run.duration.total_seconds(),
+        entities_per_second=run.entities_per_second,
+        queries=queries,
+        queries_per_entity=queries / run.processed if run.processed else None,
+        bytes_downloaded=sum(stage.bytes_downloaded for stage in stages.values()),
+        broker_bytes=broker_bytes,
+        peak_rss=peak_rss,
+        stages={
+            name: {
+                "tasks": stage.tasks,
+                "items": stage.items,
+                "failures": stage.failures,
+                "queries": stage.queries,
+                "seconds_mean": stage.seconds_mean,
+                "seconds_max": stage.seconds_max,
+            }
+            for name, stage in stages.items()
+        },
+    )
+
+
+def run_sync_benchmark(
+    source: str,
+    url: str,
+    mode: str = LOCAL,
+    pipeline: str | None = None,
+    flush: bool = True,
+    timeout: float = 600,
+) -> SyncResult:
+    """
+    Synchronize a data source from a stub server and measure the run.
+
+    In the local mode, the tasks are run by a worker with the solo pool started in
+    the current process, with the data sources pointed to the stub server. In the
+    worker mode, the tasks are sent to the running Celery workers, which must be
+    started with POKEAPI_URL pointing to the stub server, see StubPokeAPI.url, and
+    use their own pipeline and rate limits. Both modes need the broker and the
+    result backend, as the canvases of the pipelines can't run eagerly.
+
+    Args:
+        source: The identifier of the data source
+        url: The API root of the stub server
+        mode: Either "local" or "worker"
+        pipeline: The pipeline of the local mode, None for the configured one
+        flush: Whether to delete the saved entities first
+        timeout: The maximum duration of the run in seconds
+
+    Raises:
+        BenchmarkError: If the run fails or doesn't finish in time.
+
+    Returns:
+        The measurements of the run
+    """
+    if mode not in MODES:
+        raise ValueError(f"Benchmark mode must be one of {MODES}, not {mode}")
+
+    if flush:
+        flush_source(source)
+    broker_before = get_broker_bytes()
+
+    if mode == LOCAL:
+        sources = get_benchmark_sources(url, pipeline)
+        with (
+            override_settings(DATA_SOURCES=sources),
+            start_worker(current_app, pool="solo", perform_ping_check=False),
+        ):
+            since = timezone.now()
+            sync_data.delay(source)
+            run = wait_for_run(source, since, timeout)
+        peak_rss = get_own_peak_rss()
+        pipeline = sources[source]["pipeline"]
+    else:
+        since = timezone.now()
+        sync_data.delay(source)
+        run = wait_for_run(source, since, timeout)
+        peak_rss = get_worker_peak_rss()
+        pipeline = settings.DATA_SOURCES[source]["pipeline"]
+
+    broker_after = get_broker_bytes()
+    if run.status != SyncRun.Status.FINISHED:
+        raise BenchmarkError(f"Sync of '{source}' {run.status}")
+
+    broker_bytes = (
+        broker_after - broker_before
+        if broker_before is not None and broker_after is not None
+        else None
+    )
+    return get_result(run, mode, pipeline, broker_bytes, peak_rss)
@@ -0,0 +1,123 @@
+import hashlib
+import logging
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+
+from core.metrics import record_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+DATASET_VERSION_KEY = "dataset-version"
+
+
+def get_dataset_version() -> str:
+    """
+    Return the version of the synced dataset.
+
+    The version is a random token replaced whenever the updaters write, so the
+    keys of everything cached from the data change with it. A version evicted
+    from the cache is replaced by a new one, which only discards the cache.
+
+    Returns:
+        The version token
+    """
+    version = cache.get(DATASET_VERSION_KEY)
+    if version is None:
+        cache.add(DATASET_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+        version = cache.get(DATASET_VERSION_KEY)
+    return version
+
+
+def bump_dataset_version() -> str:
+    """
+    Replace the version of the dataset, invalidating everything cached by it.
+
+    Returns:
+        The new version token
+    """
+    version = uuid.uuid4().hex
+    cache.set(DATASET_VERSION_KEY, version, timeout=None)
+    logger.debug("Dataset version bumped.", extra={"version": version})
+    return version
+
+
+class VersionedCacheMixin:
+    """
+    Mixin of views caching their rendered responses until the dataset changes.
+
+    A response is cached by the URL name, the URL kwargs, the query parameters
+    read by the view and whether it is an HTMX request, which selects a partial
+    template. The key includes the dataset version, so the sync invalidates all
+    entries at once by bumping it, see bump_dataset_version, and the timeout only
+    lets unused entries of old versions expire.
+
+    The query parameters are normalized: only those in cache_params or in the
+    filters of filterset_class are used, blank values are dropped and the rest
+    sorted, so e.g. an empty filter shares the entry of the unfiltered list.
+
+    Only successful GET responses are cached, as the views are the same for all
+    users. The caching is switched off by settings.VIEW_CACHE.
+
+    Attributes:
+        cache_params: The query parameters the response depends on, besides the
+            filters of filterset_class
+        cache_timeout: The lifetime of the cached responses in seconds
+    """
+
+    cache_params = ("page", "cursor")
+    cache_timeout = settings.VIEW_CACHE_TIMEOUT
+
+    def get(self, request, *args, **kwargs):
+        if not settings.VIEW_CACHE:
+            return super().get(request, *args, **kwargs)
+
+        key = self.get_cache_key()
+        cached = cache.get(key)
+        record_cache_lookup("view", cached is not None)
+        if cached is not None:
+            content, content_type = cached
+            response = HttpResponse(content, content_type=content_type)
+        else:
+            response = super().get(request, *args, **kwargs)
+            if response.status_code == 200:
+                self.cache_response(key, response)
+        patch_vary_headers(response, ["HX-Request"])
+        return response
+
+    def cache_response(self, key: str, response: HttpResponse) -> None:
+        def store(response):
+            value = (response.content, response.headers["Content-Type"])
+            cache.set(key, value, self.cache_timeout)
+
+        if getattr(response, "is_rendered", True):
+            store(response)
+        else:
+            response.add_post_render_callback(store)
+
+    def get_cache_params(self) -> list[tuple[str, str]]:
+        names = set(self.cache_params)
+        filterset_class = getattr(self, "filterset_class", None)
+        if filterset_class is not None:
+            names.update(filterset_class.base_filters)
+
+        params = []
+        for name in sorted(names):
+            for value in self.request.GET.getlist(name):
+                if value.strip():
+                    params.append((name, value.strip()))
+        return params
+
+    def get_cache_key(self) -> str:
+        """
+        Return the cache key of the response to the current request.
+        """
+        variant = "htmx" if self.request.headers.get("HX-Request") else "page"
+        kwargs = sorted(self.kwargs.items())
+        identity = repr((kwargs, self.get_cache_params()))
+        digest = hashlib.sha256(identity.encode()).hexdigest()
+        url_name = self.request.resolver_match.view_name
+        return f"view:{get_dataset_version()}:{url_name}:{variant}:{digest}"
@@ -0,0 +1,100 @@
+import hashlib
+from datetime import datetime
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from core.caching import get_dataset_version
+from core.metrics import record_cache_lookup
+
+
+class ConditionalMixin:
+    """
+    Base of the mixins answering conditional GET requests with 304 Not Modified.
+
+    The validators are computed by a cheap query before the view loads and
+    renders anything, see get_validators. A request whose If-None-Match or
+    If-Modified-Since matches them gets an empty 304 response, other responses
+    get the ETag and Last-Modified headers.
+
+    The ETag is weak and includes the representation, i.e. the format of the DRF
+    renderer or the HTMX variant of a template, so e.g. the browsable API and
+    JSON don't share a tag.
+
+    Attributes:
+        last_modified_field: The modification time field of the model
+    """
+
+    last_modified_field = "updated_at"
+
+    def get(self, request, *args, **kwargs):
+        validators = self.get_validators()
+        if validators is None:
+            return super().get(request, *args, **kwargs)
+
+        etag, last_modified = validators
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        record_cache_lookup("conditional_view", response is not None)
+        if response is not None:
+            return response
+
+        response = super().get(request, *args, **kwargs)
+        if response.status_code == 200:
+            response.headers["ETag"] = etag
+            if timestamp is not None:
+                response.headers["Last-Modified"] = http_date(timestamp)
+        return response
+
+    def get_validators(self) -> tuple[str, datetime | None] | None:
+        """
+        Return the ETag and the modification time of the response to the request.
+
+        Returns:
+            The quoted ETag and the modification time, which may be None, or None
+            if the request can't be validated, e.g. the object doesn't exist
+        """
+        raise NotImplementedError
+
+    def get_variant(self) -> str:
+        renderer = getattr(self.request, "accepted_renderer", None)
+        if renderer is not None:
+            return renderer.format
+        return "htmx" if self.request.headers.get("HX-Request") else "page"
+
+    def make_etag(self, *parts) -> str:
+        identity = repr((self.get_variant(), *parts))
+        return f"W/{quote_etag(hashlib.sha256(identity.encode()).hexdigest()[:32])}"
+
+
+class ConditionalObjectMixin(ConditionalMixin):
+    """
+    Mixin of detail views validating the response by the modification time of the
+    object, looked up by its primary key in the URL.
+    """
+
+    def get_validators(self) -> tuple[str, datetime | None] | None:
+        model = self.get_queryset().model
+        rows = model._default_manager.filter(pk=self.kwargs["pk"]).values_list(
+            self.last_modified_field, flat=True
+        )
+        last_modified = next(iter(rows.order_by()[:1]), None)
+        if last_modified is None:
+            return None
+        return self.make_etag(self.kwargs["pk"], last_modified), last_modified
+
+
+class ConditionalListMixin(ConditionalMixin):
+    """
+    Mixin of DRF list views validating the response by the dataset version and the
+    query string.
+
+    The dataset version changes whenever the updaters write, see
+    core.caching.get_dataset_version, so validating a list costs a cache read and
+    no query. Like the view cache, it doesn't see writes outside the updaters. The
+    lists have no modification time, so they send only the ETag.
+    """
+
+    def get_validators(self) -> tuple[str, datetime | None] | None:
+        params = sorted(self.request.GET.lists())
+        return self.make_etag(get_dataset_version(), params), None
@@ -0,0 +1,26 @@
+import django_filters
+from django_filters.utils import label_for_filter
+
+from core.lookups import TrigramIContains
+
+
+class TrigramFilterSet(django_filters.FilterSet):
+    """
+    FilterSet whose icontains filters generated from Meta.fields use the
+    trigram_icontains lookup, which the pg_trgm indexes of the columns serve.
+
+    The filters keep their names and labels, e.g. name__icontains, so the query
+    parameters of the views don't change.
+    """
+
+    @classmethod
+    def filter_for_field(cls, field, field_name, lookup_expr=None):
+        if lookup_expr != "icontains":
+            return super().filter_for_field(field, field_name, lookup_expr)
+
+        filter_ = super().filter_for_field(
+            field, field_name, TrigramIContains.lookup_name
+        )
+        if filter_ is not None:
+            filter_.label = label_for_filter(cls._meta.model, field_name, lookup_expr)
+        return filter_
@@ -0,0 +1,186 @@
+import hashlib
+import itertools
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from core.integrations.loaders import LoaderException
+from core.metrics import record_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+RECORD = "record"
+REPLAY = "replay"
+MODES = (RECORD, REPLAY)
+
+# Writes of the current process, counted to evict the cache periodically
+_writes = itertools.count(1)
+
+
+class ResponseCache:
+    """
+    On-disk cache of raw response bodies of the loaders.
+
+    Each body is stored in a file named by the SHA-256 hash of its URL. In the record
+    mode, loaders store the body of every successful response, and send no
+    conditional requests, so every response has a body to record. In the replay
+    mode, loaders serve their data from the cache without sending any request, so a
+    re-import after a transformer fix only re-runs the transformation and the update.
+
+    Entries older than ttl seconds are evicted when recording, together with the
+    least recently written entries when the cache grows over max_size bytes. The
+    replay mode serves all recorded entries regardless of their age.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        mode: str = RECORD,
+        ttl: int | None = None,
+        max_size: int | None = None,
+        evict_every: int = 100,
+    ):
+        """
+        Initialize the cache with its directory and limits.
+
+        Args:
+            directory: The directory of the cache files
+            mode: Either "record" or "replay"
+            ttl: The maximum age of entries in seconds, None for no limit
+            max_size: The maximum total size of entries in bytes, None for no limit
+            evict_every: The number of writes of a process between evictions
+        """
+        if mode not in MODES:
+            raise ValueError(f"Response cache mode must be one of {MODES}, not {mode}")
+
+        self.directory = Path(directory)
+        self.mode = mode
+        self.ttl = ttl
+        self.max_size = max_size
+        self.evict_every = evict_every
+
+    @property
+    def replay(self) -> bool:
+        return self.mode == REPLAY
+
+    @property
+    def record(self) -> bool:
+        return self.mode == RECORD
+
+    def get_path(self, url: str) -> Path:
+        key = hashlib.sha256(url.encode()).hexdigest()
+        return self.directory / key[:2] / f"{key}.json"
+
+    def is_expired(self, mtime: float, now: float) -> bool:
+        return self.ttl is not None and now - mtime > self.ttl
+
+    def get(self, url: str) -> bytes | None:
+        """
+        Read the cached body of a URL.
+
+        Args:
+            url: The URL of the response
+
+        Returns:
+            The raw body, or None if the URL is not cached or the entry expired,
+            which never happens in the replay mode
+        """
+        path = self.get_path(url)
+        try:
+            if not self.replay and self.is_expired(path.stat().st_mtime, time.time()):
+                content = None
+            else:
+                content = path.read_bytes()
+        except FileNotFoundError:
+            content = None
+        record_cache_lookup("response", content is not None)
+        return content
+
+    def set(self, url: str, content: bytes) -> None:
+        """
+        Store the body of a URL.
+
+        The file is written to a temporary file and renamed, so concurrent readers
+        never see a partially written entry.
+
+        Args:
+            url: The URL of the response
+            content: The raw body
+        """
+        path = self.get_path(url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as f:
+            f.write(content)
+        os.replace(f.name, path)
+
+        if next(_writes) % self.evict_every == 0:
+            self.evict()
+
+    def touch(self, url: str) -> None:
+        """
+        Refresh the age of a cached body, e.g. when the upstream says it is not modified.
+
+        Args:
+            url: The URL of the response
+        """
+        try:
+            os.utime(self.get_path(url))
+        except FileNotFoundError:
+            pass
+
+    def load(self, url: str) -> dict:
+        """
+        Replay the JSON data of a URL.
+
+        Args:
+            url: The URL of the response
+
+        Raises:
+            LoaderException: If the URL is not cached.
+
+        Returns:
+            The JSON data of the cached body
+        """
+        content = self.get(url)
+        if content is None:
+            logger.error("Response not cached.", extra={"url": url})
+            raise LoaderException(f"Response of {url} is not cached")
+        return json.loads(content)
+
+    def evict(self) -> int:
+        """
+        Delete expired entries and the oldest entries exceeding max_size.
+
+        Returns:
+            The number of deleted entries
+        """
+        now = time.time()
+        entries = []
+        for path in self.directory.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        expired = [path for mtime, _, path in entries if self.is_expired(mtime, now)]
+        entries = [entry for entry in entries if not self.is_expired(entry[0], now)]
+
+        oversized = []
+        if self.max_size is not None:
+            total_size = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total_size <= self.max_size:
+                    break
+                oversized.append(path)
+                total_size -= size
+
+        for path in expired + oversized:
+            path.unlink(missing_ok=True)
+
+        deleted = len(expired) + len(oversized)
+        logger.info("Response cache evicted.", extra={"deleted": deleted})
+        return deleted
@@ -0,0 +1,95 @@
+from django.db.models import Model
+
+
+class ThroughDiff:
+    """
+    Difference between the stored and the desired rows of a many-to-many through model.
+
+    The stored rows of all parents are loaded with one query and compared with the
+    desired rows by key_fields. Stored rows missing among the desired rows are deleted,
+    new rows are inserted and rows that differ only in update_fields are updated.
+    Changing a key field, e.g. moving a type to another slot, is applied as a delete
+    and an insert, so the unique constraints of the through model are never violated
+    by rows that have not been updated yet.
+    """
+
+    def __init__(
+        self,
+        model: type,
+        parent_field: str,
+        parent_ids: list[int],
+        rows: list[dict],
+        key_fields: tuple[str, ...],
+        update_fields: tuple[str, ...] = (),
+    ):
+        """
+        Initialize the diff with the desired state of the through model.
+
+        Args:
+            model: The through model class
+            parent_field: The attribute name of the foreign key to the parent, e.g. "pokemon_id"
+            parent_ids: The IDs of the parents whose rows are synchronized
+            rows: The desired rows of the parents, with keys named by attribute names
+            key_fields: The attribute names identifying a row
+            update_fields: The attribute names updated in place
+        """
+        self.model = model
+        self.parent_field = parent_field
+        self.parent_ids = parent_ids
+        self.rows = rows
+        self.key_fields = key_fields
+        self.update_fields = update_fields
+
+        self.to_create: list[Model] = []
+        self.to_update: list[Model] = []
+        self.to_delete: list[Model] = []
+
+    def get_key(self, row: dict) -> tuple:
+        return tuple(row[field] for field in self.key_fields)
+
+    def compute(self) -> "ThroughDiff":
+        """
+        Compare the stored rows with the desired rows.
+
+        Returns:
+            The diff itself, with to_create, to_update and to_delete filled in
+        """
+        stored = {
+            self.get_key(vars(instance)): instance
+            for instance in self.model.objects.filter(
+                **{f"{self.parent_field}__in": self.parent_ids}
+            )
+        }
+        desired = {self.get_key(row): row for row in self.rows}
+
+        self.to_delete = [
+            instance for key, instance in stored.items() if key not in desired
+        ]
+        self.to_create = []
+        self.to_update = []
+        for key, row in desired.items():
+            instance = stored.get(key)
+            if instance is None:
+                self.to_create.append(self.model(**row))
+            elif any(getattr(instance, f) != row[f] for f in self.update_fields):
+                for field in self.update_fields:
+                    setattr(instance, field, row[field])
+                self.to_update.append(instance)
+
+        return self
+
+    def has_changes(self) -> bool:
+        return bool(self.to_create or self.to_update or self.to_delete)
+
+    def apply(self) -> None:
+        """
+        Write the difference with one statement per operation.
+        """
+        if self.to_delete:
+            self.model.objects.filter(
+                pk__in=[instance.pk for instance in self.to_delete]
+            ).delete()
+        if self.to_update:
+            self.model.objects.bulk_update(self.to_update, self.update_fields)
+        if self.to_create:
+            self.model.objects.bulk_create(self.to_create)
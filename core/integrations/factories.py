@@ -1,11 +1,186 @@
+import threading
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import NamedTuple
+
 from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 from django.utils.module_loading import import_string
 
+from core.integrations.sessions import SESSION_KWARGS, get_session
+
+COMPONENTS = ("page_loader", "entity_loader", "transformer", "updater")
+OPTIONAL_COMPONENTS = ("rate_limiter", "response_cache")
+LOADERS = ("page_loader", "entity_loader")
+
+# How the entities of a page are processed by Celery tasks:
+# "chain" loads and saves each entity in separate tasks passing the raw data,
+# "fused" loads and transforms in one task passing only the transformed data,
+# "inline" loads, transforms and saves in one task passing nothing.
+CHAIN = "chain"
+FUSED = "fused"
+INLINE = "inline"
+PIPELINES = (CHAIN, FUSED, INLINE)
+
+
+class Component(NamedTuple):
+    """
+    Resolved configuration of a data source component.
+
+    Attributes:
+        cls: The imported component class.
+        kwargs: Read-only keyword arguments of the component.
+        session_kwargs: Read-only connection pool options of a loader.
+    """
+
+    cls: type
+    kwargs: Mapping
+    session_kwargs: Mapping
+
+
+_registry: Mapping[str, Mapping[str, Component | str]] | None = None
+_lock = threading.Lock()
+
+
+def resolve_component(source: str, name: str, config: dict) -> Component:
+    """
+    Import and validate the class of a single data source component.
+
+    Args:
+        source: The identifier of the data source
+        name: The name of the component, e.g. "page_loader"
+        config: The component configuration with "class" and optional "kwargs" keys
+
+    Raises:
+        ImproperlyConfigured: If the configuration is missing or the class can't be imported.
+
+    Returns:
+        The resolved component
+    """
+    if not config or "class" not in config:
+        raise ImproperlyConfigured(
+            f"DATA_SOURCES['{source}']['{name}'] must define a 'class'"
+        )
+
+    try:
+        cls = import_string(config["class"])
+    except ImportError as e:
+        raise ImproperlyConfigured(
+            f"DATA_SOURCES['{source}']['{name}'] class can't be imported: {e}"
+        ) from e
+
+    kwargs = dict(config.get("kwargs", {}))
+    session_kwargs = {}
+    if name in LOADERS:
+        session_kwargs = {
+            option: kwargs.pop(option) for option in SESSION_KWARGS if option in kwargs
+        }
+
+    if name == "page_loader" and "url" not in kwargs:
+        raise ImproperlyConfigured(
+            f"DATA_SOURCES['{source}']['{name}'] kwargs must define the initial 'url'"
+        )
+
+    return Component(
+        cls=cls,
+        kwargs=MappingProxyType(kwargs),
+        session_kwargs=MappingProxyType(session_kwargs),
+    )
+
+
+def resolve_pipeline(source: str, config: dict) -> str:
+    """
+    Validate the pipeline of a data source.
+
+    Args:
+        source: The identifier of the data source
+        config: The data source configuration with an optional "pipeline" key
+
+    Raises:
+        ImproperlyConfigured: If the pipeline is unknown.
+
+    Returns:
+        The pipeline, "chain" by default
+    """
+    pipeline = config.get("pipeline", CHAIN)
+    if pipeline not in PIPELINES:
+        raise ImproperlyConfigured(
+            f"DATA_SOURCES['{source}']['pipeline'] must be one of {PIPELINES}"
+        )
+    return pipeline
+
+
+def build_registry() -> Mapping[str, Mapping[str, Component | str]]:
+    """
+    Resolve the components of all data sources in settings.DATA_SOURCES.
+
+    Raises:
+        ImproperlyConfigured: If any of the data sources is misconfigured.
+
+    Returns:
+        A read-only mapping of data source identifiers to their resolved components
+        and their pipeline
+    """
+    return MappingProxyType(
+        {
+            source: MappingProxyType(
+                {
+                    **{
+                        name: resolve_component(source, name, config.get(name))
+                        for name in COMPONENTS + OPTIONAL_COMPONENTS
+                        if name in COMPONENTS or config.get(name) is not None
+                    },
+                    "pipeline": resolve_pipeline(source, config),
+                }
+            )
+            for source, config in settings.DATA_SOURCES.items()
+        }
+    )
+
+
+def get_registry() -> Mapping[str, Mapping[str, Component | str]]:
+    """
+    Return the resolved data sources, building them on first use in the process.
+
+    Celery workers build the registry at startup (see core.integrations.tasks), so
+    forked worker processes inherit it and a misconfiguration stops the worker.
+
+    Returns:
+        A read-only mapping of data source identifiers to their resolved components
+    """
+    global _registry
+
+    if _registry is None:
+        with _lock:
+            if _registry is None:
+                _registry = build_registry()
+    return _registry
+
+
+def clear_registry() -> None:
+    """
+    Drop the resolved data sources, so they are built again on next use.
+    """
+    global _registry
+
+    with _lock:
+        _registry = None
+
+
+@receiver(setting_changed)
+def clear_registry_on_setting_changed(setting: str, **kwargs) -> None:
+    if setting == "DATA_SOURCES":
+        clear_registry()
+
 
 class DataSourceFactory:
     """
     Factory class that dynamically loads and instantiates classes
-    based on the source configuration in settings.UPDATE_SOURCES.
+    based on the source configuration in settings.DATA_SOURCES.
+
+    The classes are imported and validated once per process, see get_registry.
     """
 
     def __init__(self, source: str):
@@ -13,13 +188,14 @@ class DataSourceFactory:
         Initialize the factory with a specific source.
 
         Args:
-            source: Source identifier to load configurations from settings.UPDATE_SOURCES
+            source: Source identifier to load configurations from settings.DATA_SOURCES
         """
-        if source not in settings.DATA_SOURCES:
-            raise ValueError(f"Source '{source}' not found in settings.UPDATE_SOURCES")
+        registry = get_registry()
+        if source not in registry:
+            raise ValueError(f"Source '{source}' not found in settings.DATA_SOURCES")
 
         self.source = source
-        self.config = settings.DATA_SOURCES[source]
+        self.config = registry[source]
 
     def get_page_loader(self, url: str | None = None, **kwargs: dict):
         """
@@ -28,31 +204,122 @@ class DataSourceFactory:
         Returns:
             An instance of the page loader class
         """
-        loader_config = self.config.get("page_loader", {})
-        loader_class = import_string(loader_config.get("class"))
-        kwargs = loader_config.get("kwargs", {}).copy()
+        loader = self.config["page_loader"]
+        kwargs = dict(loader.kwargs)
 
         initial_url = kwargs.pop("url")
         if url is None:
             url = initial_url
 
-        return loader_class(url=url, **kwargs)
+        session = get_session(**loader.session_kwargs)
+        return loader.cls(
+            url=url,
+            session=session,
+            rate_limiter=self.get_rate_limiter(),
+            response_cache=self.get_response_cache(),
+            **kwargs,
+        )
 
     def get_entity_loader(self, url: str):
         """
         Get the entity loader instance configured for this source.
 
         Args:
-            entity_id: The ID of the entity to load
+            url: The URL of the entity to load
 
         Returns:
             An instance of the entity loader class
         """
-        loader_config = self.config.get("entity_loader", {})
-        loader_class = import_string(loader_config.get("class"))
-        kwargs = loader_config.get("kwargs", {}).copy()
+        loader = self.config["entity_loader"]
+
+        session = get_session(**loader.session_kwargs)
+        return loader.cls(
+            url=url,
+            session=session,
+            rate_limiter=self.get_rate_limiter(),
+            response_cache=self.get_response_cache(),
+            **self.get_projection_kwargs(),
+            **loader.kwargs,
+        )
+
+    def get_pipeline(self) -> str:
+        """
+        Get the pipeline processing the entities of this source.
+
+        Returns:
+            One of "chain", "fused" and "inline"
+        """
+        return self.config["pipeline"]
+
+    def has_batch_entity_loader(self) -> bool:
+        """
+        Check whether the configured entity loader loads a whole page of entities at once.
+
+        Returns:
+            True if the entity loader class is a batch loader
+        """
+        return getattr(self.config["entity_loader"].cls, "batch", False)
+
+    def get_batch_entity_loader(self, urls: list[str]):
+        """
+        Get the batch entity loader instance configured for this source.
+
+        Args:
+            urls: The URLs of the entities to load
+
+        Returns:
+            An instance of the batch entity loader class
+        """
+        loader = self.config["entity_loader"]
 
-        return loader_class(url=url, **kwargs)
+        return loader.cls(
+            urls=urls,
+            rate_limiter=self.get_rate_limiter(),
+            response_cache=self.get_response_cache(),
+            **self.get_projection_kwargs(),
+            **loader.session_kwargs,
+            **loader.kwargs,
+        )
+
+    def get_projection_kwargs(self) -> dict:
+        """
+        Get the projection of the transformer for the entity loader.
+
+        A projection set in the entity loader kwargs takes precedence.
+
+        Returns:
+            The projection keyword argument, empty if there is nothing to project
+        """
+        projection = getattr(self.config["transformer"].cls, "projection", None)
+        if projection is None or "projection" in self.config["entity_loader"].kwargs:
+            return {}
+        return {"projection": projection}
+
+    def get_rate_limiter(self):
+        """
+        Get the rate limiter instance configured for this source.
+
+        Returns:
+            An instance of the rate limiter class, or None if the source is not rate limited
+        """
+        rate_limiter = self.config.get("rate_limiter")
+        if rate_limiter is None:
+            return None
+
+        return rate_limiter.cls(source=self.source, **rate_limiter.kwargs)
+
+    def get_response_cache(self):
+        """
+        Get the response cache instance configured for this source.
+
+        Returns:
+            An instance of the response cache class, or None if responses are not cached
+        """
+        response_cache = self.config.get("response_cache")
+        if response_cache is None:
+            return None
+
+        return response_cache.cls(**response_cache.kwargs)
 
     def get_transformer(self, data: dict):
         """
@@ -61,21 +328,26 @@ class DataSourceFactory:
         Returns:
             An instance of the transformer class
         """
-        transformer_config = self.config.get("transformer", {})
-        transformer_class = import_string(transformer_config.get("class"))
-        kwargs = transformer_config.get("kwargs", {})
+        transformer = self.config["transformer"]
 
-        return transformer_class(data=data, **kwargs)
+        return transformer.cls(data=data, **transformer.kwargs)
+
+    def has_bulk_updater(self) -> bool:
+        """
+        Check whether the configured updater saves a list of entities at once.
+
+        Returns:
+            True if the updater class is a bulk updater
+        """
+        return getattr(self.config["updater"].cls, "bulk", False)
 
-    def get_updater(self, data: dict):
+    def get_updater(self, data: dict | list[dict]):
         """
         Get the updater instance configured for this source.
 
         Returns:
             An instance of the updater class
         """
-        updater_config = self.config.get("updater", {})
-        updater_class = import_string(updater_config.get("class"))
-        kwargs = updater_config.get("kwargs", {})
+        updater = self.config["updater"]
 
-        return updater_class(data=data, **kwargs)
+        return updater.cls(data=data, **updater.kwargs)
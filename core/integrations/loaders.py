@@ -1,8 +1,27 @@
+import asyncio
+import json
 import logging
+import time
 from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from typing import Any, TypedDict
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
+import aiohttp
+import ijson
 import requests
+import urllib3
+
+from core.integrations.projection import (
+    build_projection_tree,
+    parse_projected,
+    parse_projected_async,
+    project,
+)
+from core.integrations.sessions import DEFAULT_TIMEOUT, get_session
+from core.integrations.validators import get_conditional_headers, get_validator_headers
+from core.metrics import record_cache_lookup
 
 logger = logging.getLogger(__name__)
 
@@ -18,46 +37,173 @@ class LoaderException(Exception):
     pass
 
 
-class DefaultPageLoader:
+class RateLimited(LoaderException):
     """
-    Default loader for paginated data from external APIs.
+    Exception raised when the upstream or the local rate limiter refuses a request.
 
-    This class handles loading data from a paginated API endpoint, parsing the response,
-    and extracting entity URLs and pagination information.
+    Attributes:
+        retry_after: Seconds to wait before the next attempt, None if unknown.
+    """
+
+    def __init__(self, *args, retry_after: float | None = None):
+        super().__init__(*args)
+        self.retry_after = retry_after
+
+
+RATE_LIMITED_STATUS_CODES = (429, 503)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Parse the Retry-After response header.
+
+    Args:
+        value: The header value, either delay seconds or an HTTP date
+
+    Returns:
+        The number of seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class BaseLoader:
     """
+    Base class for loaders fetching JSON data over HTTP.
+
+    Requests go through a keep-alive session shared by all loaders of the worker
+    process, so consecutive loads reuse pooled connections instead of opening a
+    new TCP/TLS connection for every URL.
 
-    def __init__(self, url: str, **kwargs):
+    With a rate limiter, every request waits for a token of the limiter and
+    reports its outcome back, see core.integrations.throttling.RateLimiter.
+
+    With a response cache, the bodies of successful responses are recorded, or the
+    data is replayed from the cache without any request in the replay mode, see
+    core.integrations.cache.ResponseCache.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        session: requests.Session | None = None,
+        timeout: float | tuple[float, float] = DEFAULT_TIMEOUT,
+        rate_limiter=None,
+        response_cache=None,
+        **kwargs,
+    ):
         """
-        Initialize the page loader with a URL and optional parameters.
+        Initialize the loader with a URL and optional parameters.
 
         Args:
             url: The URL to load data from
+            session: The HTTP session to use, the process-wide default session if None
+            timeout: The connect/read timeout of the request in seconds
+            rate_limiter: The rate limiter of the data source, or None
+            response_cache: The response cache of the data source, or None
             **kwargs: Additional parameters to use when loading data
         """
         self.url = url
+        self.session = session if session is not None else get_session()
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.response_cache = response_cache
         self.kwargs = kwargs
+        # The size of the downloaded response bodies, reported by the sync run tracking
+        self.bytes_downloaded = 0
 
-    def load(self) -> tuple[list[str], str | None]:
+    @property
+    def replaying(self) -> bool:
+        return self.response_cache is not None and self.response_cache.replay
+
+    @property
+    def recording(self) -> bool:
+        return self.response_cache is not None and self.response_cache.record
+
+    def get_json(self, response: requests.Response) -> dict:
         """
-        Loads the content of the specified URL, retrieves its response, and parses
-        the data. Ensures proper logging and error handling when the page cannot
-        be loaded or if a bad response is received.
+        Parse the JSON body of a successful response and record it in the response cache.
+
+        Args:
+            response: The successful response
+
+        Returns:
+            The JSON response data
+        """
+        content = response.content
+        self.bytes_downloaded += len(content)
+        if self.response_cache is not None:
+            self.response_cache.set(self.url, content)
+        return response.json()
+
+    def get_response(
+        self,
+        headers: dict[str, str] | None = None,
+        status_codes: tuple[int, ...] = (200,),
+        stream: bool = False,
+    ) -> requests.Response:
+        """
+        Send a GET request to the loader URL.
+
+        Args:
+            headers: Additional request headers
+            status_codes: The response status codes treated as successful
+            stream: Whether to return before the response body is downloaded
 
         Raises:
+            RateLimited: If the rate limiter has no token for the request or if the
+                upstream answers with 429 Too Many Requests or 503 Service Unavailable.
             LoaderException: If there is an exception during the request or if the
-                response status code is not 200.
+                response status code is not one of status_codes.
 
         Returns:
-            tuple[list[str], str | None]: Parsed data obtained from the response.
+            The successful response
         """
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+
+        started = time.monotonic()
         try:
             logger.info(f"Loading page.", extra={"url": self.url})
-            response = requests.get(self.url)
+            response = self.session.get(
+                self.url, headers=headers or {}, timeout=self.timeout, stream=stream
+            )
         except requests.exceptions.RequestException as e:
             logger.exception(e, extra={"url": self.url})
+            if self.rate_limiter is not None:
+                self.rate_limiter.record(None, time.monotonic() - started)
             raise LoaderException from e
 
-        if response.status_code != 200:
+        retry_after = None
+        if response.status_code in RATE_LIMITED_STATUS_CODES:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+
+        if self.rate_limiter is not None:
+            self.rate_limiter.record(
+                response.status_code, time.monotonic() - started, retry_after
+            )
+
+        if response.status_code in RATE_LIMITED_STATUS_CODES:
+            logger.warning(
+                f"Rate limited by upstream",
+                extra={
+                    "url": self.url,
+                    "status_code": response.status_code,
+                    "retry_after": retry_after,
+                },
+            )
+            raise RateLimited(response.text, retry_after=retry_after)
+
+        if response.status_code not in status_codes:
             logger.error(
                 f"Bad response status code",
                 extra={
@@ -68,7 +214,52 @@ class DefaultPageLoader:
             )
             raise LoaderException(response.text)
 
-        return self.parse_response(response.json())
+        return response
+
+
+class DefaultPageLoader(BaseLoader):
+    """
+    Default loader for paginated data from external APIs.
+
+    This class handles loading data from a paginated API endpoint, parsing the response,
+    and extracting entity URLs and pagination information.
+
+    With eager=True, the URLs of all remaining pages are generated from the total
+    count of entities and the offset/limit of the next page, see get_page_urls,
+    so the pages can be loaded in parallel instead of following the next links.
+    """
+
+    def __init__(self, url: str, eager: bool = False, **kwargs):
+        """
+        Initialize the page loader with a URL and optional parameters.
+
+        Args:
+            url: The URL of the page to load
+            eager: Whether to generate the URLs of all remaining pages
+            **kwargs: Additional parameters passed to BaseLoader
+        """
+        super().__init__(url, **kwargs)
+        self.eager = eager
+        self.count: int | None = None
+
+    def load(self) -> tuple[list[str], str | None]:
+        """
+        Loads the content of the specified URL, retrieves its response, and parses
+        the data. Ensures proper logging and error handling when the page cannot
+        be loaded or if a bad response is received.
+
+        Raises:
+            LoaderException: If there is an exception during the request or if the
+                response status code is not 200.
+
+        Returns:
+            tuple[list[str], str | None]: Parsed data obtained from the response.
+        """
+        if self.replaying:
+            return self.parse_response(self.response_cache.load(self.url))
+
+        response = self.get_response()
+        return self.parse_response(self.get_json(response))
 
     def parse_response(self, response_data: dict) -> tuple[list[str], str | None]:
         """
@@ -85,29 +276,88 @@ class DefaultPageLoader:
         """
         entity_urls = [entity["url"] for entity in response_data["results"]]
         next_url = response_data["next"] if "next" in response_data else None
+        self.count = response_data.get("count")
         return entity_urls, next_url
 
+    def get_page_urls(self, next_url: str) -> list[str] | None:
+        """
+        Generate the URLs of all pages following the loaded one.
+
+        The URLs are derived from the next page URL by stepping its offset by its
+        limit up to the total count of entities in the loaded response.
+
+        Args:
+            next_url: The URL of the next page returned by load()
+
+        Returns:
+            The URLs of the remaining pages, starting with next_url, or None if the
+            loader is not eager or the pagination can't be derived from the response
+        """
+        if not self.eager or self.count is None:
+            return None
 
-class DefaultEntityLoader:
+        parts = urlsplit(next_url)
+        query = dict(parse_qsl(parts.query))
+        try:
+            offset, limit = int(query["offset"]), int(query["limit"])
+        except (KeyError, ValueError):
+            return None
+        if limit <= 0:
+            return None
+
+        page_urls = [
+            urlunsplit(
+                parts._replace(query=urlencode({**query, "offset": page_offset}))
+            )
+            for page_offset in range(offset, self.count, limit)
+        ]
+        return page_urls or None
+
+
+class DefaultEntityLoader(BaseLoader):
     """
     Default loader for individual entity data from external APIs.
 
     This class handles loading data for a specific entity from an API endpoint
     and returning the raw JSON response.
+
+    With conditional=True, the stored ETag/Last-Modified validators of the URL are
+    sent with the request. An unchanged entity is then answered with 304 Not
+    Modified and load() returns None. The validators of a new response are kept in
+    the validators attribute, and are stored only once the entity is saved, see
+    core.integrations.tasks.save_transformed. No validators are sent while the
+    response cache is recording, as a 304 response has no body to record.
+
+    With a projection, only the values at the given dotted paths are returned. The
+    response body is then parsed incrementally while it is downloaded and the other
+    values are never materialized, see core.integrations.projection.
     """
 
-    def __init__(self, url: str, **kwargs):
+    def __init__(
+        self,
+        url: str,
+        conditional: bool = False,
+        projection: tuple[str, ...] | None = None,
+        **kwargs,
+    ):
         """
         Initialize the entity loader with a URL and optional parameters.
 
         Args:
             url: The URL to load entity data from
-            **kwargs: Additional parameters to use when loading data
+            conditional: Whether to send conditional requests
+            projection: The dotted paths of the values to load, None for all values
+            **kwargs: Additional parameters passed to BaseLoader
         """
-        self.url = url
-        self.kwargs = kwargs
+        super().__init__(url, **kwargs)
+        self.conditional = conditional
+        self.projection_tree = build_projection_tree(projection) if projection else None
+        # The validators of the loaded responses by URL, to be stored with the entity
+        self.validators: dict[str, dict[str, str]] = {}
+        # Recorded responses keep the whole body, so they are not streamed
+        self.stream = self.projection_tree is not None and self.response_cache is None
 
-    def load(self) -> dict:
+    def load(self) -> dict | None:
         """
         Load entity data from the specified URL.
 
@@ -117,27 +367,308 @@ class DefaultEntityLoader:
 
         Raises:
             LoaderException: If there is an error during the request or if the
-                             HTTP response status code is not 200.
+                             HTTP response status code is not 200 (or 304 for
+                             conditional requests).
 
         Returns:
-            The JSON response data as a dictionary
+            The JSON response data as a dictionary, or None if the entity was not modified
+        """
+        if self.replaying:
+            return self.project(self.response_cache.load(self.url))
+
+        if not self.conditional:
+            return self.get_entity_data(self.get_response(stream=self.stream))
+
+        headers = None
+        if not self.recording:
+            headers = get_conditional_headers([self.url]).get(self.url)
+        response = self.get_response(
+            headers=headers, status_codes=(200, 304), stream=self.stream
+        )
+
+        record_cache_lookup("conditional", response.status_code == 304)
+        if response.status_code == 304:
+            logger.info(f"Entity not modified.", extra={"url": self.url})
+            if self.response_cache is not None:
+                self.response_cache.touch(self.url)
+            return None
+
+        entity_data = self.get_entity_data(response)
+        self.validators[self.url] = get_validator_headers(response.headers)
+        return entity_data
+
+    def project(self, entity_data: dict) -> dict:
+        if self.projection_tree is None:
+            return entity_data
+        return project(entity_data, self.projection_tree)
+
+    def get_entity_data(self, response: requests.Response) -> dict:
         """
+        Parse the entity data of a successful response.
+
+        Args:
+            response: The successful response
+
+        Raises:
+            LoaderException: If the streamed body can't be read or parsed.
+
+        Returns:
+            The JSON response data, projected if the loader has a projection
+        """
+        if not self.stream:
+            return self.project(self.get_json(response))
+
         try:
-            logger.info(f"Loading page.", extra={"url": self.url})
-            response = requests.get(self.url)
-        except requests.exceptions.RequestException as e:
+            response.raw.decode_content = True
+            return parse_projected(response.raw, self.projection_tree)
+        except (ijson.JSONError, urllib3.exceptions.HTTPError, OSError) as e:
             logger.exception(e, extra={"url": self.url})
             raise LoaderException from e
+        finally:
+            self.bytes_downloaded += response.raw.tell()
+            response.close()
 
-        if response.status_code != 200:
-            logger.error(
-                f"Bad response status code",
-                extra={
-                    "url": self.url,
-                    "status_code": response.status_code,
-                    "response_text": response.text,
-                },
+
+class AsyncBatchEntityLoader:
+    """
+    Loader fetching a whole page of entities concurrently.
+
+    The entity URLs are requested on an asyncio event loop. A semaphore bounds the
+    number of requests in flight, so a single worker process can keep the upstream
+    busy without one Celery task per entity.
+
+    A failing URL doesn't fail the batch: its exception is kept in the errors
+    attribute, so the caller can retry only the failed URLs.
+    """
+
+    batch = True
+
+    def __init__(
+        self,
+        urls: list[str],
+        conditional: bool = False,
+        projection: tuple[str, ...] | None = None,
+        concurrency: int = 10,
+        pool_maxsize: int | None = None,
+        timeout: float | tuple[float, float] = DEFAULT_TIMEOUT,
+        rate_limiter=None,
+        response_cache=None,
+        **kwargs,
+    ):
+        """
+        Initialize the batch loader with a list of URLs and optional parameters.
+
+        Args:
+            urls: The URLs to load entity data from
+            conditional: Whether to send conditional requests, see DefaultEntityLoader
+            projection: The dotted paths of the values to load, see DefaultEntityLoader
+            concurrency: The maximum number of requests in flight
+            pool_maxsize: The maximum number of connections per host, defaults to concurrency
+            timeout: The connect/read timeout of each request in seconds
+            rate_limiter: The rate limiter of the data source, or None
+            response_cache: The response cache of the data source, or None
+            **kwargs: Additional parameters to use when loading data
+        """
+        self.urls = urls
+        self.conditional = conditional
+        self.projection_tree = build_projection_tree(projection) if projection else None
+        self.concurrency = concurrency
+        self.pool_maxsize = pool_maxsize or concurrency
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.response_cache = response_cache
+        self.kwargs = kwargs
+        # The size of the downloaded response bodies, reported by the sync run tracking
+        self.bytes_downloaded = 0
+        # The validators of the loaded responses by URL, to be stored with the entities
+        self.validators: dict[str, dict[str, str]] = {}
+        # The exceptions of the failed URLs, e.g. RateLimited or LoaderException for
+        # a status code other than 200 (or 304 for conditional requests)
+        self.errors: dict[str, Exception] = {}
+
+    def load(self) -> list[dict | None]:
+        """
+        Load data of all entities.
+
+        Validators of conditional requests are read before the event loop runs, so
+        the database is not accessed from async code. The validators of the new
+        responses are kept in the validators attribute, see DefaultEntityLoader.
+
+        Returns:
+            The JSON response data of the entities in the order of the URLs,
+            None for entities that were not modified or failed, see errors
+        """
+        if self.response_cache is not None and self.response_cache.replay:
+            return [self.load_replayed(url) for url in self.urls]
+
+        # A 304 response has no body to record, see DefaultEntityLoader
+        recording = self.response_cache is not None and self.response_cache.record
+        if self.conditional and not recording:
+            request_headers = get_conditional_headers(self.urls)
+        else:
+            request_headers = {}
+
+        return asyncio.run(self.load_all(request_headers))
+
+    async def load_all(
+        self, request_headers: dict[str, dict[str, str]]
+    ) -> list[dict | None]:
+        """
+        Load data of all entities on the running event loop.
+
+        Args:
+            request_headers: Additional request headers by URL
+
+        Returns:
+            The JSON response data of the entities in the order of the URLs, None
+            for the failed ones
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        connector = aiohttp.TCPConnector(
+            limit=self.concurrency, limit_per_host=self.pool_maxsize
+        )
+        async with aiohttp.ClientSession(
+            connector=connector,
+            timeout=self.get_client_timeout(),
+            auto_decompress=True,
+        ) as session:
+            results = await asyncio.gather(
+                *(
+                    self.fetch(
+                        session,
+                        semaphore,
+                        url,
+                        request_headers.get(url),
+                    )
+                    for url in self.urls
+                ),
+                return_exceptions=True,
             )
-            raise LoaderException(response.text)
 
-        return response.json()
+        entities_data = []
+        for url, result in zip(self.urls, results):
+            if not isinstance(result, BaseException):
+                entities_data.append(result)
+            elif isinstance(result, Exception):
+                self.errors[url] = result
+                entities_data.append(None)
+            else:  # e.g. cancelled
+                raise result
+        return entities_data
+
+    def load_replayed(self, url: str) -> dict | None:
+        try:
+            return self.project(self.response_cache.load(url))
+        except LoaderException as e:
+            self.errors[url] = e
+            return None
+
+    async def fetch(
+        self,
+        session: aiohttp.ClientSession,
+        semaphore: asyncio.Semaphore,
+        url: str,
+        headers: dict[str, str] | None,
+    ) -> dict | None:
+        """
+        Load data of a single entity.
+
+        Args:
+            session: The client session to send the request with
+            semaphore: The semaphore bounding the number of requests in flight
+            url: The URL to load entity data from
+            headers: Additional request headers
+
+        Returns:
+            The JSON response data as a dictionary, or None if the entity was not modified
+        """
+        async with semaphore:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async()
+
+            started = time.monotonic()
+            try:
+                logger.info(f"Loading page.", extra={"url": url})
+                async with session.get(url, headers=headers) as response:
+                    retry_after = None
+                    if response.status in RATE_LIMITED_STATUS_CODES:
+                        retry_after = parse_retry_after(
+                            response.headers.get("Retry-After")
+                        )
+
+                    if self.rate_limiter is not None:
+                        await self.rate_limiter.record_async(
+                            response.status, time.monotonic() - started, retry_after
+                        )
+
+                    if response.status in RATE_LIMITED_STATUS_CODES:
+                        logger.warning(
+                            f"Rate limited by upstream",
+                            extra={
+                                "url": url,
+                                "status_code": response.status,
+                                "retry_after": retry_after,
+                            },
+                        )
+                        raise RateLimited(
+                            await response.text(), retry_after=retry_after
+                        )
+
+                    if self.conditional and response.status in (200, 304):
+                        record_cache_lookup("conditional", response.status == 304)
+                    if response.status == 304 and self.conditional:
+                        logger.info(f"Entity not modified.", extra={"url": url})
+                        if self.response_cache is not None:
+                            self.response_cache.touch(url)
+                        return None
+
+                    if response.status != 200:
+                        response_text = await response.text()
+                        logger.error(
+                            f"Bad response status code",
+                            extra={
+                                "url": url,
+                                "status_code": response.status,
+                                "response_text": response_text,
+                            },
+                        )
+                        raise LoaderException(response_text)
+
+                    if self.projection_tree is not None and self.response_cache is None:
+                        entity_data = await parse_projected_async(
+                            response.content, self.projection_tree
+                        )
+                        self.bytes_downloaded += response.content.total_bytes
+                    else:
+                        content = await response.read()
+                        self.bytes_downloaded += len(content)
+                        entity_data = self.project(json.loads(content))
+                        if self.response_cache is not None:
+                            self.response_cache.set(url, content)
+                    if self.conditional:
+                        self.validators[url] = get_validator_headers(response.headers)
+                    return entity_data
+            except (aiohttp.ClientError, asyncio.TimeoutError, ijson.JSONError) as e:
+                logger.exception(e, extra={"url": url})
+                if self.rate_limiter is not None:
+                    await self.rate_limiter.record_async(
+                        None, time.monotonic() - started
+                    )
+                raise LoaderException from e
+
+    def project(self, entity_data: dict) -> dict:
+        if self.projection_tree is None:
+            return entity_data
+        return project(entity_data, self.projection_tree)
+
+    def get_client_timeout(self) -> aiohttp.ClientTimeout:
+        """
+        Convert the requests style timeout to an aiohttp timeout.
+
+        Returns:
+            The timeout of each request
+        """
+        if isinstance(self.timeout, (tuple, list)):
+            connect, read = self.timeout
+            return aiohttp.ClientTimeout(connect=connect, sock_read=read)
+        return aiohttp.ClientTimeout(total=self.timeout)
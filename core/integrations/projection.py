@@ -0,0 +1,171 @@
+from collections.abc import Iterable
+from typing import Any
+
+import ijson
+
+# A projection tree maps keys to their sub-trees, ALL selects the whole value
+ALL = True
+
+
+def build_projection_tree(paths: Iterable[str]) -> dict:
+    """
+    Build a projection tree from dotted paths.
+
+    A path selects the value at its end with all nested data, e.g. "sprites.front_default".
+    Lists are transparent, so "types.slot" selects the slot of every item of the types list.
+
+    Args:
+        paths: The dotted paths of the selected values
+
+    Returns:
+        The nested projection tree
+    """
+    tree = {}
+    for path in paths:
+        node = tree
+        *parents, leaf = path.split(".")
+        for key in parents:
+            child = node.setdefault(key, {})
+            if child is ALL:
+                break
+            node = child
+        else:
+            node[leaf] = ALL
+    return tree
+
+
+def project(data: Any, tree: dict | bool) -> Any:
+    """
+    Select the values of a projection tree from parsed JSON data.
+
+    Args:
+        data: The parsed JSON data
+        tree: The projection tree, see build_projection_tree
+
+    Returns:
+        The projected data
+    """
+    if tree is ALL:
+        return data
+    if isinstance(data, list):
+        return [project(item, tree) for item in data]
+    if isinstance(data, dict):
+        return {
+            key: project(data[key], node) for key, node in tree.items() if key in data
+        }
+    return data
+
+
+class ProjectionBuilder:
+    """
+    Builder of projected data from ijson parser events.
+
+    Only the values selected by the projection tree are built, the events of
+    other values are skipped, so large unused parts of a document are never
+    materialized in memory.
+    """
+
+    def __init__(self, tree: dict):
+        self.tree = tree
+        self.value = None
+        # Frames of the containers being built: [container, tree node, current key]
+        self.stack: list[list] = []
+        self.skip_depth = 0
+
+    def event(self, event: str, value: Any) -> None:
+        """
+        Process a single event of ijson.basic_parse.
+
+        Args:
+            event: The event name
+            value: The event value
+        """
+        if self.skip_depth:
+            if event in ("start_map", "start_array"):
+                self.skip_depth += 1
+            elif event in ("end_map", "end_array"):
+                self.skip_depth -= 1
+            return
+
+        if event == "map_key":
+            self.stack[-1][2] = value
+            return
+        if event in ("end_map", "end_array"):
+            self.stack.pop()
+            return
+
+        node = self.get_node()
+        if node is None:
+            if event in ("start_map", "start_array"):
+                self.skip_depth = 1
+            return
+
+        if event == "start_map":
+            child = {}
+        elif event == "start_array":
+            child = []
+        else:
+            child = value
+        self.attach(child)
+        if event in ("start_map", "start_array"):
+            self.stack.append([child, node, None])
+
+    def get_node(self) -> dict | bool | None:
+        if not self.stack:
+            return self.tree
+
+        container, node, key = self.stack[-1]
+        if node is ALL or isinstance(container, list):
+            return node
+        return node.get(key)
+
+    def attach(self, child: Any) -> None:
+        if not self.stack:
+            self.value = child
+            return
+
+        container, _, key = self.stack[-1]
+        if isinstance(container, list):
+            container.append(child)
+        else:
+            container[key] = child
+
+
+def parse_projected(file, tree: dict) -> Any:
+    """
+    Parse the projected data of a JSON document from a file-like object.
+
+    Args:
+        file: A binary file-like object with the JSON document
+        tree: The projection tree, see build_projection_tree
+
+    Raises:
+        ijson.JSONError: If the document is not valid JSON.
+
+    Returns:
+        The projected data
+    """
+    builder = ProjectionBuilder(tree)
+    for event, value in ijson.basic_parse(file, use_float=True):
+        builder.event(event, value)
+    return builder.value
+
+
+async def parse_projected_async(file, tree: dict) -> Any:
+    """
+    Parse the projected data of a JSON document from an asynchronous file-like object.
+
+    Args:
+        file: An object with an asynchronous read method, e.g. aiohttp.StreamReader
+        tree: The projection tree, see build_projection_tree
+
+    Raises:
+        ijson.JSONError: If the document is not valid JSON.
+
+    Returns:
+        The projected data
+    """
+    builder = ProjectionBuilder(tree)
+    async for event, value in ijson.basic_parse_async(file, use_float=True):
+        builder.event(event, value)
+    return builder.value
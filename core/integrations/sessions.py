@@ -0,0 +1,134 @@
+import logging
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_POOL_BLOCK = True
+DEFAULT_TIMEOUT = (5, 30)
+
+# Loader kwargs in settings.DATA_SOURCES that configure the shared session
+# rather than the loader itself.
+SESSION_KWARGS = ("pool_connections", "pool_maxsize", "pool_block")
+
+_sessions: dict[tuple, requests.Session] = {}
+_sessions_pid: int | None = None
+_lock = threading.Lock()
+
+
+def create_session(
+    pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+    pool_block: bool = DEFAULT_POOL_BLOCK,
+) -> requests.Session:
+    """
+    Create a keep-alive HTTP session with a bounded connection pool.
+
+    Args:
+        pool_connections: The number of hosts to keep connection pools for
+        pool_maxsize: The maximum number of connections kept open per host
+        pool_block: Whether to wait for a free connection instead of opening
+            connections beyond pool_maxsize
+
+    Returns:
+        A configured requests.Session instance
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=pool_block,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    # gzip/deflate and brotli, if the brotli package is installed
+    session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+    session.headers["Connection"] = "keep-alive"
+    return session
+
+
+def get_session(**kwargs) -> requests.Session:
+    """
+    Return the session shared by all loaders of the current process.
+
+    Sessions are cached per process and per pool configuration. The cache is
+    dropped when the process id changes, so prefork workers never reuse sockets
+    inherited from the parent process.
+
+    Args:
+        **kwargs: Pool options accepted by create_session
+
+    Returns:
+        The shared requests.Session instance
+    """
+    global _sessions_pid
+
+    key = tuple(sorted(kwargs.items()))
+    with _lock:
+        if _sessions_pid != os.getpid():
+            _sessions.clear()
+            _sessions_pid = os.getpid()
+
+        if key not in _sessions:
+            logger.info("Creating HTTP session.", extra={"pool": dict(key)})
+            _sessions[key] = create_session(**kwargs)
+
+        return _sessions[key]
+
+
+def close_sessions() -> None:
+    """
+    Close all sessions of the current process and release their connections.
+    """
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+def get_pool_stats() -> list[dict]:
+    """
+    Collect connection pool statistics of the sessions of the current process.
+
+    Returns:
+        A list with one dictionary per host connection pool
+    """
+    stats = []
+    with _lock:
+        if _sessions_pid != os.getpid():
+            return stats
+
+        for key, session in _sessions.items():
+            adapters = {id(adapter): adapter for adapter in session.adapters.values()}
+            for adapter in adapters.values():
+                pools = adapter.poolmanager.pools
+                for pool_key in pools.keys():
+                    pool = pools[pool_key]
+                    stats.append(
+                        {
+                            "pid": _sessions_pid,
+                            "session": dict(key),
+                            "scheme": pool.scheme,
+                            "host": pool.host,
+                            "port": pool.port,
+                            "maxsize": pool.pool.maxsize if pool.pool else 0,
+                            "idle_connections": _count_idle(pool),
+                            "connections_opened": pool.num_connections,
+                            "requests": pool.num_requests,
+                        }
+                    )
+    return stats
+
+
+def _count_idle(pool) -> int:
+    # The pool queue is pre-filled with None placeholders for connections
+    # that have not been opened yet.
+    if pool.pool is None:
+        return 0
+    return sum(1 for conn in list(pool.pool.queue) if conn is not None)
@@ -1,26 +1,203 @@
 import logging
+import os
+import random
+import time
+from collections import Counter
+from contextlib import contextmanager
 from typing import Any
 
-from celery import group, shared_task
+from celery import Signature, chord, group, shared_task
+from celery.exceptions import Retry
+from celery.signals import (
+    task_failure,
+    task_postrun,
+    task_prerun,
+    worker_init,
+    worker_process_shutdown,
+)
+from celery.utils.time import get_exponential_backoff_interval
+from django.conf import settings
+from django.db import OperationalError, transaction
 
-from core.integrations.factories import DataSourceFactory
-from core.integrations.loaders import LoaderException
+from core.integrations.factories import (
+    FUSED,
+    INLINE,
+    DataSourceFactory,
+    get_registry,
+)
+from core.integrations.loaders import LoaderException, RateLimited
+from core.integrations.sessions import close_sessions, get_pool_stats
+from core.integrations.tracking import (
+    LOAD_ENTITY,
+    LOAD_PAGE,
+    PROCESS_ENTITY,
+    SAVE_ENTITY,
+    record_failure,
+    set_entity_count,
+    start_run,
+    track_stage,
+)
+from core.integrations.validators import save_validators
+from core.metrics import TASK_DURATION, mark_process_dead, start_metrics_server
 
 logger = logging.getLogger(__name__)
 
+# Start times of the running tasks of the process by task ID
+_task_started: dict[str, float] = {}
+
+# Waiting for the rate limit is expected during a synchronization, so rate limited
+# tasks are retried more times than failing ones.
+RATE_LIMITED_MAX_RETRIES = 20
+
+# The result of loading an entity passed between the tasks: the URL, the raw or
+# transformed data, None if not modified, and the validators of the response.
+# A failed entity has an error and the stage it failed in instead.
+EntityResult = dict[str, Any]
+
+
+def make_result(url: str, data: dict[str, Any] | None, loader) -> EntityResult:
+    return {"url": url, "data": data, "validators": loader.validators.get(url)}
+
+
+def make_failed_result(url: str, stage: str, exc: Exception) -> EntityResult:
+    logger.error("Entity failed.", exc_info=exc, extra={"url": url, "stage": stage})
+    return {
+        "url": url,
+        "data": None,
+        "validators": None,
+        "error": f"{type(exc).__name__}: {exc}",
+        "stage": stage,
+    }
+
+
+def will_retry(task, exc: Exception) -> bool:
+    """
+    Return whether a task is retried after an exception, by Task.retry or autoretry.
+    """
+    if isinstance(exc, Retry):
+        return True
+    if not isinstance(exc, task.autoretry_for):
+        return False
+    return task.request.retries < task.retry_kwargs["max_retries"]
+
+
+def record_failed_results(
+    results: list[EntityResult], run_id: int | None
+) -> list[EntityResult]:
+    """
+    Record the failed results in the run and return the other ones.
+
+    Args:
+        results: The results of the entities
+        run_id: The primary key of the SyncRun tracking the synchronization, or None
+
+    Returns:
+        The results of the entities that did not fail
+    """
+    failed = Counter(result["stage"] for result in results if "error" in result)
+    if run_id is not None:
+        for stage, items in failed.items():
+            record_failure(run_id, stage, items)
+    return [result for result in results if "error" not in result]
+
+
+@contextmanager
+def retry_when_rate_limited(task):
+    """
+    Retry the task after the Retry-After delay if it gets rate limited.
+
+    The delay is jittered, so tasks limited at the same time don't come back at once.
+    Without a known delay, the exception propagates to the exponential autoretry.
+
+    Args:
+        task: The bound task instance
+    """
+    try:
+        yield
+    except RateLimited as e:
+        if e.retry_after is None:
+            raise
+        countdown = e.retry_after * (1 + random.random() / 2)
+        logger.info(
+            "Task rate limited.",
+            extra={"task": task.name, "countdown": countdown},
+        )
+        raise task.retry(
+            exc=e, countdown=countdown, max_retries=RATE_LIMITED_MAX_RETRIES
+        )
+
+
+def retry_failed_entities(
+    task, errors: dict[str, Exception], stage: str, loaded: dict[str, EntityResult]
+) -> None:
+    """
+    Retry a batch task for its failed entities, or add their failed results.
+
+    The retried task gets the results of the other entities in its loaded kwarg,
+    so only the failed entities are downloaded again. Rate limited entities are
+    retried after the Retry-After delay like in retry_when_rate_limited, the other
+    loader errors with the exponential backoff of the autoretry. Entities failed
+    with other errors, or after the last retry, get a failed result in loaded.
+
+    Args:
+        task: The bound batch task instance
+        errors: The exceptions of the failed entities by URL
+        stage: The stage of the task
+        loaded: The results of the entities by URL, updated in place
+
+    Raises:
+        Retry: If any failed entity is retried.
+    """
+    retried = {url: e for url, e in errors.items() if isinstance(e, task.autoretry_for)}
+    for url, e in errors.items():
+        if url not in retried:
+            loaded[url] = make_failed_result(url, stage, e)
+    if not retried:
+        return
+
+    retry_after = [
+        e.retry_after
+        for e in retried.values()
+        if isinstance(e, RateLimited) and e.retry_after is not None
+    ]
+    if retry_after:
+        countdown = max(retry_after) * (1 + random.random() / 2)
+        max_retries = RATE_LIMITED_MAX_RETRIES
+    else:
+        countdown = get_exponential_backoff_interval(
+            factor=1, retries=task.request.retries, maximum=600, full_jitter=True
+        )
+        max_retries = task.retry_kwargs["max_retries"]
+
+    if task.request.retries < max_retries:
+        logger.info(
+            "Failed entities retried.",
+            extra={"task": task.name, "urls": list(retried), "countdown": countdown},
+        )
+        raise task.retry(
+            exc=next(iter(retried.values())),
+            countdown=countdown,
+            max_retries=max_retries,
+            kwargs={**task.request.kwargs, "loaded": loaded},
+        )
+    for url, e in retried.items():
+        loaded[url] = make_failed_result(url, stage, e)
+
 
 @shared_task
 def sync_data(source: str) -> None:
     """
     Start the data synchronization process for a specific data source.
 
-    This is the entry point for the data synchronization process. It initiates
-    the asynchronous loading of the first page of data from the specified source.
+    This is the entry point for the data synchronization process. It starts a
+    SyncRun tracking the progress of the synchronization and initiates the
+    asynchronous loading of the first page of data from the specified source.
 
     Args:
         source: The identifier of the data source  defined in settings.DATA_SOURCES to synchronize
     """
-    load_page_task.delay(source)
+    run = start_run(source)
+    load_page_task.delay(source, run_id=run.pk)
 
 
 @shared_task(
@@ -29,7 +206,13 @@ def sync_data(source: str) -> None:
     retry_backoff=True,  # exponential
     retry_kwargs={"max_retries": 5},
 )
-def load_page_task(self, source: str, page_url: str | None = None) -> None:
+def load_page_task(
+    self,
+    source: str,
+    page_url: str | None = None,
+    follow_next: bool = True,
+    run_id: int | None = None,
+) -> None:
     """
     Load a page of data from the specified source and process each entity.
 
@@ -37,59 +220,240 @@ def load_page_task(self, source: str, page_url: str | None = None) -> None:
     and creates a group of tasks to load and save each entity. If there is a next page,
     it recursively schedules itself to load that page.
 
+    With an eager page loader, the URLs of all remaining pages are generated from
+    the first page and scheduled at once, so the pages are loaded in parallel and
+    don't follow their next pages.
+
+    With a batch entity loader, the whole page is loaded by one load_entities_task.
+    With a bulk updater, the loaded entities are collected by a chord and saved
+    together by one save_page_task. The pipeline of the source decides which tasks
+    process the entities, see get_entity_canvas.
+
     The task will automatically retry up to 5 times with exponential backoff if a
-    LoaderException occurs.
+    LoaderException occurs, or after the Retry-After delay if it is rate limited.
 
     Args:
         self: The task instance (provided by Celery when bind=True)
         source: The identifier of the data source
         page_url: The URL of the page to load, or None for the first page
+        follow_next: Whether to schedule the next page
+        run_id: The primary key of the SyncRun tracking the synchronization, or None
     """
-    factory = DataSourceFactory(source)
-    entity_urls, next_url = factory.get_page_loader(url=page_url).load()
+    with track_stage(run_id, LOAD_PAGE) as stats:
+        factory = DataSourceFactory(source)
+        page_loader = factory.get_page_loader(url=page_url)
+        with retry_when_rate_limited(self):
+            entity_urls, next_url = page_loader.load()
+        stats.items = len(entity_urls)
+        stats.bytes_downloaded = page_loader.bytes_downloaded
 
-    entity_group = group(
-        load_entity_task.si(url, source) | save_entity_task.s(source)
-        for url in entity_urls
-    )
+    if run_id is not None and page_url is None:
+        set_entity_count(run_id, page_loader.count)
+
+    entity_group = get_entity_canvas(factory, source, entity_urls, run_id)
 
-    if next_url is None:
+    page_urls = None
+    if next_url is not None and follow_next:
+        page_urls = page_loader.get_page_urls(next_url)
+
+    if next_url is None or not follow_next:
         canvas = entity_group
+    elif page_urls is not None:
+        canvas = group(
+            entity_group,
+            *(
+                load_page_task.si(source, url, follow_next=False, run_id=run_id)
+                for url in page_urls
+            ),
+        )
     else:
         canvas = group(
-            entity_group, load_page_task.si(source, next_url)  # add recurse invoke
+            entity_group,
+            load_page_task.si(source, next_url, run_id=run_id),  # add recurse invoke
         )
 
-        self.replace(canvas)
+    self.replace(canvas)
+
+
+def get_entity_canvas(
+    factory: DataSourceFactory,
+    source: str,
+    entity_urls: list[str],
+    run_id: int | None = None,
+) -> Signature:
+    """
+    Build the canvas processing the entities of a page.
+
+    In the "chain" pipeline, the raw data of the entities are passed from the load
+    tasks to the save tasks through the result backend. In the "fused" pipeline,
+    the entities are transformed by the load tasks, so only the transformed data
+    are passed. In the "inline" pipeline, the entities are also saved by the load
+    tasks and nothing is passed.
+
+    The tasks passing data return a failed result for an entity failed after all
+    retries instead of raising, so the other entities of a chord are still saved.
+
+    Args:
+        factory: The factory of the data source
+        source: The identifier of the data source
+        entity_urls: The URLs of the entities of the page
+        run_id: The primary key of the SyncRun tracking the synchronization, or None
+
+    Returns:
+        The canvas to replace load_page_task with
+    """
+    pipeline = factory.get_pipeline()
+    batch = factory.has_batch_entity_loader()
+
+    if pipeline == INLINE:
+        if batch:
+            return process_entities_task.si(
+                entity_urls, source, save=True, run_id=run_id
+            )
+        return group(
+            process_entity_task.si(url, source, save=True, run_id=run_id)
+            for url in entity_urls
+        )
+
+    if pipeline == FUSED:
+        if batch:
+            return process_entities_task.si(
+                entity_urls, source, run_id=run_id
+            ) | save_transformed_task.s(source, run_id=run_id)
+        if factory.has_bulk_updater():
+            return chord(
+                (
+                    process_entity_task.si(url, source, run_id=run_id)
+                    for url in entity_urls
+                ),
+                save_transformed_task.s(source, run_id=run_id),
+            )
+        return group(
+            process_entity_task.si(url, source, run_id=run_id)
+            | save_transformed_task.s(source, run_id=run_id)
+            for url in entity_urls
+        )
+
+    if batch:
+        return load_entities_task.si(
+            entity_urls, source, run_id=run_id
+        ) | save_page_task.s(source, run_id=run_id)
+    if factory.has_bulk_updater():
+        return chord(
+            (load_entity_task.si(url, source, run_id=run_id) for url in entity_urls),
+            save_page_task.s(source, run_id=run_id),
+        )
+    return group(
+        load_entity_task.si(url, source, run_id=run_id)
+        | save_entity_task.s(source, run_id=run_id)
+        for url in entity_urls
+    )
 
 
 @shared_task(
+    bind=True,
+    autoretry_for=(LoaderException,),
+    retry_backoff=True,  # exponential
+    retry_kwargs={"max_retries": 5},
     ignore_result=False,
 )
 def load_entity_task(
+    self,
     entity_url: str,
     source: str,
-) -> dict[str, Any]:
+    run_id: int | None = None,
+) -> dict[str, Any] | None:
     """
     Download data for a single entity and return the raw JSON payload.
 
     This task loads data for a specific entity from the given URL using the
-    appropriate entity loader for the specified source.
+    appropriate entity loader for the specified source. It is retried like
+    load_page_task.
+
+    The validators of the response are returned with the data, and are stored
+    by the saving task once the entity is saved. After the last retry, a failed
+    result is returned, which the saving task records in the run.
 
     Args:
+        self: The task instance (provided by Celery when bind=True)
         entity_url: The URL to load the entity data from
         source: The identifier of the data source
+        run_id: The primary key of the SyncRun tracking the synchronization, or None
 
     Returns:
-        The raw JSON data for the entity as a dictionary
+        The result with the raw JSON data for the entity, None if the entity was
+        not modified since the last synchronization
     """
-    factory = DataSourceFactory(source)
-    entity_data = factory.get_entity_loader(url=entity_url).load()
-    return entity_data
+    try:
+        with track_stage(run_id, LOAD_ENTITY) as stats:
+            factory = DataSourceFactory(source)
+            entity_loader = factory.get_entity_loader(url=entity_url)
+            with retry_when_rate_limited(self):
+                entity_data = entity_loader.load()
+            stats.items = 1
+            stats.bytes_downloaded = entity_loader.bytes_downloaded
+    except Exception as e:
+        if will_retry(self, e):
+            raise
+        return make_failed_result(entity_url, LOAD_ENTITY, e)
+    return make_result(entity_url, entity_data, entity_loader)
 
 
-@shared_task
-def save_entity_task(entity_data: dict[str, Any], source: str) -> None:
+@shared_task(
+    bind=True,
+    autoretry_for=(LoaderException,),
+    retry_backoff=True,  # exponential
+    retry_kwargs={"max_retries": 5},
+    ignore_result=False,
+)
+def load_entities_task(
+    self,
+    entity_urls: list[str],
+    source: str,
+    run_id: int | None = None,
+    loaded: dict[str, EntityResult] | None = None,
+) -> list[EntityResult]:
+    """
+    Download data for a page of entities and return the raw JSON payloads.
+
+    This task is used instead of load_entity_task when the entity loader of the
+    source is a batch loader. All entities of the page are fetched concurrently
+    within this single task. The task is retried only for the failed entities,
+    which get failed results after the last retry, see retry_failed_entities.
+
+    Args:
+        self: The task instance (provided by Celery when bind=True)
+        entity_urls: The URLs to load the entity data from
+        source: The identifier of the data source
+        run_id: The primary key of the SyncRun tracking the synchronization, or None
+        loaded: The results of the entities loaded by the previous attempts by URL
+
+    Returns:
+        The results with the raw JSON data of the entities
+    """
+    loaded = dict(loaded or {})
+    pending = [url for url in entity_urls if url not in loaded]
+    with track_stage(run_id, LOAD_ENTITY) as stats:
+        factory = DataSourceFactory(source)
+        entity_loader = factory.get_batch_entity_loader(urls=pending)
+        entities_data = entity_loader.load()
+        for url, entity_data in zip(pending, entities_data):
+            if url not in entity_loader.errors:
+                loaded[url] = make_result(url, entity_data, entity_loader)
+        retry_failed_entities(self, entity_loader.errors, LOAD_ENTITY, loaded)
+        stats.items = len(entity_urls)
+        stats.bytes_downloaded = entity_loader.bytes_downloaded
+    return [loaded[url] for url in entity_urls]
+
+
+@shared_task(
+    autoretry_for=(OperationalError,),  # e.g. deadlock detected
+    retry_backoff=True,
+    retry_kwargs={"max_retries": 5},
+)
+def save_entity_task(
+    result: EntityResult, source: str, run_id: int | None = None
+) -> None:
     """
     Transform and save entity data to the database.
 
@@ -97,11 +461,346 @@ def save_entity_task(entity_data: dict[str, Any], source: str) -> None:
     specified source to convert it to the application's data model, and then uses
     the appropriate updater to create or update the entity in the database.
 
+    The task is retried with exponential backoff on database errors, e.g. when
+    its transaction is chosen as the victim of a deadlock with another worker
+    saving the same types and abilities.
+
+    Args:
+        result: The result of load_entity_task
+        source: The identifier of the data source
+        run_id: The primary key of the SyncRun tracking the synchronization, or None
+    """
+    if "error" in result:
+        record_failed_results([result], run_id)
+        return
+
+    with track_stage(run_id, SAVE_ENTITY) as stats:
+        stats.items = stats.processed = 1
+        if result["data"] is None:  # not modified since the last synchronization
+            return
+
+        factory = DataSourceFactory(source)
+        save_transformed(factory, [transform(factory, result)])
+
+
+@shared_task(
+    autoretry_for=(OperationalError,),  # e.g. deadlock detected
+    retry_backoff=True,
+    retry_kwargs={"max_retries": 5},
+)
+def save_page_task(
+    results: list[EntityResult], source: str, run_id: int | None = None
+) -> None:
+    """
+    Transform and save data of a page of entities to the database.
+
+    If the updater of the source is a bulk updater, all entities are saved in a
+    single transaction. Otherwise, they are saved one by one. Failed entities are
+    recorded in the run once the others are saved. The task is retried like
+    save_entity_task.
+
+    Args:
+        results: The results of load_entity_task or load_entities_task
+        source: The identifier of the data source
+        run_id: The primary key of the SyncRun tracking the synchronization, or None
+    """
+    succeeded = [result for result in results if "error" not in result]
+    if succeeded:
+        with track_stage(run_id, SAVE_ENTITY) as stats:
+            stats.items = stats.processed = len(succeeded)
+            factory = DataSourceFactory(source)
+
+            transformed = [
+                transform(factory, result)
+                for result in succeeded
+                if result["data"] is not None  # not modified since last sync
+            ]
+            save_transformed(factory, transformed)
+    record_failed_results(results, run_id)
+
+
+@shared_task(
+    bind=True,
+    autoretry_for=(LoaderException, OperationalError),
+    retry_backoff=True,  # exponential
+    retry_kwargs={"max_retries": 5},
+    ignore_result=False,
+)
+def process_entity_task(
+    self,
+    entity_url: str,
+    source: str,
+    save: bool = False,
+    run_id: int | None = None,
+) -> EntityResult | None:
+    """
+    Download and transform data of a single entity, and optionally save it.
+
+    This task fuses load_entity_task with the transformation, so the raw JSON
+    payload never leaves the worker. It is retried like load_entity_task, and
+    returns a failed result like it unless the entity is saved in this task.
+
+    Args:
+        self: The task instance (provided by Celery when bind=True)
+        entity_url: The URL to load the entity data from
+        source: The identifier of the data source
+        save: Whether to save the entity in this task
+        run_id: The primary key of the SyncRun tracking the synchronization, or None
+
+    Returns:
+        The result with the transformed data of the entity, None if it was saved
+    """
+    try:
+        with track_stage(run_id, PROCESS_ENTITY) as stats:
+            factory = DataSourceFactory(source)
+            entity_loader = factory.get_entity_loader(url=entity_url)
+            with retry_when_rate_limited(self):
+                entity_data = entity_loader.load()
+            stats.items = 1
+            stats.processed = int(save)
+            stats.bytes_downloaded = entity_loader.bytes_downloaded
+
+            result = make_result(entity_url, entity_data, entity_loader)
+            if entity_data is not None:  # not modified since the last synchronization
+                result = transform(factory, result)
+            if save:
+                save_transformed(factory, [result])
+    except Exception as e:
+        # Without a saving task, the failure is recorded by record_task_failure
+        if save or will_retry(self, e):
+            raise
+        return make_failed_result(entity_url, PROCESS_ENTITY, e)
+    return None if save else result
+
+
+@shared_task(
+    bind=True,
+    autoretry_for=(LoaderException, OperationalError),
+    retry_backoff=True,  # exponential
+    retry_kwargs={"max_retries": 5},
+    ignore_result=False,
+)
+def process_entities_task(
+    self,
+    entity_urls: list[str],
+    source: str,
+    save: bool = False,
+    run_id: int | None = None,
+    loaded: dict[str, EntityResult] | None = None,
+) -> list[EntityResult] | None:
+    """
+    Download and transform data of a page of entities, and optionally save them.
+
+    This task fuses load_entities_task with the transformation for batch entity
+    loaders. It is retried like load_entities_task. An entity failing to
+    transform gets a failed result without retry, like in process_entity_task.
+    When saving, the failed entities are recorded in the run once the others are
+    saved.
+
+    Args:
+        self: The task instance (provided by Celery when bind=True)
+        entity_urls: The URLs to load the entity data from
+        source: The identifier of the data source
+        save: Whether to save the entities in this task
+        run_id: The primary key of the SyncRun tracking the synchronization, or None
+        loaded: The results of the entities processed by the previous attempts by URL
+
+    Returns:
+        The results with the transformed data of the entities, or None if they
+        were saved
+    """
+    loaded = dict(loaded or {})
+    pending = [url for url in entity_urls if url not in loaded]
+    with track_stage(run_id, PROCESS_ENTITY) as stats:
+        factory = DataSourceFactory(source)
+        entity_loader = factory.get_batch_entity_loader(urls=pending)
+        entities_data = entity_loader.load()
+        for url, entity_data in zip(pending, entities_data):
+            if url in entity_loader.errors:
+                continue
+            # Not modified entities are kept without data, so the saving task
+            # counts them
+            result = make_result(url, entity_data, entity_loader)
+            if entity_data is not None:
+                try:
+                    result = transform(factory, result)
+                except Exception as e:
+                    result = make_failed_result(url, PROCESS_ENTITY, e)
+            loaded[url] = result
+        retry_failed_entities(self, entity_loader.errors, PROCESS_ENTITY, loaded)
+        stats.items = len(entity_urls)
+        stats.bytes_downloaded = entity_loader.bytes_downloaded
+
+        results = [loaded[url] for url in entity_urls]
+        if not save:
+            return results
+
+        succeeded = [result for result in results if "error" not in result]
+        stats.processed = len(succeeded)
+        save_transformed(factory, succeeded)
+    record_failed_results(results, run_id)
+    return None
+
+
+@shared_task(
+    autoretry_for=(OperationalError,),  # e.g. deadlock detected
+    retry_backoff=True,
+    retry_kwargs={"max_retries": 5},
+)
+def save_transformed_task(
+    results: EntityResult | list[EntityResult],
+    source: str,
+    run_id: int | None = None,
+) -> None:
+    """
+    Save transformed data of one or more entities to the database.
+
+    This task saves the results of process_entity_task and process_entities_task.
+    It is retried like save_entity_task.
+
     Args:
-        entity_data: The raw entity data as a dictionary
+        results: The result of an entity or a list of them
         source: The identifier of the data source
+        run_id: The primary key of the SyncRun tracking the synchronization, or None
+    """
+    if not isinstance(results, list):
+        results = [results]
+
+    succeeded = [result for result in results if "error" not in result]
+    if succeeded:
+        with track_stage(run_id, SAVE_ENTITY) as stats:
+            stats.items = stats.processed = len(succeeded)
+            factory = DataSourceFactory(source)
+            save_transformed(factory, succeeded)
+    record_failed_results(results, run_id)
+
+
+def transform(factory: DataSourceFactory, result: EntityResult) -> EntityResult:
+    data = factory.get_transformer(data=result["data"]).transform()
+    return {**result, "data": data}
+
+
+def save_transformed(factory: DataSourceFactory, results: list[EntityResult]) -> None:
+    """
+    Save transformed data of entities with the updater of the data source.
+
+    With a bulk updater, all entities are saved in a single transaction.
+    Otherwise, they are saved one by one. The validators of the responses are
+    stored in the same transaction as the entities, so an entity that failed to
+    save is loaded again by the next synchronization. Results without data, i.e.
+    not modified entities, are skipped.
+
+    Args:
+        factory: The factory of the data source
+        results: The results with the transformed data of the entities
+    """
+    results = [result for result in results if result["data"] is not None]
+    if not results:
+        return
+
+    if factory.has_bulk_updater():
+        updater = factory.get_updater(data=[result["data"] for result in results])
+        save_with_validators(updater, results)
+    else:
+        for result in results:
+            save_with_validators(factory.get_updater(data=result["data"]), [result])
+
+
+def save_with_validators(updater, results: list[EntityResult]) -> None:
+    with transaction.atomic():
+        updater.create_or_update()
+        save_validators(
+            {r["url"]: r["validators"] for r in results if r["validators"]},
+            model=updater.model,
+            object_ids={r["url"]: r["data"]["id"] for r in results},
+        )
+
+
+# The stages of the tracked tasks, see core.integrations.tracking
+TASK_STAGES = {
+    load_page_task.name: LOAD_PAGE,
+    load_entity_task.name: LOAD_ENTITY,
+    load_entities_task.name: LOAD_ENTITY,
+    process_entity_task.name: PROCESS_ENTITY,
+    process_entities_task.name: PROCESS_ENTITY,
+    save_entity_task.name: SAVE_ENTITY,
+    save_page_task.name: SAVE_ENTITY,
+    save_transformed_task.name: SAVE_ENTITY,
+}
+
+
+@task_failure.connect
+def record_task_failure(
+    sender=None, args: tuple = (), kwargs: dict | None = None, **extra
+) -> None:
+    """
+    Record a tracked task that failed after all its retries in its SyncRun.
+
+    The first argument of the tracked tasks is an entity or a list of entities
+    (URLs or data), so the failed entities are counted from it.
+    """
+    run_id = (kwargs or {}).get("run_id")
+    stage = TASK_STAGES.get(getattr(sender, "name", None))
+    if run_id is None or stage is None:
+        return
+
+    entities = args[0] if args else None
+    items = len(entities) if isinstance(entities, list) else 1
+    record_failure(run_id, stage, items)
+
+
+@task_prerun.connect
+def start_task_timer(task_id: str | None = None, **kwargs) -> None:
+    _task_started[task_id] = time.monotonic()
+
+
+@task_postrun.connect
+def observe_task_duration(
+    task_id: str | None = None, task=None, state: str | None = None, **kwargs
+) -> None:
     """
-    factory = DataSourceFactory(source)
+    Observe the duration of a finished task of this module by its final state.
+
+    Replaced tasks finish in the IGNORED state and retried tasks in the RETRY state.
+    """
+    started = _task_started.pop(task_id, None)
+    if started is None or not getattr(task, "name", "").startswith(f"{__name__}."):
+        return
+    TASK_DURATION.labels(task.name, (state or "unknown").lower()).observe(
+        time.monotonic() - started
+    )
+
+
+@worker_init.connect
+def resolve_data_sources(**kwargs) -> None:
+    """
+    Resolve the configured data sources before the worker starts consuming tasks.
+
+    A misconfigured data source raises ImproperlyConfigured and stops the worker,
+    and the prefork pool processes inherit the resolved classes.
+    """
+    registry = get_registry()
+    logger.info("Data sources resolved.", extra={"sources": list(registry)})
+
+
+@worker_process_shutdown.connect
+def close_http_sessions(**kwargs) -> None:
+    """
+    Log the connection pool statistics of the worker process and close its sessions.
+    """
+    logger.info("HTTP connection pools.", extra={"pools": get_pool_stats()})
+    close_sessions()
+
+
+@worker_init.connect
+def start_worker_metrics_server(**kwargs) -> None:
+    """
+    Expose the metrics of the worker on settings.METRICS_WORKER_PORT, if it is set.
+    """
+    if settings.METRICS_WORKER_PORT:
+        start_metrics_server(settings.METRICS_WORKER_PORT)
+
 
-    transformed = factory.get_transformer(data=entity_data).transform()
-    factory.get_updater(data=transformed).create_or_update()
+@worker_process_shutdown.connect
+def remove_process_metrics(**kwargs) -> None:
+    mark_process_dead(os.getpid())
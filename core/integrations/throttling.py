@@ -0,0 +1,309 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+
+import redis
+from django.conf import settings
+
+from core.integrations.loaders import RateLimited
+
+logger = logging.getLogger(__name__)
+
+# Takes a token from the bucket of a data source. The bucket is refilled with the
+# current rate of the source, which is adjusted by FEEDBACK_SCRIPT. Returns the
+# number of seconds to wait for the next token, 0 if a token was taken.
+ACQUIRE_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local state = redis.call('HMGET', KEYS[2], 'rate', 'paused_until')
+local rate = tonumber(state[1]) or tonumber(ARGV[1])
+local paused_until = tonumber(state[2]) or 0
+if paused_until > now then
+    return tostring(paused_until - now)
+end
+
+local burst = tonumber(ARGV[2])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(bucket[1]) or burst
+local updated_at = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + math.max(now - updated_at, 0) * rate)
+
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', tostring(now))
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return tostring(wait)
+"""
+
+# Adjusts the rate of a data source: additive increase after a healthy response,
+# multiplicative decrease after a congested one, at most once per cooldown.
+# A Retry-After pauses the bucket. Returns the new rate.
+FEEDBACK_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local initial_rate = tonumber(ARGV[1])
+local min_rate = tonumber(ARGV[2])
+local max_rate = tonumber(ARGV[3])
+local increase = tonumber(ARGV[4])
+local decrease = tonumber(ARGV[5])
+local cooldown = tonumber(ARGV[6])
+local congested = ARGV[7] == '1'
+local retry_after = tonumber(ARGV[8])
+
+local state = redis.call('HMGET', KEYS[1], 'rate', 'decreased_at')
+local rate = tonumber(state[1]) or initial_rate
+local decreased_at = tonumber(state[2]) or 0
+
+if congested then
+    if now - decreased_at >= cooldown then
+        rate = math.max(min_rate, rate * decrease)
+        redis.call('HSET', KEYS[1], 'decreased_at', tostring(now))
+    end
+    if retry_after > 0 then
+        redis.call('HSET', KEYS[1], 'paused_until', tostring(now + retry_after))
+    end
+else
+    rate = math.min(max_rate, rate + increase / rate)
+end
+redis.call('HSET', KEYS[1], 'rate', tostring(rate))
+redis.call('EXPIRE', KEYS[1], ARGV[9])
+return tostring(rate)
+"""
+
+_clients: dict[str, redis.Redis] = {}
+_clients_pid: int | None = None
+_lock = threading.Lock()
+
+
+def get_redis(url: str) -> redis.Redis:
+    """
+    Return the Redis client of the current process for the URL.
+
+    Args:
+        url: The Redis URL
+
+    Returns:
+        The shared redis.Redis instance
+    """
+    global _clients_pid
+
+    with _lock:
+        if _clients_pid != os.getpid():
+            _clients.clear()
+            _clients_pid = os.getpid()
+
+        if url not in _clients:
+            _clients[url] = redis.Redis.from_url(
+                url, socket_connect_timeout=1, socket_timeout=1
+            )
+        return _clients[url]
+
+
+class RateLimiter:
+    """
+    Token bucket rate limiter shared by all workers, with an AIMD controlled rate.
+
+    The bucket and the current rate of a data source are kept in Redis and updated
+    by Lua scripts, so all worker processes draw from the same budget. Every
+    response is reported by record(): a healthy response (a status code below 400
+    and a latency within target_latency) increases the rate by about `increase`
+    requests per second each second, while a 429/5xx response, a connection error
+    or a slow response multiplies it by `decrease`. A Retry-After header pauses
+    the bucket of the source for the given number of seconds.
+
+    When Redis is unavailable, requests are let through without limiting.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        rate: float = 10,
+        burst: int | None = None,
+        min_rate: float = 1,
+        max_rate: float = 100,
+        increase: float = 1,
+        decrease: float = 0.5,
+        target_latency: float = 2,
+        cooldown: float = 1,
+        max_wait: float = 10,
+        redis_url: str | None = None,
+    ):
+        """
+        Initialize the rate limiter of a data source.
+
+        Args:
+            source: The identifier of the data source
+            rate: The initial number of requests per second
+            burst: The capacity of the bucket, defaults to the initial rate
+            min_rate: The lowest rate the controller backs off to
+            max_rate: The highest rate the controller increases to
+            increase: The additive increase of the rate per second
+            decrease: The multiplicative decrease factor of the rate
+            target_latency: The highest response latency in seconds considered healthy
+            cooldown: The minimum number of seconds between two decreases
+            max_wait: The maximum number of seconds a request waits for a token
+                before RateLimited is raised and the task is retried later
+            redis_url: The Redis URL, defaults to settings.RATE_LIMIT_REDIS_URL
+        """
+        self.source = source
+        self.rate = rate
+        self.burst = burst or max(int(rate), 1)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.target_latency = target_latency
+        self.cooldown = cooldown
+        self.max_wait = max_wait
+
+        self.redis = get_redis(redis_url or settings.RATE_LIMIT_REDIS_URL)
+        self.acquire_script = self.redis.register_script(ACQUIRE_SCRIPT)
+        self.feedback_script = self.redis.register_script(FEEDBACK_SCRIPT)
+
+    @property
+    def bucket_key(self) -> str:
+        return f"ratelimit:{self.source}:bucket"
+
+    @property
+    def state_key(self) -> str:
+        return f"ratelimit:{self.source}:state"
+
+    @property
+    def ttl(self) -> int:
+        # Keep the learned rate between the pages of a synchronization
+        return 3600
+
+    def try_acquire(self) -> float:
+        """
+        Try to take a token from the bucket.
+
+        Returns:
+            0 if a token was taken, otherwise the number of seconds to wait for one
+        """
+        try:
+            wait = self.acquire_script(
+                keys=[self.bucket_key, self.state_key],
+                args=[self.rate, self.burst, self.ttl],
+            )
+        except redis.RedisError as e:
+            logger.warning(
+                "Rate limiter unavailable.", extra={"source": self.source, "error": e}
+            )
+            return 0.0
+        return float(wait)
+
+    def acquire(self) -> None:
+        """
+        Wait for a token of the bucket.
+
+        Raises:
+            RateLimited: If no token is available within max_wait seconds.
+        """
+        deadline = time.monotonic() + self.max_wait
+        while wait := self.try_acquire():
+            if time.monotonic() + wait > deadline:
+                raise RateLimited(
+                    f"Rate limit of {self.source} exceeded", retry_after=wait
+                )
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        """
+        Wait for a token of the bucket without blocking the event loop.
+
+        The blocking Redis calls are run in the default executor of the loop.
+
+        Raises:
+            RateLimited: If no token is available within max_wait seconds.
+        """
+        deadline = time.monotonic() + self.max_wait
+        while wait := await asyncio.to_thread(self.try_acquire):
+            if time.monotonic() + wait > deadline:
+                raise RateLimited(
+                    f"Rate limit of {self.source} exceeded", retry_after=wait
+                )
+            await asyncio.sleep(wait)
+
+    def is_congested(self, status_code: int | None, latency: float) -> bool:
+        """
+        Check whether a response signals that the upstream is overloaded.
+
+        Args:
+            status_code: The response status code, None for a connection error
+            latency: The response latency in seconds
+
+        Returns:
+            True if the rate should be decreased
+        """
+        if status_code is None or status_code == 429 or status_code >= 500:
+            return True
+        return latency > self.target_latency
+
+    def record(
+        self,
+        status_code: int | None,
+        latency: float,
+        retry_after: float | None = None,
+    ) -> float | None:
+        """
+        Adjust the rate of the data source after a response.
+
+        Args:
+            status_code: The response status code, None for a connection error
+            latency: The response latency in seconds
+            retry_after: The Retry-After delay of the response in seconds
+
+        Returns:
+            The new rate, or None if Redis is unavailable
+        """
+        congested = self.is_congested(status_code, latency)
+        try:
+            rate = self.feedback_script(
+                keys=[self.state_key],
+                args=[
+                    self.rate,
+                    self.min_rate,
+                    self.max_rate,
+                    self.increase,
+                    self.decrease,
+                    self.cooldown,
+                    int(congested),
+                    retry_after or 0,
+                    self.ttl,
+                ],
+            )
+        except redis.RedisError as e:
+            logger.warning(
+                "Rate limiter unavailable.", extra={"source": self.source, "error": e}
+            )
+            return None
+
+        if congested:
+            logger.info(
+                "Upstream congested.",
+                extra={
+                    "source": self.source,
+                    "status_code": status_code,
+                    "latency": latency,
+                    "rate": float(rate),
+                },
+            )
+        return float(rate)
+
+    async def record_async(
+        self,
+        status_code: int | None,
+        latency: float,
+        retry_after: float | None = None,
+    ) -> float | None:
+        """
+        Adjust the rate of the data source after a response without blocking the
+        event loop, like record.
+        """
+        return await asyncio.to_thread(self.record, status_code, latency, retry_after)
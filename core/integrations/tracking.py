@@ -0,0 +1,184 @@
+import logging
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from django.db import connection
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from core.models import SyncRun, SyncStage
+
+logger = logging.getLogger(__name__)
+
+LOAD_PAGE = "load_page"
+LOAD_ENTITY = "load_entity"
+PROCESS_ENTITY = "process_entity"
+SAVE_ENTITY = "save_entity"
+STAGES = (LOAD_PAGE, LOAD_ENTITY, PROCESS_ENTITY, SAVE_ENTITY)
+
+
+@dataclass
+class StageStats:
+    """
+    Statistics of a single task of a stage, filled in by the task.
+
+    Attributes:
+        items: The number of entities handled by the task
+        processed: The number of entities the task finished, i.e. saved or skipped
+        bytes_downloaded: The size of the downloaded response bodies
+        queries: The number of database queries, counted by track_stage
+        seconds: The duration of the task, measured by track_stage
+    """
+
+    items: int = 0
+    processed: int = 0
+    bytes_downloaded: int = 0
+    queries: int = 0
+    seconds: float = 0.0
+
+    def count_query(self, execute, sql, params, many, context):
+        self.queries += 1
+        return execute(sql, params, many, context)
+
+
+def start_run(source: str) -> SyncRun:
+    """
+    Create a running synchronization run with empty statistics of all stages.
+
+    Args:
+        source: The identifier of the data source
+
+    Returns:
+        The new run
+    """
+    run = SyncRun.objects.create(source=source)
+    SyncStage.objects.bulk_create(SyncStage(run=run, name=name) for name in STAGES)
+    logger.info("Sync run started.", extra={"source": source, "run_id": run.pk})
+    return run
+
+
+def set_entity_count(run_id: int, entity_count: int | None) -> None:
+    """
+    Set the total number of entities of a run, read from its first page.
+
+    Args:
+        run_id: The primary key of the run
+        entity_count: The total number of entities, None if the source doesn't report it
+    """
+    if entity_count is None:
+        return
+    SyncRun.objects.filter(pk=run_id).update(
+        entity_count=entity_count, updated_at=timezone.now()
+    )
+    finish_run(run_id)
+
+
+@contextmanager
+def track_stage(run_id: int | None, stage: str) -> Iterator[StageStats]:
+    """
+    Measure a task of a stage and add its statistics to the run.
+
+    The duration and the database queries of the block are measured, the other
+    statistics are set by the block on the yielded StageStats. Nothing is recorded
+    if the block raises, e.g. when the task is retried; failures after the last
+    retry are recorded by record_failure. Without a run, nothing is measured.
+
+    Args:
+        run_id: The primary key of the run, or None
+        stage: The name of the stage
+
+    Yields:
+        The statistics of the task
+    """
+    stats = StageStats()
+    if run_id is None:
+        yield stats
+        return
+
+    started = time.monotonic()
+    with connection.execute_wrapper(stats.count_query):
+        yield stats
+    stats.seconds = time.monotonic() - started
+    record_stage(run_id, stage, stats)
+
+
+def record_stage(run_id: int, stage: str, stats: StageStats) -> None:
+    """
+    Add the statistics of a successful task to its stage and run.
+
+    The counters are incremented by single UPDATE statements, so concurrent
+    workers don't overwrite each other's statistics.
+
+    Args:
+        run_id: The primary key of the run
+        stage: The name of the stage
+        stats: The statistics of the task
+    """
+    bucket = SyncStage.get_bucket(stats.seconds)
+    SyncStage.objects.filter(run_id=run_id, name=stage).update(
+        tasks=F("tasks") + 1,
+        items=F("items") + stats.items,
+        bytes_downloaded=F("bytes_downloaded") + stats.bytes_downloaded,
+        queries=F("queries") + stats.queries,
+        seconds_total=F("seconds_total") + stats.seconds,
+        seconds_max=Greatest(F("seconds_max"), Value(stats.seconds)),
+        **{bucket: F(bucket) + 1},
+    )
+    if stats.processed:
+        SyncRun.objects.filter(pk=run_id).update(
+            processed=F("processed") + stats.processed, updated_at=timezone.now()
+        )
+        finish_run(run_id)
+
+
+def record_failure(run_id: int, stage: str, items: int) -> None:
+    """
+    Record entities failed after all retries of a task.
+
+    Failed entities count as processed, so the run still finishes. A failed page
+    fails the whole run, as its entities and the following pages are never loaded.
+
+    Args:
+        run_id: The primary key of the run
+        stage: The name of the stage
+        items: The number of entities handled by the task
+    """
+    SyncStage.objects.filter(run_id=run_id, name=stage).update(
+        failures=F("failures") + items
+    )
+    runs = SyncRun.objects.filter(pk=run_id)
+    now = timezone.now()
+    if stage == LOAD_PAGE:
+        runs.filter(status=SyncRun.Status.RUNNING).update(
+            status=SyncRun.Status.FAILED, finished_at=now, updated_at=now
+        )
+        logger.error("Sync run failed.", extra={"run_id": run_id})
+        return
+
+    runs.update(
+        failures=F("failures") + items,
+        processed=F("processed") + items,
+        updated_at=now,
+    )
+    finish_run(run_id)
+
+
+def finish_run(run_id: int) -> None:
+    """
+    Finish a running run if all its entities were processed.
+
+    Args:
+        run_id: The primary key of the run
+    """
+    now = timezone.now()
+    finished = SyncRun.objects.filter(
+        pk=run_id,
+        status=SyncRun.Status.RUNNING,
+        entity_count__isnull=False,
+        processed__gte=F("entity_count"),
+    ).update(status=SyncRun.Status.FINISHED, finished_at=now, updated_at=now)
+    if finished:
+        logger.info("Sync run finished.", extra={"run_id": run_id})
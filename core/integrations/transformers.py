@@ -10,8 +10,14 @@ class BaseTransformer(ABC):
     external sources into a format suitable for the application's data model.
     Concrete transformer implementations should inherit from this class and
     implement the transform method.
+
+    A transformer may declare the dotted paths of the raw data it reads in
+    projection. Entity loaders then load only these values, which keeps the
+    results of the load tasks small, see core.integrations.projection.
     """
 
+    projection: tuple[str, ...] | None = None
+
     def __init__(self, data: dict, **kwargs: dict):
         """
         Initialize the transformer with data and optional parameters.
@@ -1,7 +1,17 @@
+import hashlib
+import json
+import logging
+from operator import itemgetter
+
 from django.apps import apps
-from django.db import IntegrityError
+from django.core.exceptions import FieldDoesNotExist
+from django.db import transaction
 from django.db.models import Model
 
+from core.caching import bump_dataset_version
+
+logger = logging.getLogger(__name__)
+
 
 class DefaultUpdater:
     """
@@ -9,10 +19,15 @@ class DefaultUpdater:
 
     This class provides functionality to create or update Django model instances
     based on provided data, handling race conditions and many-to-many relationships.
+    The instance and its relations are saved in one transaction using upserts.
+
+    If the model has a field named by fingerprint_field, a hash of the data is stored
+    in it. Data with the same hash as the stored one is not written again.
     """
 
     many_to_many_fields = []
     fk_fields = []
+    fingerprint_field = "fingerprint"
 
     def __init__(self, model_name: str, data: dict, **kwargs: dict):
         """
@@ -28,6 +43,18 @@ class DefaultUpdater:
         self.model = apps.get_model(app_label, model_name)
         self.kwargs = kwargs
         self.instance = None
+        self.instances = []
+        self.changed_entities = []
+        self.changed = False
+
+    def get_entities(self) -> list[dict]:
+        """
+        Get the data of all entities saved by the updater.
+
+        Returns:
+            A list with the data of the single entity
+        """
+        return [self.data]
 
     def create_or_update(self) -> None:
         """
@@ -36,51 +63,161 @@ class DefaultUpdater:
         This method extracts the relevant fields from the data, excluding many-to-many fields,
         and creates or updates a model instance. If many-to-many fields are present,
         they are handled separately after the instance is created or updated.
+
+        Nothing is written if the stored fingerprint of the instance matches the data.
+        Otherwise the dataset version is bumped after the commit, which invalidates
+        the cached views.
+        """
+        entities = {entity["id"]: entity for entity in self.get_entities()}
+        fingerprints = self.get_fingerprints(entities)
+        unchanged_ids = self.get_unchanged_ids(fingerprints)
+        if unchanged_ids:
+            logger.debug(
+                "Entities not changed.",
+                extra={"model": self.model._meta.label, "ids": sorted(unchanged_ids)},
+            )
+
+        self.changed_entities = [
+            entity for id_, entity in entities.items() if id_ not in unchanged_ids
+        ]
+        if not self.changed_entities:
+            return
+
+        rows = []
+        for entity in self.changed_entities:
+            model_data = {
+                field: entity[field]
+                for field in entity
+                if field not in self.many_to_many_fields
+            }
+            if fingerprints:
+                model_data[self.fingerprint_field] = fingerprints[entity["id"]]
+            rows.append(model_data)
+
+        self.changed = True
+        with transaction.atomic():
+            self.instances = self.upsert(self.model, rows)
+            self.instance = self.instances[0]
+            if self.many_to_many_fields:
+                self.handle_many_to_many_fields()
+            transaction.on_commit(bump_dataset_version)
+
+    def get_fingerprints(self, entities: dict[int, dict]) -> dict[int, str]:
+        """
+        Calculate the fingerprints of the entities including many-to-many fields.
+
+        Args:
+            entities: The data of the entities by ID
+
+        Returns:
+            SHA-256 hex digests of the data by ID, or an empty dictionary if the model
+            has no fingerprint field
+        """
+        try:
+            self.model._meta.get_field(self.fingerprint_field)
+        except FieldDoesNotExist:
+            return {}
+
+        fingerprints = {}
+        for id_, entity in entities.items():
+            serialized = json.dumps(
+                entity, sort_keys=True, separators=(",", ":"), default=str
+            )
+            fingerprints[id_] = hashlib.sha256(serialized.encode()).hexdigest()
+        return fingerprints
+
+    def get_unchanged_ids(self, fingerprints: dict[int, str]) -> set[int]:
+        """
+        Find the stored instances saved from data with the same fingerprint.
+
+        Args:
+            fingerprints: The fingerprints of the data by ID
+
+        Returns:
+            The IDs of the instances with the same fingerprint
         """
-        model_data = {
-            field: self.data[field]
-            for field in self.data
-            if field not in self.many_to_many_fields
-        }
-        self.instance = self.create_or_update_without_race_condition(
-            self.model, model_data
+        if not fingerprints:
+            return set()
+
+        stored = self.model.objects.filter(id__in=fingerprints).values_list(
+            "id", self.fingerprint_field
         )
-        if self.many_to_many_fields:
-            self.handle_many_to_many_fields()
+        return {id_ for id_, fingerprint in stored if fingerprints[id_] == fingerprint}
 
     @staticmethod
-    def create_or_update_without_race_condition(model: type, data: dict) -> Model:
+    def upsert(
+        model: type, rows: list[dict], unique_fields: tuple[str, ...] = ("id",)
+    ) -> list[Model]:
         """
-        Create or update a model instance while preventing race conditions.
+        Create or update model instances with a single INSERT ... ON CONFLICT statement.
 
-        This method uses select_for_update to lock the row during update operations,
-        preventing race conditions when multiple processes try to create or update
-        the same instance simultaneously.
+        Rows conflicting on unique_fields update all their other fields, so concurrent
+        processes saving the same instance can not run into an IntegrityError. The
+        rows are inserted in the order of unique_fields, so concurrent transactions
+        upserting overlapping rows lock them in the same order and don't deadlock.
 
         Args:
             model: The Django model class
-            data: The data to use for creating or updating the model instance
+            rows: The data of the model instances, all with the same keys
+            unique_fields: The fields of the unique constraint identifying an instance
 
         Returns:
-            The created or updated model instance
-        """
-        if model.objects.filter(id=data["id"]).exists():
-            model.objects.select_for_update().filter(id=data["id"]).update(**data)
-            instance = model.objects.get(id=data["id"])
-        else:
-            try:  # preventing race condition for model creating
-                instance = model.objects.create(**data)
-            except IntegrityError as e:
-                model.objects.select_for_update().filter(id=data["id"]).update(**data)
-                instance = model.objects.get(id=data["id"])
-        return instance
+            The created or updated model instances
+        """
+        if not rows:
+            return []
+
+        rows = sorted(rows, key=itemgetter(*unique_fields))
+        update_fields = [field for field in rows[0] if field not in unique_fields]
+        auto_now_fields = [
+            field.name
+            for field in model._meta.concrete_fields
+            if getattr(field, "auto_now", False) and field.name not in update_fields
+        ]
+        return model.objects.bulk_create(
+            [model(**row) for row in rows],
+            update_conflicts=True,
+            unique_fields=unique_fields,
+            update_fields=update_fields + auto_now_fields,
+        )
 
     def handle_many_to_many_fields(self) -> None:
         """
-        Handle many-to-many relationships for the model instance.
+        Handle many-to-many relationships of the changed entities.
 
         This method is a placeholder that should be overridden by subclasses
         to implement specific logic for handling many-to-many relationships.
         The default implementation does nothing.
         """
         pass
+
+
+class BulkUpdater(DefaultUpdater):
+    """
+    Updater creating or updating a list of model instances at once.
+
+    All changed entities, and their many-to-many relationships, are written with
+    one upsert statement per table in a single transaction.
+    """
+
+    bulk = True
+
+    def __init__(self, model_name: str, data: list[dict], **kwargs: dict):
+        """
+        Initialize the updater with a model name, data, and optional parameters.
+
+        Args:
+            model_name: The name of the model in the format "app_label.model_name"
+            data: The data of the model instances to create or update
+            **kwargs: Additional parameters to use during the update process
+        """
+        super().__init__(model_name, data, **kwargs)
+
+    def get_entities(self) -> list[dict]:
+        """
+        Get the data of all entities saved by the updater.
+
+        Returns:
+            The list of entity data passed to the updater
+        """
+        return self.data
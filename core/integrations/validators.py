@@ -0,0 +1,97 @@
+from collections import defaultdict
+from collections.abc import Mapping
+
+from django.apps import apps
+from django.db.models import Model
+
+from core.models import ResponseValidator
+
+VALIDATOR_HEADERS = ("ETag", "Last-Modified")
+
+
+def get_validator_headers(headers: Mapping[str, str]) -> dict[str, str]:
+    """
+    Extract the validators from the headers of a response.
+
+    Args:
+        headers: The response headers
+
+    Returns:
+        The ETag and Last-Modified headers present in the response
+    """
+    return {name: headers[name] for name in VALIDATOR_HEADERS if headers.get(name)}
+
+
+def get_conditional_headers(urls: list[str]) -> dict[str, dict[str, str]]:
+    """
+    Get the conditional request headers of the URLs with stored validators.
+
+    Validators of objects deleted since they were saved are skipped, so the
+    upstream sends their data again instead of 304 Not Modified.
+
+    Args:
+        urls: The URLs to get the headers for
+
+    Returns:
+        A dictionary mapping URLs to their If-None-Match/If-Modified-Since headers
+    """
+    validators = list(ResponseValidator.objects.filter(url__in=urls))
+
+    object_ids = defaultdict(set)
+    for validator in validators:
+        if validator.model:
+            object_ids[validator.model].add(validator.object_id)
+    existing = {
+        (label, pk)
+        for label, ids in object_ids.items()
+        for pk in apps.get_model(label)
+        ._default_manager.filter(pk__in=ids)
+        .values_list("pk", flat=True)
+    }
+
+    return {
+        validator.url: validator.get_request_headers()
+        for validator in validators
+        if not validator.model or (validator.model, validator.object_id) in existing
+    }
+
+
+def save_validators(
+    response_headers: dict[str, Mapping[str, str]],
+    model: type[Model] | None = None,
+    object_ids: Mapping[str, int] | None = None,
+) -> None:
+    """
+    Store the ETag and Last-Modified validators of loaded URLs.
+
+    The validators must be stored only once the data of the responses is saved,
+    ideally in the same transaction, otherwise the next synchronization would skip
+    entities that were never saved. Responses without any validator are skipped.
+    All validators are written with a single upsert statement.
+
+    Args:
+        response_headers: A dictionary mapping URLs to their response headers
+        model: The model of the objects saved from the responses
+        object_ids: A dictionary mapping URLs to the primary keys of the objects
+    """
+    object_ids = object_ids or {}
+    validators = [
+        ResponseValidator(
+            url=url,
+            etag=headers.get("ETag", ""),
+            last_modified=headers.get("Last-Modified", ""),
+            model=model._meta.label if model is not None else "",
+            object_id=object_ids.get(url),
+        )
+        for url, headers in response_headers.items()
+        if headers.get("ETag") or headers.get("Last-Modified")
+    ]
+    if not validators:
+        return
+
+    ResponseValidator.objects.bulk_create(
+        validators,
+        update_conflicts=True,
+        unique_fields=["url"],
+        update_fields=["etag", "last_modified", "model", "object_id", "updated_at"],
+    )
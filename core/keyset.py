@@ -0,0 +1,191 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from operator import attrgetter
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Model, Q, QuerySet
+
+
+class InvalidCursor(Exception):
+    """
+    Raised when a cursor can't be decoded or belongs to another ordering.
+    """
+
+
+@dataclass(frozen=True)
+class Cursor:
+    """
+    Position in a keyset ordered list.
+
+    Attributes:
+        values: The values of the ordering fields of the row next to the position
+        reverse: Whether the position is the start of the previous page, i.e. the
+            rows before the values are requested
+    """
+
+    values: tuple
+    reverse: bool = False
+
+
+def get_ordering(queryset: QuerySet) -> list[str]:
+    """
+    Return the ordering of a queryset with the primary key as the last field.
+
+    The primary key breaks the ties of the other fields, so every row has a
+    unique position. Only the plain field names of the model are supported.
+
+    Args:
+        queryset: The ordered queryset
+
+    Raises:
+        ImproperlyConfigured: If the ordering contains expressions or relations.
+
+    Returns:
+        The field names, descending prefixed by "-"
+    """
+    query = queryset.query
+    ordering = list(query.order_by or (queryset.model._meta.ordering or []))
+    pk = queryset.model._meta.pk.name
+    fields = []
+    for field in ordering:
+        if not isinstance(field, str) or "__" in field or field == "?":
+            raise ImproperlyConfigured(
+                f"Keyset ordering supports only fields of the model, not {field!r}"
+            )
+        name = field.lstrip("-")
+        if name == "pk":
+            name = pk
+        fields.append(f"-{name}" if field.startswith("-") else name)
+        if name == pk:
+            return fields
+    fields.append(pk)
+    return fields
+
+
+def encode_cursor(ordering: list[str], cursor: Cursor) -> str:
+    """
+    Encode a cursor to an opaque URL-safe string bound to the ordering.
+    """
+    data = {"o": ordering, "v": cursor.values, "r": cursor.reverse}
+    payload = json.dumps(data, cls=DjangoJSONEncoder, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(ordering: list[str], encoded: str) -> Cursor:
+    """
+    Decode a cursor encoded by encode_cursor.
+
+    Args:
+        ordering: The current ordering, see get_ordering
+        encoded: The encoded cursor
+
+    Raises:
+        InvalidCursor: If the cursor is malformed or encoded for another ordering.
+
+    Returns:
+        The cursor
+    """
+    try:
+        payload = base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+        data = json.loads(payload)
+        values, reverse = data["v"], data["r"]
+    except (binascii.Error, ValueError, TypeError, KeyError) as e:
+        raise InvalidCursor("Invalid cursor") from e
+    if data.get("o") != ordering or not isinstance(values, list):
+        raise InvalidCursor("Invalid cursor")
+    if len(values) != len(ordering):
+        raise InvalidCursor("Invalid cursor")
+    return Cursor(values=tuple(values), reverse=bool(reverse))
+
+
+def get_values(ordering: list[str], obj: Model) -> tuple:
+    return tuple(attrgetter(field.lstrip("-"))(obj) for field in ordering)
+
+
+def seek(queryset: QuerySet, ordering: list[str], cursor: Cursor) -> QuerySet:
+    """
+    Filter and order a queryset to the rows after (or before) the cursor.
+
+    The rows after (a, b) in the ordering (x, y) are selected by
+    x >= a AND (x > a OR (x = a AND y > b)). The redundant first condition lets
+    the database scan an index of the first field from the cursor on, instead
+    of skipping the rows before it like OFFSET does. The rows before the cursor
+    are selected in the reversed ordering, the nearest first.
+
+    Args:
+        queryset: The queryset
+        ordering: The ordering, see get_ordering
+        cursor: The position to seek to
+
+    Returns:
+        The filtered queryset in the ordering of the requested direction
+    """
+    if cursor.reverse:
+        ordering = reverse_ordering(ordering)
+
+    after = Q()
+    for i in reversed(range(len(ordering))):
+        name, lookup = get_lookup(ordering[i])
+        condition = Q(**{f"{name}__{lookup}": cursor.values[i]})
+        if after:
+            condition |= Q(**{name: cursor.values[i]}) & after
+        after = condition
+
+    name, lookup = get_lookup(ordering[0])
+    return queryset.filter(
+        Q(**{f"{name}__{lookup}e": cursor.values[0]}), after
+    ).order_by(*ordering)
+
+
+def get_lookup(field: str) -> tuple[str, str]:
+    if field.startswith("-"):
+        return field[1:], "lt"
+    return field, "gt"
+
+
+def reverse_ordering(ordering: list[str]) -> list[str]:
+    return [field[1:] if field.startswith("-") else f"-{field}" for field in ordering]
+
+
+def get_page(
+    queryset: QuerySet, ordering: list[str], cursor: Cursor | None, size: int
+) -> tuple[list, Cursor | None, Cursor | None]:
+    """
+    Load a page of a keyset ordered queryset.
+
+    One row more than the page size is loaded to find out whether another page
+    follows in the direction of the cursor.
+
+    Args:
+        queryset: The queryset
+        ordering: The ordering, see get_ordering
+        cursor: The position of the page, None for the first page
+        size: The number of rows of the page
+
+    Returns:
+        The rows of the page and the cursors of the next and the previous page,
+        None if there is no such page
+    """
+    if cursor is None:
+        rows = list(queryset.order_by(*ordering)[: size + 1])
+        has_more = len(rows) > size
+        rows = rows[:size]
+        next_cursor = Cursor(get_values(ordering, rows[-1])) if has_more else None
+        return rows, next_cursor, None
+
+    rows = list(seek(queryset, ordering, cursor)[: size + 1])
+    has_more = len(rows) > size
+    rows = rows[:size]
+    if cursor.reverse:
+        rows.reverse()
+    if not rows:
+        return rows, None, None
+
+    first = Cursor(get_values(ordering, rows[0]), reverse=True)
+    last = Cursor(get_values(ordering, rows[-1]))
+    if cursor.reverse:
+        return rows, last, first if has_more else None
+    return rows, last if has_more else None, first
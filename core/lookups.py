@@ -0,0 +1,52 @@
+from django.db.models import CharField, TextField
+from django.db.models.lookups import IContains, IStartsWith, PatternLookup
+
+
+class TrigramPatternLookup(PatternLookup):
+    """
+    Case-insensitive pattern lookup which a pg_trgm GIN index of the column can serve.
+
+    The built-in case-insensitive lookups compile to UPPER(column) LIKE
+    UPPER(pattern) on PostgreSQL, which no index of the plain column can answer,
+    so every search scans the table. The subclasses compile to column ILIKE
+    pattern instead, which a GIN index with the gin_trgm_ops operator class
+    serves. Other databases, and patterns built from expressions, fall back to
+    the built-in lookup.
+
+    Attributes:
+        fallback: The built-in lookup with the same pattern
+    """
+
+    fallback: type[PatternLookup]
+
+    def as_sql(self, compiler, connection):
+        return self.fallback(self.lhs, self.rhs).as_sql(compiler, connection)
+
+    def as_postgresql(self, compiler, connection):
+        if not self.rhs_is_direct_value():
+            return self.as_sql(compiler, connection)
+        lhs_sql, lhs_params = self.process_lhs(compiler, connection)
+        rhs_sql, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs_sql} ILIKE {rhs_sql}", (*lhs_params, *rhs_params)
+
+
+@CharField.register_lookup
+@TextField.register_lookup
+class TrigramIContains(TrigramPatternLookup, IContains):
+    """
+    icontains served by a trigram index, for terms of three or more characters.
+    """
+
+    lookup_name = "trigram_icontains"
+    fallback = IContains
+
+
+@CharField.register_lookup
+@TextField.register_lookup
+class TrigramIStartsWith(TrigramPatternLookup, IStartsWith):
+    """
+    istartswith served by a trigram index, which also indexes the start of a value.
+    """
+
+    lookup_name = "trigram_istartswith"
+    fallback = IStartsWith
@@ -0,0 +1,119 @@
+import statistics
+from dataclasses import asdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmarks.report import (
+    build_report,
+    compare_reports,
+    format_comparison,
+    load_report,
+    save_report,
+)
+from core.benchmarks.stub import StubPokeAPI
+from core.benchmarks.sync import LOCAL, MODES, BenchmarkError, run_sync_benchmark
+from core.integrations.factories import PIPELINES
+
+
+def get_median(runs: list[dict]) -> dict:
+    keys = [
+        key
+        for key, value in runs[0].items()
+        if isinstance(value, (int, float)) and not isinstance(value, bool)
+    ]
+    return {
+        key: statistics.median(run[key] for run in runs)
+        for key in keys
+        if all(run[key] is not None for run in runs)
+    }
+
+
+class Command(BaseCommand):
+    help = "Benchmarks the synchronization of a data source from a stub PokéAPI server"
+
+    def add_arguments(self, parser):
+        parser.add_argument("source", choices=list(settings.DATA_SOURCES))
+        parser.add_argument(
+            "--count", type=int, default=200, help="Number of synthetic entities"
+        )
+        parser.add_argument("--mode", choices=MODES, default=LOCAL)
+        parser.add_argument(
+            "--pipeline", choices=PIPELINES, help="Pipeline of the local mode"
+        )
+        parser.add_argument(
+            "--recordings",
+            help="Directory of recorded responses (RESPONSE_CACHE_DIR) to replay "
+            "instead of synthetic data",
+        )
+        parser.add_argument(
+            "--latency", type=float, default=0.0, help="Response delay in seconds"
+        )
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=0)
+        parser.add_argument("--repeat", type=int, default=1)
+        parser.add_argument(
+            "--timeout", type=float, default=600, help="Timeout of a run in seconds"
+        )
+        parser.add_argument(
+            "--no-flush",
+            dest="flush",
+            action="store_false",
+            help="Keep the saved entities, benchmarking updates instead of inserts",
+        )
+        parser.add_argument("--output", help="Path of the JSON report")
+        parser.add_argument("--compare", help="Path of a JSON report to compare with")
+
+    def handle(self, *args, **options):
+        source = options["source"]
+        runs = []
+        with StubPokeAPI(
+            count=options["count"],
+            recordings=options["recordings"],
+            latency=options["latency"],
+            host=options["host"],
+            port=options["port"],
+        ) as stub:
+            self.stdout.write(f"Stub PokéAPI listening on {stub.url}")
+            for _ in range(options["repeat"]):
+                try:
+                    result = run_sync_benchmark(
+                        source,
+                        stub.url,
+                        mode=options["mode"],
+                        pipeline=options["pipeline"],
+                        flush=options["flush"],
+                        timeout=options["timeout"],
+                    )
+                except BenchmarkError as e:
+                    raise CommandError(str(e)) from e
+                runs.append(asdict(result))
+                self.stdout.write(
+                    f"{result.entities} entities in {result.seconds:.2f} s: "
+                    f"{result.entities_per_second or 0:.1f} entities/s, "
+                    f"{result.queries_per_entity or 0:.2f} queries/entity"
+                )
+
+        parameters = {
+            key: options[key]
+            for key in (
+                "source",
+                "count",
+                "mode",
+                "pipeline",
+                "recordings",
+                "latency",
+                "repeat",
+                "flush",
+            )
+        }
+        report = build_report(
+            "sync", parameters, {"median": get_median(runs), "runs": runs}
+        )
+        if options["output"]:
+            save_report(report, options["output"])
+            self.stdout.write(f"Report saved to {options['output']}")
+        if options["compare"]:
+            rows = compare_reports(report, load_report(options["compare"]))
+            self.stdout.write(format_comparison(rows))
+        self.stdout.write(self.style.SUCCESS("Benchmark finished"))
@@ -0,0 +1,165 @@
+import logging
+import os
+import time
+
+import redis
+from django.conf import settings
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    multiprocess,
+    start_http_server,
+)
+from prometheus_client.core import GaugeMetricFamily
+
+logger = logging.getLogger(__name__)
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Duration of HTTP requests by URL name.",
+    ["view", "method", "status"],
+)
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "Number of database queries per HTTP request by URL name.",
+    ["view"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, float("inf")),
+)
+REQUEST_DB_DURATION = Histogram(
+    "http_request_db_duration_seconds",
+    "Total duration of database queries per HTTP request by URL name.",
+    ["view"],
+)
+QUERY_BUDGET_VIOLATIONS = Counter(
+    "http_query_budget_violations_total",
+    "Number of requests exceeding the query budget of their view by URL name.",
+    ["view"],
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Number of cache lookups by cache and result (hit or miss).",
+    ["cache", "result"],
+)
+TASK_DURATION = Histogram(
+    "celery_task_duration_seconds",
+    "Duration of Celery tasks by task name and final state.",
+    ["task", "state"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, float("inf")),
+)
+
+
+class QueryStats:
+    """
+    Database execute wrapper counting and timing the queries, see
+    connection.execute_wrapper.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.seconds += time.perf_counter() - started
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    """
+    Count a cache lookup.
+
+    Args:
+        cache: The name of the cache, e.g. "response"
+        hit: Whether the lookup was a hit
+    """
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+class QueueDepthCollector:
+    """
+    Collector of the number of messages waiting in the Celery queues.
+
+    The Redis lists of the broker are read on every scrape, so the metric is up to
+    date regardless of which process serves it.
+    """
+
+    def __init__(self, broker_url: str, queues: list[str]):
+        self.broker_url = broker_url
+        self.queues = queues
+
+    def collect(self):
+        # Imported here, as the rate limiter imports the loaders using these metrics
+        from core.integrations.throttling import get_redis
+
+        gauge = GaugeMetricFamily(
+            "celery_queue_length",
+            "Number of messages waiting in a Celery queue.",
+            labels=["queue"],
+        )
+        client = get_redis(self.broker_url)
+        for queue in self.queues:
+            try:
+                gauge.add_metric([queue], client.llen(queue))
+            except redis.RedisError as e:
+                logger.warning(
+                    "Celery queue length unavailable.",
+                    extra={"queue": queue, "error": e},
+                )
+        yield gauge
+
+
+def is_multiprocess() -> bool:
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+def get_registry(queues: bool = False) -> CollectorRegistry:
+    """
+    Return a registry collecting the metrics of all processes of the server.
+
+    With PROMETHEUS_MULTIPROC_DIR set, the metrics are written to files by every
+    process (gunicorn workers or Celery pool processes) and aggregated from them,
+    otherwise the metrics of the current process are collected.
+
+    Args:
+        queues: Whether to include the length of the Celery queues
+
+    Returns:
+        The registry to expose
+    """
+    registry = CollectorRegistry()
+    if is_multiprocess():
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry.register(REGISTRY)
+    if queues:
+        registry.register(
+            QueueDepthCollector(settings.CELERY_BROKER_URL, settings.METRICS_QUEUES)
+        )
+    return registry
+
+
+def start_metrics_server(port: int) -> None:
+    """
+    Expose the metrics of the Celery worker and its pool processes over HTTP.
+
+    Args:
+        port: The port of the metrics server
+    """
+    start_http_server(port, registry=get_registry())
+    logger.info("Metrics server started.", extra={"port": port})
+
+
+def mark_process_dead(pid: int) -> None:
+    """
+    Remove the live metrics of an exited process in the multiprocess mode.
+
+    Args:
+        pid: The process ID
+    """
+    if is_multiprocess():
+        multiprocess.mark_process_dead(pid)
@@ -0,0 +1,108 @@
+import logging
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+
+from core.metrics import (
+    QUERY_BUDGET_VIOLATIONS,
+    REQUEST_DB_DURATION,
+    REQUEST_DB_QUERIES,
+    REQUEST_DURATION,
+    QueryStats,
+)
+from core.querybudget import (
+    OFF,
+    RAISE,
+    QueryBudgetExceeded,
+    QueryRecorder,
+    get_query_budget,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsMiddleware:
+    """
+    Middleware observing the duration and the database queries of every request.
+
+    The metrics are labelled by the URL name of the resolved view, e.g.
+    "pokemons:pokemon_list", so their cardinality doesn't grow with the URLs.
+    Requests not resolved to a view are labelled "<unresolved>".
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = QueryStats()
+        started = time.perf_counter()
+        with connection.execute_wrapper(stats):
+            response = self.get_response(request)
+        duration = time.perf_counter() - started
+
+        view = self.get_view_name(request)
+        REQUEST_DURATION.labels(view, request.method, response.status_code).observe(
+            duration
+        )
+        REQUEST_DB_QUERIES.labels(view).observe(stats.count)
+        REQUEST_DB_DURATION.labels(view).observe(stats.seconds)
+        return response
+
+    @staticmethod
+    def get_view_name(request) -> str:
+        resolver_match = getattr(request, "resolver_match", None)
+        if resolver_match is None or not resolver_match.view_name:
+            return "<unresolved>"
+        return resolver_match.view_name
+
+
+class QueryBudgetMiddleware:
+    """
+    Middleware enforcing the query budgets of the views.
+
+    The queries of every request are recorded and compared with the query_budget
+    attribute of its view and with settings.QUERY_BUDGET_MAX_REPEATS, the maximum
+    number of executions of the same SQL statement, which catches N+1 queries even
+    in views without a budget. A violation is logged with the most repeated
+    statements and counted in the http_query_budget_violations_total metric. With
+    settings.QUERY_BUDGET_MODE set to "raise", e.g. in tests, QueryBudgetExceeded
+    is raised instead of returning the response.
+    """
+
+    def __init__(self, get_response):
+        if settings.QUERY_BUDGET_MODE == OFF:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+
+        resolver_match = getattr(request, "resolver_match", None)
+        if resolver_match is None:
+            return response
+
+        report = recorder.get_report(
+            view=resolver_match.view_name,
+            budget=get_query_budget(resolver_match.func),
+            max_repeats=settings.QUERY_BUDGET_MAX_REPEATS,
+        )
+        if not report.exceeded:
+            return response
+
+        QUERY_BUDGET_VIOLATIONS.labels(report.view).inc()
+        logger.warning(
+            "Query budget exceeded.",
+            extra={
+                "view": report.view,
+                "queries": report.count,
+                "budget": report.budget,
+                "repeated": report.repeated[:5],
+            },
+        )
+        if settings.QUERY_BUDGET_MODE == RAISE:
+            raise QueryBudgetExceeded(report.format())
+        return response
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-18 21:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0002_syncrun_syncstage"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="responsevalidator",
+            name="model",
+            field=models.CharField(blank=True, default="", max_length=100),
+        ),
+        migrations.AddField(
+            model_name="responsevalidator",
+            name="object_id",
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+    ]
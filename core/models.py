@@ -0,0 +1,219 @@
+from datetime import timedelta
+
+from django.db import models
+
+
+class ResponseValidator(models.Model):
+    """
+    Model storing HTTP cache validators of a URL loaded during data synchronization.
+
+    The validators are sent back with the next request of the URL, so the upstream can
+    answer with 304 Not Modified instead of the whole payload. They are stored with
+    the saved object, and are not sent anymore once the object is deleted.
+
+    Attributes:
+        url: The loaded URL.
+        etag: The value of the ETag response header.
+        last_modified: The value of the Last-Modified response header.
+        model: The label of the model of the object saved from the response.
+        object_id: The primary key of the object saved from the response.
+        updated_at: When the validators were stored.
+    """
+
+    url = models.URLField(max_length=500, unique=True)
+    etag = models.CharField(max_length=255, blank=True, default="")
+    last_modified = models.CharField(max_length=64, blank=True, default="")
+    model = models.CharField(max_length=100, blank=True, default="")
+    object_id = models.BigIntegerField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        """
+        Returns a string representation of the validator.
+
+        Returns:
+            The URL of the validator.
+        """
+        return self.url
+
+    def get_request_headers(self) -> dict[str, str]:
+        """
+        Returns the conditional request headers for the URL.
+
+        Returns:
+            A dictionary with If-None-Match and/or If-Modified-Since headers.
+        """
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class SyncRun(models.Model):
+    """
+    Model tracking a single synchronization of a data source.
+
+    The run is finished when the number of processed entities (saved, not modified
+    or failed) reaches the entity count read from the first page. Statistics of the
+    individual stages of the pipeline are kept in SyncStage.
+
+    Attributes:
+        source: The identifier of the data source.
+        status: Whether the run is running, finished or failed.
+        entity_count: The total number of entities, None until the first page is loaded.
+        processed: The number of processed entities.
+        failures: The number of entities that failed after all retries.
+        started_at: When the run started.
+        updated_at: When the run made progress the last time.
+        finished_at: When the run finished or failed.
+    """
+
+    class Status(models.TextChoices):
+        RUNNING = "running", "Running"
+        FINISHED = "finished", "Finished"
+        FAILED = "failed", "Failed"
+
+    source = models.CharField(max_length=50, db_index=True)
+    status = models.CharField(
+        max_length=10, choices=Status.choices, default=Status.RUNNING
+    )
+    entity_count = models.PositiveIntegerField(null=True, blank=True)
+    processed = models.PositiveIntegerField(default=0)
+    failures = models.PositiveIntegerField(default=0)
+    started_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-started_at"]
+
+    def __str__(self):
+        """
+        Returns a string representation of the run.
+
+        Returns:
+            The data source and the start of the run.
+        """
+        return f"{self.source} {self.started_at:%Y-%m-%d %H:%M:%S}"
+
+    @property
+    def duration(self) -> timedelta:
+        """
+        Returns the duration of the run, until now if it is running.
+
+        Returns:
+            The duration of the run.
+        """
+        return (self.finished_at or self.updated_at) - self.started_at
+
+    @property
+    def entities_per_second(self) -> float | None:
+        """
+        Returns the throughput of the run.
+
+        Returns:
+            The number of processed entities per second, None before any progress.
+        """
+        seconds = self.duration.total_seconds()
+        if not seconds:
+            return None
+        return self.processed / seconds
+
+
+class SyncStage(models.Model):
+    """
+    Model with statistics of a stage of a synchronization run.
+
+    A stage groups the Celery tasks of one kind, e.g. all entity loads. The task
+    durations are counted in a fixed latency histogram, so the statistics are
+    updated by a single UPDATE statement per task without reading the row.
+
+    Attributes:
+        run: The synchronization run.
+        name: The name of the stage, e.g. "load_entity".
+        tasks: The number of successful tasks.
+        items: The number of entities handled by the successful tasks.
+        failures: The number of entities that failed after all retries.
+        bytes_downloaded: The size of the downloaded response bodies.
+        queries: The number of database queries of the successful tasks.
+        seconds_total: The total duration of the successful tasks.
+        seconds_max: The longest duration of a successful task.
+    """
+
+    # Upper bounds of the latency histogram buckets in seconds, None for infinity
+    BUCKETS = (
+        (0.1, "under_100ms"),
+        (0.5, "under_500ms"),
+        (1, "under_1s"),
+        (5, "under_5s"),
+        (None, "over_5s"),
+    )
+
+    run = models.ForeignKey(SyncRun, on_delete=models.CASCADE, related_name="stages")
+    name = models.CharField(max_length=50)
+    tasks = models.PositiveIntegerField(default=0)
+    items = models.PositiveIntegerField(default=0)
+    failures = models.PositiveIntegerField(default=0)
+    bytes_downloaded = models.PositiveBigIntegerField(default=0)
+    queries = models.PositiveIntegerField(default=0)
+    seconds_total = models.FloatField(default=0)
+    seconds_max = models.FloatField(default=0)
+    under_100ms = models.PositiveIntegerField(default=0)
+    under_500ms = models.PositiveIntegerField(default=0)
+    under_1s = models.PositiveIntegerField(default=0)
+    under_5s = models.PositiveIntegerField(default=0)
+    over_5s = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["id"]
+        constraints = [
+            models.UniqueConstraint(fields=["run", "name"], name="unique_run_stage")
+        ]
+
+    def __str__(self):
+        """
+        Returns a string representation of the stage.
+
+        Returns:
+            The name of the stage.
+        """
+        return self.name
+
+    @classmethod
+    def get_bucket(cls, seconds: float) -> str:
+        """
+        Returns the histogram bucket of a task duration.
+
+        Args:
+            seconds: The duration of the task
+
+        Returns:
+            The field name of the bucket.
+        """
+        for upper_bound, field in cls.BUCKETS:
+            if upper_bound is None or seconds < upper_bound:
+                return field
+
+    @property
+    def histogram(self) -> dict[str, int]:
+        """
+        Returns the latency histogram of the stage.
+
+        Returns:
+            A dictionary of task counts by bucket field name.
+        """
+        return {field: getattr(self, field) for _, field in self.BUCKETS}
+
+    @property
+    def seconds_mean(self) -> float | None:
+        """
+        Returns the mean duration of the successful tasks.
+
+        Returns:
+            The mean duration in seconds, None if there is no successful task.
+        """
+        if not self.tasks:
+            return None
+        return self.seconds_total / self.tasks
@@ -0,0 +1,143 @@
+from django.conf import settings
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+from core.keyset import (
+    InvalidCursor,
+    decode_cursor,
+    encode_cursor,
+    get_ordering,
+    get_page,
+)
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (cursor) pagination in the ordering of the filtered queryset.
+
+    Unlike LimitOffsetPagination, a page is selected by the values of the ordering
+    fields of its first row, not by the number of preceding rows, so a deep page
+    costs the same as the first one. The ordering is set by the "o" parameter of
+    the filterset, with the primary key breaking ties, see core.keyset. The
+    cursors in the next and previous links are opaque and valid only for the
+    ordering they were created in.
+
+    The total count takes another query scanning all matching rows, so clients
+    not showing it can leave it out with count=false, and the default is set by
+    settings.API_PAGINATION_COUNT.
+
+    Attributes:
+        page_size: The default number of results of a page
+        max_page_size: The maximum number of results requested by the limit parameter
+        include_count: Whether the count is included without the count parameter
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    max_page_size = settings.API_MAX_PAGE_SIZE
+    include_count = settings.API_PAGINATION_COUNT
+    cursor_query_param = "cursor"
+    page_size_query_param = "limit"
+    count_query_param = "count"
+    invalid_cursor_message = "Invalid cursor."
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.ordering = get_ordering(queryset)
+        self.page_size = self.get_page_size(request)
+
+        cursor = None
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded:
+            try:
+                cursor = decode_cursor(self.ordering, encoded)
+            except InvalidCursor:
+                raise NotFound(self.invalid_cursor_message)
+
+        self.count = queryset.count() if self.get_include_count(request) else None
+        rows, self.next_cursor, self.previous_cursor = get_page(
+            queryset, self.ordering, cursor, self.page_size
+        )
+        return rows
+
+    def get_page_size(self, request) -> int:
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def get_include_count(self, request) -> bool:
+        value = request.query_params.get(self.count_query_param)
+        if value is None:
+            return self.include_count
+        return value.lower() in ("1", "true", "yes")
+
+    def get_link(self, cursor) -> str | None:
+        if cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, encode_cursor(self.ordering, cursor)
+        )
+
+    def get_next_link(self) -> str | None:
+        return self.get_link(self.next_cursor)
+
+    def get_previous_link(self) -> str | None:
+        return self.get_link(self.previous_cursor)
+
+    def get_paginated_response(self, data):
+        response = {
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        }
+        if self.count is not None:
+            response = {"count": self.count, **response}
+        return Response(response)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "count": {
+                    "type": "integer",
+                    "example": 123,
+                    "description": "Left out with count=false",
+                },
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page.",
+                "schema": {"type": "integer"},
+            },
+            {
+                "name": self.count_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Whether to include the total number of results.",
+                "schema": {"type": "boolean"},
+            },
+        ]
@@ -0,0 +1,181 @@
+import logging
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connection
+from django.db.models import Model
+
+from core.caching import get_dataset_version
+from core.metrics import record_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+# The indexes of this process by model label, with the dataset version they were
+# built from and the monotonic time they were built at
+_indexes: dict[str, tuple[str, float, "PrefixIndex"]] = {}
+
+# The labels of the indexes being rebuilt in the background
+_rebuilding: set[str] = set()
+_rebuilding_lock = threading.Lock()
+
+
+class PrefixIndex:
+    """
+    Sorted array of lowercased names and IDs answering prefix lookups in memory.
+
+    The names are kept in a sorted list and the IDs in a parallel array of 64-bit
+    integers, so a lookup is two binary searches and a slice.
+
+    Attributes:
+        names: The lowercased names in ascending order
+        ids: The IDs of the names
+    """
+
+    def __init__(self, entries: Iterable[tuple[str, int]]):
+        """
+        Args:
+            entries: The (name, ID) pairs
+        """
+        entries = sorted((name.lower(), id_) for name, id_ in entries)
+        self.names = [name for name, _ in entries]
+        self.ids = array("q", (id_ for _, id_ in entries))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def startswith(self, prefix: str, limit: int | None = None) -> list[int]:
+        """
+        Return the IDs of the names starting with a prefix, case-insensitively.
+
+        Args:
+            prefix: The prefix
+            limit: The maximum number of IDs, all if None
+
+        Returns:
+            The IDs in the alphabetical order of the names
+        """
+        prefix = prefix.lower()
+        start = bisect_left(self.names, prefix)
+        stop = len(self.names)
+        if prefix:
+            # The first name after all names starting with the prefix
+            upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+            stop = bisect_left(self.names, upper, lo=start)
+        if limit is not None:
+            stop = min(stop, start + max(limit, 0))
+        return self.ids[start:stop].tolist()
+
+
+def build_prefix_index(model: type[Model], field: str = "name") -> PrefixIndex:
+    """
+    Build the prefix index of the names of all objects of a model.
+
+    Args:
+        model: The model
+        field: The indexed field
+
+    Returns:
+        The index
+    """
+    started = time.perf_counter()
+    rows = model._default_manager.order_by().values_list(field, "pk")
+    index = PrefixIndex(rows.iterator(chunk_size=2000))
+    logger.info(
+        "Prefix index built.",
+        extra={
+            "model": model._meta.label,
+            "entries": len(index),
+            "duration": round(time.perf_counter() - started, 3),
+        },
+    )
+    return index
+
+
+def get_prefix_index(model: type[Model], version: str | None = None) -> PrefixIndex:
+    """
+    Return the prefix index of the names of a model held by this process.
+
+    The index is built on the first lookup. When the dataset version changes, the
+    current index keeps being served while a thread rebuilds it, at most once per
+    settings.PREFIX_INDEX_REBUILD_INTERVAL seconds, as the version changes with
+    every saved page during a sync. A lookup costs a read of the version from the
+    cache and no query, except the first one.
+
+    Args:
+        model: The model, which has a name field
+        version: The current dataset version, read from the cache if None
+
+    Returns:
+        The index
+    """
+    if version is None:
+        version = get_dataset_version()
+    label = model._meta.label
+    built = _indexes.get(label)
+    record_cache_lookup("prefix_index", built is not None and built[0] == version)
+    if built is None:
+        built = _indexes[label] = (version, time.monotonic(), build_prefix_index(model))
+    elif built[0] != version:
+        if time.monotonic() - built[1] >= settings.PREFIX_INDEX_REBUILD_INTERVAL:
+            rebuild_in_background(model, version)
+    return built[2]
+
+
+def rebuild_in_background(model: type[Model], version: str) -> None:
+    """
+    Rebuild the prefix index of a model in a thread, unless it is being rebuilt.
+
+    Args:
+        model: The model
+        version: The dataset version the index is rebuilt from
+    """
+    label = model._meta.label
+    with _rebuilding_lock:
+        if label in _rebuilding:
+            return
+        _rebuilding.add(label)
+    threading.Thread(target=run_rebuild, args=(model, version), daemon=True).start()
+
+
+def run_rebuild(model: type[Model], version: str) -> None:
+    try:
+        rebuild(model, version)
+    finally:
+        # The thread has its own database connection
+        connection.close()
+
+
+def rebuild(model: type[Model], version: str) -> None:
+    label = model._meta.label
+    try:
+        _indexes[label] = (version, time.monotonic(), build_prefix_index(model))
+    except Exception:
+        logger.exception("Prefix index not rebuilt.", extra={"model": label})
+    finally:
+        with _rebuilding_lock:
+            _rebuilding.discard(label)
+
+
+def clear_prefix_indexes() -> None:
+    """
+    Drop the prefix indexes of this process, so they are built again on next use.
+    """
+    _indexes.clear()
+
+
+def warm_prefix_indexes() -> None:
+    """
+    Build the prefix indexes of settings.PREFIX_INDEX_MODELS, e.g. when a worker
+    starts. A failure is only logged, the indexes are then built on first use.
+    """
+    try:
+        version = get_dataset_version()
+        for label in settings.PREFIX_INDEX_MODELS:
+            get_prefix_index(apps.get_model(label), version)
+    except Exception:
+        logger.exception("Prefix indexes not built.")
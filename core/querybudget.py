@@ -0,0 +1,121 @@
+from collections import Counter
+from dataclasses import dataclass, field
+
+OFF = "off"
+LOG = "log"
+RAISE = "raise"
+MODES = (OFF, LOG, RAISE)
+
+# The session and user lookups of an authenticated request, added to the budgets of
+# the API views, as DRF authenticates every request
+AUTHENTICATION_QUERIES = 2
+
+
+class QueryBudgetExceeded(Exception):
+    """
+    Raised when a request exceeds the query budget of its view in the raise mode.
+    """
+
+
+class QueryRecorder:
+    """
+    Database execute wrapper recording the executed SQL, see connection.execute_wrapper.
+
+    Queries are grouped by their SQL with placeholders, so the same query executed
+    with different parameters, the typical N+1 pattern, is counted as repeated.
+    """
+
+    def __init__(self):
+        self.statements: Counter[str] = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        self.statements[sql] += 1
+        return execute(sql, params, many, context)
+
+    def get_report(
+        self, view: str, budget: int | None, max_repeats: int | None
+    ) -> "QueryReport":
+        return QueryReport(
+            view=view,
+            statements=self.statements,
+            budget=budget,
+            max_repeats=max_repeats,
+        )
+
+
+@dataclass
+class QueryReport:
+    """
+    Queries executed by a request compared with the query budget of its view.
+
+    Attributes:
+        view: The URL name of the view
+        statements: The number of executions of each SQL statement
+        budget: The maximum number of queries, None for no limit
+        max_repeats: The maximum number of executions of the same SQL statement,
+            None for no limit
+    """
+
+    view: str
+    statements: Counter[str] = field(default_factory=Counter)
+    budget: int | None = None
+    max_repeats: int | None = None
+
+    @property
+    def count(self) -> int:
+        return sum(self.statements.values())
+
+    @property
+    def repeated(self) -> list[tuple[str, int]]:
+        """
+        Return the statements executed more than once, the most repeated first.
+        """
+        return [(sql, n) for sql, n in self.statements.most_common() if n > 1]
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget is not None and self.count > self.budget
+
+    @property
+    def over_repeats(self) -> bool:
+        return self.max_repeats is not None and any(
+            n > self.max_repeats for _, n in self.repeated
+        )
+
+    @property
+    def exceeded(self) -> bool:
+        return self.over_budget or self.over_repeats
+
+    def format(self, worst: int = 5) -> str:
+        """
+        Describe the violation with the worst offending statements.
+
+        Args:
+            worst: The number of the most repeated statements to include
+
+        Returns:
+            A human readable description of the violation
+        """
+        lines = [
+            f"{self.view} executed {self.count} queries "
+            f"(budget {self.budget}, max repeats {self.max_repeats})"
+        ]
+        lines += [f"  {n}x {sql}" for sql, n in self.repeated[:worst]]
+        return "\n".join(lines)
+
+
+def get_query_budget(view_func) -> int | None:
+    """
+    Return the query budget declared by a view.
+
+    The budget is declared by the query_budget attribute of a class-based view
+    (including DRF views) or of a view function.
+
+    Args:
+        view_func: The resolved view function
+
+    Returns:
+        The maximum number of queries, None if the view declares no budget
+    """
+    view = getattr(view_func, "view_class", view_func)
+    return getattr(view, "query_budget", None)
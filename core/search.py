@@ -0,0 +1,69 @@
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import connections
+from django.db.models import Q, QuerySet
+
+from core.prefix_index import PrefixIndex
+
+# Shorter terms have no trigram of their own, so only their prefix matches are ranked
+MIN_SIMILARITY_LENGTH = 3
+
+
+def rank_matches(
+    queryset: QuerySet,
+    term: str,
+    limit: int,
+    field: str = "name",
+    index: PrefixIndex | None = None,
+) -> list:
+    """
+    Return the top matches of a typed term, ranked by prefix match, then similarity.
+
+    The names starting with the term come first in alphabetical order, followed by
+    the names containing the term or similar to it. On PostgreSQL, these are
+    ranked by the word similarity of pg_trgm, which is high when the term is close
+    to a part of the name, e.g. "chu" and "pikachu", and also matches names with
+    a typo. Other databases append the names containing the term in alphabetical
+    order.
+
+    Both steps select at most limit rows with operators served by the trigram
+    index of the field, so the cost depends on the number of matches rather than
+    the size of the table. With the prefix index of the field, the prefix matches
+    are looked up in memory and their rows loaded by the primary key.
+
+    Args:
+        queryset: The searched rows, e.g. projected by values()
+        term: The typed term
+        limit: The maximum number of matches
+        field: The searched field
+        index: The prefix index of the field, see core.prefix_index
+
+    Returns:
+        The matching rows of the queryset
+    """
+    term = term.strip()
+    if not term or limit <= 0:
+        return []
+
+    if index is not None:
+        prefix = {"pk__in": index.startswith(term, limit)}
+        matches = list(queryset.filter(**prefix).order_by(field, "pk"))
+    else:
+        prefix = {f"{field}__trigram_istartswith": term}
+        matches = list(queryset.filter(**prefix).order_by(field, "pk")[:limit])
+    rest = limit - len(matches)
+    if rest <= 0 or len(term) < MIN_SIMILARITY_LENGTH:
+        return matches
+
+    others = queryset.exclude(**prefix)
+    if connections[queryset.db].vendor == "postgresql":
+        others = (
+            others.filter(
+                Q(**{f"{field}__trigram_icontains": term})
+                | Q(**{f"{field}__trigram_word_similar": term})
+            )
+            .alias(similarity=TrigramWordSimilarity(term, field))
+            .order_by("-similarity", field, "pk")
+        )
+    else:
+        others = others.filter(**{f"{field}__icontains": term}).order_by(field, "pk")
+    return matches + list(others[:rest])
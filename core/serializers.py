@@ -0,0 +1,66 @@
+from rest_framework import serializers
+
+from core.models import SyncRun, SyncStage
+
+
+class SyncStageSerializer(serializers.ModelSerializer):
+    """
+    Serializer for the SyncStage model.
+
+    Attributes:
+        seconds_mean: The mean duration of the successful tasks.
+        histogram: The task counts by latency bucket.
+    """
+
+    seconds_mean = serializers.FloatField(read_only=True, allow_null=True)
+    histogram = serializers.DictField(child=serializers.IntegerField(), read_only=True)
+
+    class Meta:
+        model = SyncStage
+        fields = [
+            "name",
+            "tasks",
+            "items",
+            "failures",
+            "bytes_downloaded",
+            "queries",
+            "seconds_total",
+            "seconds_mean",
+            "seconds_max",
+            "histogram",
+        ]
+
+
+class SyncRunSerializer(serializers.ModelSerializer):
+    """
+    Serializer for the SyncRun model.
+
+    Attributes:
+        duration: The duration of the run in seconds.
+        entities_per_second: The throughput of the run.
+        stages: Nested SyncStageSerializer instances for the stages of the run.
+    """
+
+    duration = serializers.SerializerMethodField()
+    entities_per_second = serializers.FloatField(read_only=True, allow_null=True)
+    stages = SyncStageSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = SyncRun
+        fields = [
+            "id",
+            "source",
+            "status",
+            "entity_count",
+            "processed",
+            "failures",
+            "started_at",
+            "updated_at",
+            "finished_at",
+            "duration",
+            "entities_per_second",
+            "stages",
+        ]
+
+    def get_duration(self, obj: SyncRun) -> float:
+        return obj.duration.total_seconds()
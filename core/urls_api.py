@@ -0,0 +1,14 @@
+from django.urls import path
+
+from core import views_api
+
+app_name = "core_api"
+
+urlpatterns = [
+    path("sync-runs/", views_api.SyncRunListAPIView.as_view(), name="sync-run-list"),
+    path(
+        "sync-runs/<int:pk>/",
+        views_api.SyncRunDetailAPIView.as_view(),
+        name="sync-run-detail",
+    ),
+]
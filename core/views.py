@@ -0,0 +1,16 @@
+from django.http import HttpResponse
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from core.metrics import get_registry
+
+
+def metrics_view(request):
+    """
+    Expose the Prometheus metrics of all web processes and the Celery queue lengths.
+
+    The endpoint is meant for the Prometheus server on the internal network and is
+    not proxied by nginx.
+    """
+    return HttpResponse(
+        generate_latest(get_registry(queues=True)), content_type=CONTENT_TYPE_LATEST
+    )
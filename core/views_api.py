@@ -0,0 +1,44 @@
+from rest_framework.generics import ListAPIView, RetrieveAPIView
+from rest_framework.permissions import IsAdminUser
+
+from core.models import SyncRun
+from core.querybudget import AUTHENTICATION_QUERIES
+from core.serializers import SyncRunSerializer
+
+
+class SyncRunListAPIView(ListAPIView):
+    """
+    API view that returns a list of synchronization runs, the latest first.
+
+    The runs are only available to staff users.
+
+    Attributes:
+        queryset: All SyncRun objects with prefetched stages.
+        serializer_class: The serializer class used to convert SyncRun objects to JSON.
+        permission_classes: Only staff users are allowed.
+        query_budget: The maximum number of queries of a request.
+        filterset_fields: The fields the runs can be filtered by.
+    """
+
+    queryset = SyncRun.objects.prefetch_related("stages")
+    serializer_class = SyncRunSerializer
+    permission_classes = [IsAdminUser]
+    query_budget = 3 + AUTHENTICATION_QUERIES
+    filterset_fields = ["source", "status"]
+
+
+class SyncRunDetailAPIView(RetrieveAPIView):
+    """
+    API view that returns the progress and the stage statistics of a synchronization run.
+
+    Attributes:
+        queryset: All SyncRun objects with prefetched stages.
+        serializer_class: The serializer class used to convert SyncRun objects to JSON.
+        permission_classes: Only staff users are allowed.
+        query_budget: The maximum number of queries of a request.
+    """
+
+    queryset = SyncRun.objects.prefetch_related("stages")
+    serializer_class = SyncRunSerializer
+    permission_classes = [IsAdminUser]
+    query_budget = 2 + AUTHENTICATION_QUERIES
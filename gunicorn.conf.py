@@ -0,0 +1,26 @@
+# Gunicorn configuration, see https://docs.gunicorn.org/en/stable/settings.html
+import os
+import shutil
+
+bind = "0.0.0.0:8000"
+
+
+def on_starting(server):
+    # Metrics of the previous run of the server must not be aggregated
+    multiproc_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if multiproc_dir:
+        shutil.rmtree(multiproc_dir, ignore_errors=True)
+        os.makedirs(multiproc_dir)
+
+
+def post_worker_init(worker):
+    # The prefix indexes are built before the worker accepts requests
+    from core.prefix_index import warm_prefix_indexes
+
+    warm_prefix_indexes()
+
+
+def child_exit(server, worker):
+    from core.metrics import mark_process_dead
+
+    mark_process_dead(worker.pid)
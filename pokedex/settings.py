@@ -36,15 +36,18 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "django_celery_beat",
     "rest_framework",
     "drf_spectacular",
     "drf_spectacular_sidecar",
     "pokedex",
+    "core",
     "pokemons",
 ]
 
 MIDDLEWARE = [
+    "core.middleware.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -52,6 +55,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "core.middleware.QueryBudgetMiddleware",
 ]
 
 ROOT_URLCONF = "pokedex.urls"
@@ -151,6 +155,13 @@ CELERY_TASK_IGNORE_RESULT = True
 CELERY_TASK_ACKS_LATE = True
 CELERY_TASK_ALWAYS_EAGER = False
 
+# METRICS
+
+# The Celery queues whose lengths are exposed at /metrics
+METRICS_QUEUES = os.environ.get("METRICS_QUEUES", "celery").split(",")
+# The port of the metrics server of Celery workers, disabled if empty
+METRICS_WORKER_PORT = int(os.environ.get("METRICS_WORKER_PORT") or 0) or None
+
 # DRF
 
 
@@ -161,12 +172,17 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.AllowAny",
     ],
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
+    "DEFAULT_PAGINATION_CLASS": "core.pagination.KeysetPagination",
     "PAGE_SIZE": 100,
     "DEFAULT_FILTER_BACKENDS": ["django_filters.rest_framework.DjangoFilterBackend"],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
 
+# Maximum page size requested by API clients, and whether API pages include the
+# total count when clients pass neither count=true nor count=false
+API_MAX_PAGE_SIZE = int(os.environ.get("API_MAX_PAGE_SIZE", 1000))
+API_PAGINATION_COUNT = os.environ.get("API_PAGINATION_COUNT", "True") == "True"
+
 # DRF Spectacular
 
 SPECTACULAR_SETTINGS = {
@@ -182,42 +198,124 @@ SPECTACULAR_SETTINGS = {
 
 PAGE_SIZE = int(os.environ.get("PAGE_SIZE", 10))
 
+# Keyset pagination of the list views, showing the total count cached for the
+# timeout in seconds, or no count with 0
+HTML_KEYSET_PAGINATION = os.environ.get("HTML_KEYSET_PAGINATION", "False") == "True"
+HTML_KEYSET_COUNT_TIMEOUT = int(os.environ.get("HTML_KEYSET_COUNT_TIMEOUT", 300))
+
 # Comparison
 
 COMPARISON_MAX_POKEMON_NUMBER = int(os.environ.get("COMPARISON_MAX_POKEMON_NUMBER", 6))
 
+# Matches of the name typeahead and the seconds they are cached per typed term
+TYPEAHEAD_LIMIT = int(os.environ.get("TYPEAHEAD_LIMIT", 8))
+TYPEAHEAD_CACHE_TIMEOUT = int(os.environ.get("TYPEAHEAD_CACHE_TIMEOUT", 60))
+
+# Models whose names are indexed in memory by each worker, see core.prefix_index,
+# and the minimum seconds between the rebuilds of an index after the data changed
+PREFIX_INDEX_MODELS = ["pokemons.Pokemon"]
+PREFIX_INDEX_REBUILD_INTERVAL = int(os.environ.get("PREFIX_INDEX_REBUILD_INTERVAL", 60))
+
 # DATA SOURCES
 
+# The root of PokéAPI, e.g. the stub server of the sync benchmark
+POKEAPI_URL = os.environ.get("POKEAPI_URL", "https://pokeapi.co/api/v2")
+
+# Connections kept open per upstream host by the HTTP session of each worker process
+HTTP_POOL_MAXSIZE = int(os.environ.get("HTTP_POOL_MAXSIZE", 10))
+HTTP_TIMEOUT = float(os.environ.get("HTTP_TIMEOUT", 30))
+
+# Requests per second to upstream APIs shared by all workers, adjusted between
+# the minimum and the maximum by the rate limiter of each data source
+RATE_LIMIT_REDIS_URL = f"redis://{REDIS_HOST}:{REDIS_PORT}/3"
+RATE_LIMIT = float(os.environ.get("RATE_LIMIT", 10))
+RATE_LIMIT_MIN = float(os.environ.get("RATE_LIMIT_MIN", 1))
+RATE_LIMIT_MAX = float(os.environ.get("RATE_LIMIT_MAX", 50))
+RATE_LIMITER = {
+    "class": "core.integrations.throttling.RateLimiter",
+    "kwargs": {
+        "rate": RATE_LIMIT,
+        "min_rate": RATE_LIMIT_MIN,
+        "max_rate": RATE_LIMIT_MAX,
+    },
+}
+
+# Raw responses of upstream APIs are recorded to or replayed from disk if the mode
+# is "record" or "replay"
+RESPONSE_CACHE_MODE = os.environ.get("RESPONSE_CACHE_MODE")
+RESPONSE_CACHE = None
+if RESPONSE_CACHE_MODE:
+    RESPONSE_CACHE = {
+        "class": "core.integrations.cache.ResponseCache",
+        "kwargs": {
+            "directory": os.environ.get(
+                "RESPONSE_CACHE_DIR", BASE_DIR / ".cache" / "responses"
+            ),
+            "mode": RESPONSE_CACHE_MODE,
+            "ttl": int(os.environ.get("RESPONSE_CACHE_TTL", 7 * 24 * 60 * 60)),
+            "max_size": int(os.environ.get("RESPONSE_CACHE_MAX_SIZE", 2 * 1024**3)),
+        },
+    }
+
+# "chain", "fused" or "inline", see core.integrations.factories
+SYNC_PIPELINE = os.environ.get("SYNC_PIPELINE", "fused")
+
 DATA_SOURCES = {
     "pokemon": {
         "page_loader": {
             "class": "core.integrations.loaders.DefaultPageLoader",
-            "kwargs": {"url": "https://pokeapi.co/api/v2/pokemon/"},
+            "kwargs": {
+                "url": f"{POKEAPI_URL}/pokemon/",
+                "eager": True,
+                "pool_maxsize": HTTP_POOL_MAXSIZE,
+                "timeout": HTTP_TIMEOUT,
+            },
         },
         "entity_loader": {
             "class": "core.integrations.loaders.DefaultEntityLoader",
+            "kwargs": {
+                "conditional": True,
+                "pool_maxsize": HTTP_POOL_MAXSIZE,
+                "timeout": HTTP_TIMEOUT,
+            },
         },
+        "rate_limiter": RATE_LIMITER,
+        "pipeline": SYNC_PIPELINE,
+        "response_cache": RESPONSE_CACHE,
         "transformer": {
             "class": "pokemons.integrations.transformers.PokemonTransformer",
         },
         "updater": {
-            "class": "pokemons.integrations.updaters.PokemonUpdater",
+            "class": "pokemons.integrations.updaters.PokemonBulkUpdater",
             "kwargs": {"model_name": "pokemons.Pokemon"},
         },
     },
     "ability": {
         "page_loader": {
             "class": "core.integrations.loaders.DefaultPageLoader",
-            "kwargs": {"url": "https://pokeapi.co/api/v2/ability/"},
+            "kwargs": {
+                "url": f"{POKEAPI_URL}/ability/",
+                "eager": True,
+                "pool_maxsize": HTTP_POOL_MAXSIZE,
+                "timeout": HTTP_TIMEOUT,
+            },
         },
         "entity_loader": {
             "class": "core.integrations.loaders.DefaultEntityLoader",
+            "kwargs": {
+                "conditional": True,
+                "pool_maxsize": HTTP_POOL_MAXSIZE,
+                "timeout": HTTP_TIMEOUT,
+            },
         },
+        "rate_limiter": RATE_LIMITER,
+        "pipeline": SYNC_PIPELINE,
+        "response_cache": RESPONSE_CACHE,
         "transformer": {
             "class": "pokemons.integrations.transformers.AbilityTransformer",
         },
         "updater": {
-            "class": "core.integrations.updaters.DefaultUpdater",
+            "class": "core.integrations.updaters.BulkUpdater",
             "kwargs": {"model_name": "pokemons.Ability"},
         },
     },
@@ -305,6 +403,29 @@ NOTEBOOK_ARGUMENTS = [
 
 TESTING = "test" in sys.argv
 
+# QUERY BUDGET
+
+# "off", "log" or "raise" when a request exceeds the query budget of its view
+QUERY_BUDGET_MODE = os.environ.get("QUERY_BUDGET_MODE", "raise" if TESTING else "log")
+# The maximum number of executions of the same SQL statement in a request
+QUERY_BUDGET_MAX_REPEATS = int(os.environ.get("QUERY_BUDGET_MAX_REPEATS", 1))
+
+# CACHE
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": f"redis://{REDIS_HOST}:{REDIS_PORT}/4",
+    }
+}
+if TESTING:
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+# The list and detail views are cached until the dataset version is bumped by the
+# sync, see core.caching. The timeout only expires entries of old versions.
+VIEW_CACHE = os.environ.get("VIEW_CACHE", str(not TESTING)) == "True"
+VIEW_CACHE_TIMEOUT = int(os.environ.get("VIEW_CACHE_TIMEOUT", 24 * 60 * 60))
+
 # DJANGO DEBUG TOOLBAR
 if ENVIRONMENT == "development" and not TESTING:
     INSTALLED_APPS += ["debug_toolbar"]
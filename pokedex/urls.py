@@ -20,6 +20,8 @@ from django.contrib import admin
 from django.urls import include, path
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 
+from core.views import metrics_view
+
 admin.site.site_header = f"Pokedex Challenge v{settings.APP_VERSION}"
 admin.site.site_title = f"Pokedex Challenge v{settings.APP_VERSION}"
 
@@ -31,7 +33,9 @@ urlpatterns = [
         name="swagger-ui",
     ),
     path("admin/", admin.site.urls),
+    path("metrics", metrics_view, name="metrics"),
     path("api/v1/", include("pokemons.urls_api")),
+    path("api/v1/", include("core.urls_api")),
     path("", include("pokemons.urls", namespace="pokemons")),
 ]
 
@@ -2,4 +2,4 @@
 
 python manage.py migrate
 python manage.py collectstatic --noinput
-gunicorn pokedex.wsgi:application --bind 0.0.0.0:8000
\ No newline at end of file
+gunicorn pokedex.wsgi:application --config gunicorn.conf.py
\ No newline at end of file
@@ -0,0 +1,40 @@
+import json
+
+from django.test import SimpleTestCase
+
+from core.benchmarks.explain import summarize_plan
+
+PLAN = [
+    {
+        "Plan": {
+            "Node Type": "Hash Join",
+            "Plans": [
+                {
+                    "Node Type": "Seq Scan",
+                    "Relation Name": "pokemons_pokemontype",
+                },
+                {
+                    "Node Type": "Bitmap Heap Scan",
+                    "Relation Name": "pokemons_type",
+                    "Plans": [
+                        {
+                            "Node Type": "Bitmap Index Scan",
+                            "Index Name": "type_name_trgm",
+                        }
+                    ],
+                },
+            ],
+        },
+        "Planning Time": 0.2,
+        "Execution Time": 1.5,
+    }
+]
+
+
+class SummarizePlanTest(SimpleTestCase):
+    def test_summarize_plan__returns_scans_and_execution_time(self):
+        execution_ms, seq_scans, index_scans = summarize_plan(json.dumps(PLAN))
+
+        self.assertEqual(execution_ms, 1.5)
+        self.assertEqual(seq_scans, ["pokemons_pokemontype"])
+        self.assertEqual(index_scans, ["type_name_trgm"])
@@ -0,0 +1,28 @@
+from unittest import TestCase
+
+from core.benchmarks.load import Sample, get_percentiles, split, summarize
+
+
+class SummarizeTest(TestCase):
+    def test_get_percentiles__returns_inclusive_percentiles(self):
+        percentiles = get_percentiles([float(n) for n in range(1, 102)])
+
+        self.assertEqual(percentiles, {50: 51.0, 95: 96.0, 99: 100.0})
+
+    def test_summarize__counts_errors_and_mean_queries(self):
+        samples = [Sample(0.01, 200, 2), Sample(0.03, 500, 4)]
+
+        result = summarize("api.type_list", samples, seconds=0.5)
+
+        self.assertEqual(result.errors, 1)
+        self.assertEqual(result.requests_per_second, 4.0)
+        self.assertAlmostEqual(result.mean, 20.0)
+        self.assertEqual(result.queries_per_request, 3)
+
+    def test_summarize__queries_unknown__returns_none(self):
+        result = summarize("api.type_list", [Sample(0.01, 200)], seconds=1)
+
+        self.assertIsNone(result.queries_per_request)
+
+    def test_split__distributes_remainder(self):
+        self.assertEqual(split(10, 4), [3, 3, 2, 2])
@@ -0,0 +1,37 @@
+from django.test import TestCase
+
+from core.benchmarks.report import build_report, compare_reports
+from core.benchmarks.sync import get_benchmark_sources
+
+
+class CompareReportsTest(TestCase):
+    def test_compare_reports__returns_relative_changes(self):
+        baseline = build_report("sync", {}, {"median": {"seconds": 2.0, "queries": 0}})
+        report = build_report("sync", {}, {"median": {"seconds": 1.5, "queries": 3}})
+
+        rows = compare_reports(report, baseline)
+
+        self.assertEqual(
+            rows,
+            [("median.seconds", 2.0, 1.5, -0.25), ("median.queries", 0, 3, None)],
+        )
+
+    def test_compare_reports__missing_in_baseline__skips_measurement(self):
+        baseline = build_report("sync", {}, {"median": {}})
+        report = build_report("sync", {}, {"median": {"seconds": 1.5}, "runs": []})
+
+        self.assertEqual(compare_reports(report, baseline), [])
+
+
+class GetBenchmarkSourcesTest(TestCase):
+    def test_get_benchmark_sources__points_to_stub_without_rate_limiter(self):
+        sources = get_benchmark_sources("http://127.0.0.1:8765/api/v2", "inline")
+
+        config = sources["pokemon"]
+        self.assertEqual(
+            config["page_loader"]["kwargs"]["url"],
+            "http://127.0.0.1:8765/api/v2/pokemon/",
+        )
+        self.assertIsNone(config["rate_limiter"])
+        self.assertIsNone(config["response_cache"])
+        self.assertEqual(config["pipeline"], "inline")
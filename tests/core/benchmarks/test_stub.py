@@ -0,0 +1,70 @@
+import tempfile
+from unittest import TestCase
+
+import requests
+from pokemons.integrations.transformers import AbilityTransformer, PokemonTransformer
+
+from core.benchmarks.stub import StubPokeAPI
+from core.integrations.cache import ResponseCache
+
+
+class StubPokeAPITest(TestCase):
+    def setUp(self):
+        self.stub = StubPokeAPI(count=25)
+        self.stub.start()
+        self.addCleanup(self.stub.stop)
+
+    def test_get__first_page__returns_page_with_next(self):
+        response = requests.get(f"{self.stub.url}/pokemon/")
+
+        data = response.json()
+        self.assertEqual(data["count"], 25)
+        self.assertEqual(len(data["results"]), 20)
+        self.assertEqual(data["next"], f"{self.stub.url}/pokemon/?offset=20&limit=20")
+
+    def test_get__last_page__returns_remaining_entities(self):
+        response = requests.get(f"{self.stub.url}/pokemon/?offset=20&limit=20")
+
+        data = response.json()
+        self.assertEqual(len(data["results"]), 5)
+        self.assertIsNone(data["next"])
+
+    def test_get__pokemon__returns_transformable_pokemon(self):
+        response = requests.get(f"{self.stub.url}/pokemon/3/")
+
+        transformed = PokemonTransformer(response.json()).transform()
+        self.assertEqual(transformed["name"], "pokemon-3")
+
+    def test_get__ability__returns_transformable_ability(self):
+        response = requests.get(f"{self.stub.url}/ability/3/")
+
+        transformed = AbilityTransformer(response.json()).transform()
+        self.assertEqual(transformed["name"], "ability-3")
+
+    def test_get__out_of_range__returns_404(self):
+        response = requests.get(f"{self.stub.url}/pokemon/26/")
+
+        self.assertEqual(response.status_code, 404)
+
+
+class StubPokeAPIRecordingsTest(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        ResponseCache(directory.name).set(
+            "https://pokeapi.co/api/v2/ability/1/",
+            b'{"id": 1, "url": "https://pokeapi.co/api/v2/ability/1/"}',
+        )
+        self.stub = StubPokeAPI(recordings=directory.name)
+        self.stub.start()
+        self.addCleanup(self.stub.stop)
+
+    def test_get__recorded__returns_body_with_stub_urls(self):
+        response = requests.get(f"{self.stub.url}/ability/1/")
+
+        self.assertEqual(response.json()["url"], f"{self.stub.url}/ability/1/")
+
+    def test_get__not_recorded__returns_404(self):
+        response = requests.get(f"{self.stub.url}/ability/2/")
+
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,62 @@
+import os
+import tempfile
+import time
+from unittest import TestCase
+
+from core.integrations.cache import ResponseCache
+from core.integrations.loaders import LoaderException
+
+
+class ResponseCacheTest(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.url = "https://pokeapi.co/api/v2/pokemon/1/"
+
+    def test_set__then_load__returns_data(self):
+        cache = ResponseCache(self.directory.name)
+        cache.set(self.url, b'{"id": 1}')
+
+        self.assertEqual(cache.load(self.url), {"id": 1})
+
+    def test_load__not_cached__raise_loader_exception(self):
+        cache = ResponseCache(self.directory.name, mode="replay")
+
+        with self.assertRaises(LoaderException):
+            cache.load(self.url)
+
+    def test_get__expired__returns_none(self):
+        cache = ResponseCache(self.directory.name, ttl=60)
+        cache.set(self.url, b'{"id": 1}')
+        past = time.time() - 120
+        os.utime(cache.get_path(self.url), (past, past))
+
+        self.assertIsNone(cache.get(self.url))
+
+    def test_load__replay_expired__returns_data(self):
+        ResponseCache(self.directory.name).set(self.url, b'{"id": 1}')
+        past = time.time() - 120
+        os.utime(ResponseCache(self.directory.name).get_path(self.url), (past, past))
+
+        cache = ResponseCache(self.directory.name, mode="replay", ttl=60)
+
+        self.assertEqual(cache.load(self.url), {"id": 1})
+
+    def test_evict__over_max_size__deletes_oldest_entries(self):
+        cache = ResponseCache(self.directory.name, max_size=20)
+        for i in range(3):
+            url = f"https://pokeapi.co/api/v2/pokemon/{i}/"
+            cache.set(url, b'{"id": 1234567}')  # 15 bytes
+            mtime = time.time() - 100 + i
+            os.utime(cache.get_path(url), (mtime, mtime))
+
+        deleted = cache.evict()
+
+        self.assertEqual(deleted, 2)
+        self.assertIsNone(cache.get("https://pokeapi.co/api/v2/pokemon/0/"))
+        self.assertIsNone(cache.get("https://pokeapi.co/api/v2/pokemon/1/"))
+        self.assertIsNotNone(cache.get("https://pokeapi.co/api/v2/pokemon/2/"))
+
+    def test_init__unknown_mode__raise_value_error(self):
+        with self.assertRaises(ValueError):
+            ResponseCache(self.directory.name, mode="offline")
@@ -0,0 +1,84 @@
+from django.test import TestCase
+from pokemons.models import PokemonAbility, PokemonType
+
+from core.integrations.diffs import ThroughDiff
+from tests.factories.pokemons import AbilityFactory, PokemonFactory, TypeFactory
+
+
+class ThroughDiffTest(TestCase):
+    def setUp(self):
+        self.pokemon = PokemonFactory(id=1)
+        self.grass = TypeFactory(id=12, name="grass")
+        self.poison = TypeFactory(id=4, name="poison")
+        self.overgrow = AbilityFactory(id=65, name="overgrow")
+        self.chlorophyll = AbilityFactory(id=34, name="chlorophyll")
+
+    def get_type_diff(self, rows: list[dict]) -> ThroughDiff:
+        return ThroughDiff(
+            model=PokemonType,
+            parent_field="pokemon_id",
+            parent_ids=[self.pokemon.id],
+            rows=rows,
+            key_fields=("pokemon_id", "type_id", "slot"),
+        ).compute()
+
+    def test_compute__no_changes__has_no_changes(self):
+        PokemonType.objects.create(pokemon=self.pokemon, type=self.grass, slot=1)
+
+        diff = self.get_type_diff([{"pokemon_id": 1, "type_id": 12, "slot": 1}])
+
+        self.assertFalse(diff.has_changes())
+
+    def test_apply__swapped_slots__replaces_rows(self):
+        PokemonType.objects.create(pokemon=self.pokemon, type=self.grass, slot=1)
+        PokemonType.objects.create(pokemon=self.pokemon, type=self.poison, slot=2)
+
+        diff = self.get_type_diff(
+            [
+                {"pokemon_id": 1, "type_id": 12, "slot": 2},
+                {"pokemon_id": 1, "type_id": 4, "slot": 1},
+            ]
+        )
+        diff.apply()
+
+        self.assertEqual(len(diff.to_delete), 2)
+        self.assertEqual(len(diff.to_create), 2)
+        self.assertEqual(
+            set(PokemonType.objects.values_list("type_id", "slot")), {(12, 2), (4, 1)}
+        )
+
+    def test_apply__removed_row__deletes_row(self):
+        PokemonType.objects.create(pokemon=self.pokemon, type=self.grass, slot=1)
+        PokemonType.objects.create(pokemon=self.pokemon, type=self.poison, slot=2)
+
+        diff = self.get_type_diff([{"pokemon_id": 1, "type_id": 12, "slot": 1}])
+        with self.assertNumQueries(1):
+            diff.apply()
+
+        self.assertEqual(
+            list(PokemonType.objects.values_list("type_id", "slot")), [(12, 1)]
+        )
+
+    def test_apply__changed_update_field__updates_row(self):
+        ability = PokemonAbility.objects.create(
+            pokemon=self.pokemon, ability=self.overgrow, slot=1, is_hidden=False
+        )
+
+        diff = ThroughDiff(
+            model=PokemonAbility,
+            parent_field="pokemon_id",
+            parent_ids=[self.pokemon.id],
+            rows=[
+                {"pokemon_id": 1, "ability_id": 65, "slot": 1, "is_hidden": True},
+                {"pokemon_id": 1, "ability_id": 34, "slot": 3, "is_hidden": True},
+            ],
+            key_fields=("pokemon_id", "ability_id", "slot"),
+            update_fields=("is_hidden",),
+        ).compute()
+        diff.apply()
+
+        self.assertEqual(diff.to_update, [ability])
+        self.assertEqual(len(diff.to_create), 1)
+        ability.refresh_from_db()
+        self.assertTrue(ability.is_hidden)
+        self.assertEqual(PokemonAbility.objects.count(), 2)
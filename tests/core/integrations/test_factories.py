@@ -1,8 +1,22 @@
+from unittest.mock import patch
+
+from django.core.exceptions import ImproperlyConfigured
 from django.test import SimpleTestCase, override_settings
+from django.utils.module_loading import import_string
 from pokemons.models import Pokemon
 
-from core.integrations.factories import DataSourceFactory
-from core.integrations.loaders import DefaultEntityLoader, DefaultPageLoader
+from core.integrations.cache import ResponseCache
+from core.integrations.factories import (
+    DataSourceFactory,
+    build_registry,
+    clear_registry,
+    get_registry,
+)
+from core.integrations.loaders import (
+    AsyncBatchEntityLoader,
+    DefaultEntityLoader,
+    DefaultPageLoader,
+)
 from core.integrations.transformers import BaseTransformer
 from core.integrations.updaters import DefaultUpdater
 
@@ -27,7 +41,7 @@ TEST_DATA_SOURCES = {
         },
         "entity_loader": {
             "class": "core.integrations.loaders.DefaultEntityLoader",
-            "kwargs": {"extra_param": "value"},
+            "kwargs": {"extra_param": "value", "pool_maxsize": 3, "timeout": 5},
         },
         "transformer": {
             "class": "tests.core.integrations.test_factories.DummyTransformer",
@@ -40,6 +54,27 @@ TEST_DATA_SOURCES = {
     }
 }
 
+TEST_BATCH_DATA_SOURCES = {
+    "test_source": {
+        **TEST_DATA_SOURCES["test_source"],
+        "entity_loader": {
+            "class": "core.integrations.loaders.AsyncBatchEntityLoader",
+            "kwargs": {"concurrency": 5},
+        },
+    }
+}
+
+
+TEST_CACHED_DATA_SOURCES = {
+    "test_source": {
+        **TEST_DATA_SOURCES["test_source"],
+        "response_cache": {
+            "class": "core.integrations.cache.ResponseCache",
+            "kwargs": {"directory": "/tmp/responses", "mode": "replay"},
+        },
+    }
+}
+
 
 class DataSourceFactoryTest(SimpleTestCase):
 
@@ -69,6 +104,27 @@ class DataSourceFactoryTest(SimpleTestCase):
 
         self.assertTrue(isinstance(loader, DefaultEntityLoader))
         self.assertEqual(loader.url, url)
+        self.assertEqual(loader.timeout, 5)
+        self.assertEqual(loader.kwargs, {"extra_param": "value"})
+        adapter = loader.session.get_adapter(url)
+        self.assertEqual(adapter._pool_maxsize, 3)
+
+    @override_settings(DATA_SOURCES=TEST_DATA_SOURCES)
+    def test_has_batch_entity_loader__default_loader__returns_false(self):
+        factory = DataSourceFactory("test_source")
+
+        self.assertFalse(factory.has_batch_entity_loader())
+
+    @override_settings(DATA_SOURCES=TEST_BATCH_DATA_SOURCES)
+    def test_get_batch_entity_loader__returns_batch_loader_instance_with_urls(self):
+        factory = DataSourceFactory("test_source")
+        urls = ["https://test-api.com/items/1/", "https://test-api.com/items/2/"]
+        loader = factory.get_batch_entity_loader(urls=urls)
+
+        self.assertTrue(factory.has_batch_entity_loader())
+        self.assertTrue(isinstance(loader, AsyncBatchEntityLoader))
+        self.assertEqual(loader.urls, urls)
+        self.assertEqual(loader.concurrency, 5)
 
     @override_settings(DATA_SOURCES=TEST_DATA_SOURCES)
     def test_get_transformer__returns_transformer_instance_with_data_and_kwargs(self):
@@ -89,3 +145,115 @@ class DataSourceFactoryTest(SimpleTestCase):
         self.assertTrue(isinstance(updater, DummyUpdater))
         self.assertEqual(updater.data, data)
         self.assertEqual(updater.model, Pokemon)
+
+    @override_settings(DATA_SOURCES=TEST_DATA_SOURCES)
+    def test_get_response_cache__not_configured__returns_none(self):
+        factory = DataSourceFactory("test_source")
+
+        self.assertIsNone(factory.get_response_cache())
+        self.assertIsNone(factory.get_page_loader().response_cache)
+
+    @override_settings(DATA_SOURCES=TEST_CACHED_DATA_SOURCES)
+    def test_get_entity_loader__response_cache__returns_replaying_loader(self):
+        factory = DataSourceFactory("test_source")
+        loader = factory.get_entity_loader(url="https://test-api.com/items/1/")
+
+        self.assertTrue(isinstance(loader.response_cache, ResponseCache))
+        self.assertTrue(loader.replaying)
+
+    @override_settings(DATA_SOURCES=TEST_DATA_SOURCES)
+    def test_get_entity_loader__transformer_projection__passes_projection(self):
+        factory = DataSourceFactory("test_source")
+        with patch.object(DummyTransformer, "projection", ("id", "name")):
+            loader = factory.get_entity_loader(url="https://test-api.com/items/1/")
+
+        self.assertEqual(loader.projection_tree, {"id": True, "name": True})
+        self.assertTrue(loader.stream)
+
+    @override_settings(DATA_SOURCES=TEST_DATA_SOURCES)
+    def test_init__unknown_source__raises_value_error(self):
+        with self.assertRaises(ValueError):
+            DataSourceFactory("unknown_source")
+
+
+class RegistryTest(SimpleTestCase):
+
+    def tearDown(self):
+        clear_registry()
+
+    @override_settings(DATA_SOURCES=TEST_DATA_SOURCES)
+    def test_get_registry__called_twice__imports_classes_once(self):
+        clear_registry()
+        with patch(
+            "core.integrations.factories.import_string", side_effect=import_string
+        ) as mock_import_string:
+            get_registry()
+            DataSourceFactory("test_source").get_entity_loader(
+                "https://test-api.com/1/"
+            )
+            get_registry()
+
+        self.assertEqual(mock_import_string.call_count, 4)
+
+    @override_settings(DATA_SOURCES=TEST_DATA_SOURCES)
+    def test_get_registry__splits_session_kwargs_and_is_read_only(self):
+        loader = get_registry()["test_source"]["entity_loader"]
+
+        self.assertIs(loader.cls, DefaultEntityLoader)
+        self.assertEqual(dict(loader.kwargs), {"extra_param": "value", "timeout": 5})
+        self.assertEqual(dict(loader.session_kwargs), {"pool_maxsize": 3})
+        with self.assertRaises(TypeError):
+            loader.kwargs["timeout"] = 10
+
+    def test_get_registry__settings_changed__resolves_new_settings(self):
+        with override_settings(DATA_SOURCES=TEST_DATA_SOURCES):
+            self.assertFalse(DataSourceFactory("test_source").has_batch_entity_loader())
+        with override_settings(DATA_SOURCES=TEST_BATCH_DATA_SOURCES):
+            self.assertTrue(DataSourceFactory("test_source").has_batch_entity_loader())
+
+    def test_build_registry__missing_component__raises_improperly_configured(self):
+        data_sources = {"test_source": dict(TEST_DATA_SOURCES["test_source"])}
+        del data_sources["test_source"]["updater"]
+
+        with override_settings(DATA_SOURCES=data_sources):
+            with self.assertRaisesMessage(ImproperlyConfigured, "['updater']"):
+                build_registry()
+
+    def test_build_registry__wrong_class__raises_improperly_configured(self):
+        data_sources = {
+            "test_source": {
+                **TEST_DATA_SOURCES["test_source"],
+                "transformer": {"class": "core.integrations.transformers.Missing"},
+            }
+        }
+
+        with override_settings(DATA_SOURCES=data_sources):
+            with self.assertRaisesMessage(ImproperlyConfigured, "['transformer']"):
+                build_registry()
+
+    def test_build_registry__page_loader_without_url__raises_improperly_configured(
+        self,
+    ):
+        data_sources = {
+            "test_source": {
+                **TEST_DATA_SOURCES["test_source"],
+                "page_loader": {"class": "core.integrations.loaders.DefaultPageLoader"},
+            }
+        }
+
+        with override_settings(DATA_SOURCES=data_sources):
+            with self.assertRaisesMessage(ImproperlyConfigured, "'url'"):
+                build_registry()
+
+    def test_build_registry__unknown_pipeline__raises_improperly_configured(self):
+        data_sources = {
+            "test_source": {**TEST_DATA_SOURCES["test_source"], "pipeline": "fast"}
+        }
+
+        with override_settings(DATA_SOURCES=data_sources):
+            with self.assertRaisesMessage(ImproperlyConfigured, "['pipeline']"):
+                build_registry()
+
+    @override_settings(DATA_SOURCES=TEST_DATA_SOURCES)
+    def test_get_pipeline__not_configured__returns_chain(self):
+        self.assertEqual(DataSourceFactory("test_source").get_pipeline(), "chain")
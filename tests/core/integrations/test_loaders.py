@@ -1,16 +1,28 @@
+import io
+import json
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest import TestCase
 from unittest.mock import Mock, patch
 
 import requests
+from django.test import TestCase as DjangoTestCase
 
+from core.integrations.cache import ResponseCache
 from core.integrations.loaders import (
+    AsyncBatchEntityLoader,
     DefaultEntityLoader,
     DefaultPageLoader,
     LoaderException,
+    RateLimited,
+    parse_retry_after,
 )
+from core.integrations.sessions import DEFAULT_TIMEOUT
+from core.models import ResponseValidator
 
 
-@patch("core.integrations.loaders.requests.get")
+@patch("core.integrations.sessions.requests.Session.get")
 class PageLoaderTest(TestCase):
     def test_load_pokemons__has_next_url__returns_ids_and_next_url(self, mocked_get):
         response_data = {
@@ -25,7 +37,9 @@ class PageLoaderTest(TestCase):
             ],
         }
         mocked_get.return_value = Mock(
-            status_code=200, json=Mock(return_value=response_data)
+            status_code=200,
+            content=json.dumps(response_data).encode(),
+            json=Mock(return_value=response_data),
         )
 
         loader = DefaultPageLoader(url="https://pokeapi.co/api/v2/pokemon/")
@@ -45,7 +59,12 @@ class PageLoaderTest(TestCase):
             next_url, "https://pokeapi.co/api/v2/pokemon/?offset=20&limit=20"
         )
 
-        mocked_get.assert_called_once_with("https://pokeapi.co/api/v2/pokemon/")
+        mocked_get.assert_called_once_with(
+            "https://pokeapi.co/api/v2/pokemon/",
+            headers={},
+            timeout=DEFAULT_TIMEOUT,
+            stream=False,
+        )
 
     def test_load_pokemons__next_url_is_null__returns_next_url_none(self, mocked_get):
         response_data = {
@@ -57,7 +76,9 @@ class PageLoaderTest(TestCase):
             ],
         }
         mocked_get.return_value = Mock(
-            status_code=200, json=Mock(return_value=response_data)
+            status_code=200,
+            content=json.dumps(response_data).encode(),
+            json=Mock(return_value=response_data),
         )
 
         loader = DefaultPageLoader(url="https://pokeapi.co/api/v2/pokemon/")
@@ -65,7 +86,12 @@ class PageLoaderTest(TestCase):
 
         self.assertEqual(next_url, None)
 
-        mocked_get.assert_called_once_with("https://pokeapi.co/api/v2/pokemon/")
+        mocked_get.assert_called_once_with(
+            "https://pokeapi.co/api/v2/pokemon/",
+            headers={},
+            timeout=DEFAULT_TIMEOUT,
+            stream=False,
+        )
 
     def test_load_pokemons__status_is_not_200__raise_loader_exception(self, mocked_get):
         mocked_get.return_value = Mock(status_code=500, json=Mock(return_value={}))
@@ -86,7 +112,41 @@ class PageLoaderTest(TestCase):
             loader.load()
 
 
-@patch("core.integrations.loaders.requests.get")
+class EagerPageLoaderTest(TestCase):
+    def setUp(self):
+        self.next_url = "https://pokeapi.co/api/v2/pokemon/?offset=20&limit=20"
+
+    def test_get_page_urls__eager__returns_remaining_page_urls(self):
+        loader = DefaultPageLoader(url="https://pokeapi.co/api/v2/pokemon/", eager=True)
+        loader.parse_response({"count": 65, "next": self.next_url, "results": []})
+
+        self.assertEqual(
+            loader.get_page_urls(self.next_url),
+            [
+                "https://pokeapi.co/api/v2/pokemon/?offset=20&limit=20",
+                "https://pokeapi.co/api/v2/pokemon/?offset=40&limit=20",
+                "https://pokeapi.co/api/v2/pokemon/?offset=60&limit=20",
+            ],
+        )
+
+    def test_get_page_urls__not_eager__returns_none(self):
+        loader = DefaultPageLoader(url="https://pokeapi.co/api/v2/pokemon/")
+        loader.parse_response({"count": 65, "next": self.next_url, "results": []})
+
+        self.assertIsNone(loader.get_page_urls(self.next_url))
+
+    def test_get_page_urls__without_count_or_offset__returns_none(self):
+        loader = DefaultPageLoader(url="https://pokeapi.co/api/v2/pokemon/", eager=True)
+        loader.parse_response({"next": self.next_url, "results": []})
+
+        self.assertIsNone(loader.get_page_urls(self.next_url))
+
+        loader.parse_response({"count": 65, "next": "https://x/?page=2", "results": []})
+
+        self.assertIsNone(loader.get_page_urls("https://x/?page=2"))
+
+
+@patch("core.integrations.sessions.requests.Session.get")
 class EntityLoaderTest(TestCase):
     def test_load__status_200__returns_data(self, mocked_get):
         response_data = {
@@ -97,7 +157,9 @@ class EntityLoaderTest(TestCase):
             ],
         }
         mocked_get.return_value = Mock(
-            status_code=200, json=Mock(return_value=response_data)
+            status_code=200,
+            content=json.dumps(response_data).encode(),
+            json=Mock(return_value=response_data),
         )
 
         loader = DefaultEntityLoader(url="https://pokeapi.co/api/v2/pokemon/1/")
@@ -105,4 +167,342 @@ class EntityLoaderTest(TestCase):
 
         self.assertEqual(result, response_data)
 
-        mocked_get.assert_called_once_with("https://pokeapi.co/api/v2/pokemon/1/")
+        mocked_get.assert_called_once_with(
+            "https://pokeapi.co/api/v2/pokemon/1/",
+            headers={},
+            timeout=DEFAULT_TIMEOUT,
+            stream=False,
+        )
+
+    def test_load__too_many_requests__raise_rate_limited(self, mocked_get):
+        mocked_get.return_value = Mock(
+            status_code=429, headers={"Retry-After": "3"}, text="Too Many Requests"
+        )
+        rate_limiter = Mock()
+
+        loader = DefaultEntityLoader(
+            url="https://pokeapi.co/api/v2/pokemon/1/", rate_limiter=rate_limiter
+        )
+        with self.assertRaises(RateLimited) as cm:
+            loader.load()
+
+        self.assertEqual(cm.exception.retry_after, 3)
+        rate_limiter.acquire.assert_called_once_with()
+        status_code, _, retry_after = rate_limiter.record.call_args.args
+        self.assertEqual((status_code, retry_after), (429, 3))
+
+    def test_load__requests_raise_exception__records_failure(self, mocked_get):
+        mocked_get.side_effect = requests.exceptions.ConnectionError()
+        rate_limiter = Mock()
+
+        loader = DefaultEntityLoader(
+            url="https://pokeapi.co/api/v2/pokemon/1/", rate_limiter=rate_limiter
+        )
+        with self.assertRaises(LoaderException):
+            loader.load()
+
+        self.assertIsNone(rate_limiter.record.call_args.args[0])
+
+
+class ParseRetryAfterTest(TestCase):
+    def test_parse_retry_after__seconds__returns_seconds(self):
+        self.assertEqual(parse_retry_after("120"), 120)
+
+    def test_parse_retry_after__past_http_date__returns_zero(self):
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0)
+
+    def test_parse_retry_after__missing_or_invalid__returns_none(self):
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after("soon"))
+
+
+@patch("core.integrations.sessions.requests.Session.get")
+class ConditionalEntityLoaderTest(DjangoTestCase):
+    url = "https://pokeapi.co/api/v2/pokemon/1/"
+
+    def test_load__no_validator__collects_validators_and_returns_data(self, mocked_get):
+        mocked_get.return_value = Mock(
+            status_code=200,
+            headers={"ETag": '"abc"', "Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT"},
+            content=b'{"name": "bulbasaur"}',
+            json=Mock(return_value={"name": "bulbasaur"}),
+        )
+
+        loader = DefaultEntityLoader(url=self.url, conditional=True)
+        result = loader.load()
+
+        self.assertEqual(result, {"name": "bulbasaur"})
+        mocked_get.assert_called_once_with(
+            self.url, headers={}, timeout=DEFAULT_TIMEOUT, stream=False
+        )
+        self.assertEqual(
+            loader.validators[self.url],
+            {"ETag": '"abc"', "Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT"},
+        )
+        # Stored only once the entity is saved
+        self.assertFalse(ResponseValidator.objects.exists())
+
+    def test_load__not_modified__sends_validators_and_returns_none(self, mocked_get):
+        ResponseValidator.objects.create(
+            url=self.url, etag='"abc"', last_modified="Wed, 21 Oct 2015 07:28:00 GMT"
+        )
+        mocked_get.return_value = Mock(status_code=304, headers={})
+
+        loader = DefaultEntityLoader(url=self.url, conditional=True)
+        result = loader.load()
+
+        self.assertIsNone(result)
+        mocked_get.assert_called_once_with(
+            self.url,
+            headers={
+                "If-None-Match": '"abc"',
+                "If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT",
+            },
+            timeout=DEFAULT_TIMEOUT,
+            stream=False,
+        )
+
+    def test_load__recording__sends_no_validators_and_records(self, mocked_get):
+        ResponseValidator.objects.create(url=self.url, etag='"abc"')
+        mocked_get.return_value = Mock(
+            status_code=200,
+            headers={"ETag": '"abc"'},
+            content=b'{"name": "bulbasaur"}',
+            json=Mock(return_value={"name": "bulbasaur"}),
+        )
+
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ResponseCache(directory, mode="record")
+            loader = DefaultEntityLoader(
+                url=self.url, conditional=True, response_cache=cache
+            )
+            result = loader.load()
+
+            self.assertEqual(result, {"name": "bulbasaur"})
+            self.assertEqual(cache.get(self.url), b'{"name": "bulbasaur"}')
+        mocked_get.assert_called_once_with(
+            self.url, headers={}, timeout=DEFAULT_TIMEOUT, stream=False
+        )
+        self.assertEqual(loader.validators[self.url], {"ETag": '"abc"'})
+
+    def test_load__object_deleted__sends_no_validators(self, mocked_get):
+        ResponseValidator.objects.create(
+            url=self.url, etag='"abc"', model="pokemons.Pokemon", object_id=1
+        )
+        mocked_get.return_value = Mock(
+            status_code=200,
+            headers={},
+            content=b'{"name": "bulbasaur"}',
+            json=Mock(return_value={"name": "bulbasaur"}),
+        )
+
+        loader = DefaultEntityLoader(url=self.url, conditional=True)
+        result = loader.load()
+
+        self.assertEqual(result, {"name": "bulbasaur"})
+        mocked_get.assert_called_once_with(
+            self.url, headers={}, timeout=DEFAULT_TIMEOUT, stream=False
+        )
+
+    def test_load__not_conditional__status_304__raise_loader_exception(
+        self, mocked_get
+    ):
+        mocked_get.return_value = Mock(status_code=304, headers={})
+
+        loader = DefaultEntityLoader(url=self.url)
+
+        with self.assertRaises(LoaderException):
+            loader.load()
+
+
+@patch("core.integrations.sessions.requests.Session.get")
+class ProjectionEntityLoaderTest(TestCase):
+    def test_load__projection__streams_only_projected_data(self, mocked_get):
+        response_data = {"id": 1, "name": "bulbasaur", "moves": [{"move": {}}] * 100}
+        mocked_get.return_value = Mock(
+            status_code=200, raw=io.BytesIO(json.dumps(response_data).encode())
+        )
+
+        loader = DefaultEntityLoader(
+            url="https://pokeapi.co/api/v2/pokemon/1/", projection=("id", "name")
+        )
+        result = loader.load()
+
+        self.assertEqual(result, {"id": 1, "name": "bulbasaur"})
+        mocked_get.assert_called_once_with(
+            "https://pokeapi.co/api/v2/pokemon/1/",
+            headers={},
+            timeout=DEFAULT_TIMEOUT,
+            stream=True,
+        )
+        mocked_get.return_value.close.assert_called_once_with()
+
+    def test_load__projection__invalid_json__raise_loader_exception(self, mocked_get):
+        mocked_get.return_value = Mock(status_code=200, raw=io.BytesIO(b'{"id": 1,'))
+
+        loader = DefaultEntityLoader(
+            url="https://pokeapi.co/api/v2/pokemon/1/", projection=("id",)
+        )
+
+        with self.assertRaises(LoaderException):
+            loader.load()
+
+
+@patch("core.integrations.sessions.requests.Session.get")
+class ResponseCacheEntityLoaderTest(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.url = "https://pokeapi.co/api/v2/pokemon/1/"
+
+    def test_load__record__stores_response_body(self, mocked_get):
+        mocked_get.return_value = Mock(
+            status_code=200, content=b'{"id": 1}', json=Mock(return_value={"id": 1})
+        )
+        cache = ResponseCache(self.directory, mode="record")
+
+        loader = DefaultEntityLoader(url=self.url, response_cache=cache)
+        loader.load()
+
+        self.assertEqual(cache.get(self.url), b'{"id": 1}')
+
+    def test_load__replay__returns_cached_data_without_request(self, mocked_get):
+        ResponseCache(self.directory).set(self.url, b'{"id": 1}')
+        cache = ResponseCache(self.directory, mode="replay")
+
+        loader = DefaultEntityLoader(
+            url=self.url, conditional=True, response_cache=cache
+        )
+        result = loader.load()
+
+        self.assertEqual(result, {"id": 1})
+        mocked_get.assert_not_called()
+
+
+class EntityRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/api/v2/pokemon/404/":
+            self.send_response(404)
+            self.end_headers()
+            self.wfile.write(b"Not found")
+            return
+        if self.path == "/api/v2/pokemon/500/":
+            self.send_response(500)
+            self.end_headers()
+            self.wfile.write(b"Server error")
+            return
+
+        etag = f'"{self.path}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        body = json.dumps({"url": self.path}).encode()
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class AsyncBatchEntityLoaderTest(DjangoTestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), EntityRequestHandler)
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_port}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_load__status_200__returns_data_in_url_order(self):
+        paths = [f"/api/v2/pokemon/{i}/" for i in range(1, 21)]
+
+        loader = AsyncBatchEntityLoader(
+            urls=[self.base_url + path for path in paths], concurrency=4
+        )
+        result = loader.load()
+
+        self.assertEqual(result, [{"url": path} for path in paths])
+
+    def test_load__status_is_not_200__keeps_loader_exception(self):
+        urls = [
+            f"{self.base_url}/api/v2/pokemon/1/",
+            f"{self.base_url}/api/v2/pokemon/404/",
+            f"{self.base_url}/api/v2/pokemon/500/",
+        ]
+
+        loader = AsyncBatchEntityLoader(urls=urls)
+        result = loader.load()
+
+        self.assertEqual(result, [{"url": "/api/v2/pokemon/1/"}, None, None])
+        self.assertEqual(list(loader.errors), urls[1:])
+        self.assertIsInstance(loader.errors[urls[1]], LoaderException)
+
+    def test_load__connection_error__keeps_loader_exception(self):
+        url = "http://127.0.0.1:1/api/v2/pokemon/1/"
+
+        loader = AsyncBatchEntityLoader(urls=[url])
+        result = loader.load()
+
+        self.assertEqual(result, [None])
+        self.assertIsInstance(loader.errors[url], LoaderException)
+
+    def test_load__conditional__returns_none_for_not_modified(self):
+        urls = [
+            f"{self.base_url}/api/v2/pokemon/1/",
+            f"{self.base_url}/api/v2/pokemon/2/",
+        ]
+        ResponseValidator.objects.create(url=urls[0], etag='"/api/v2/pokemon/1/"')
+
+        loader = AsyncBatchEntityLoader(urls=urls, conditional=True)
+        result = loader.load()
+
+        self.assertEqual(result, [None, {"url": "/api/v2/pokemon/2/"}])
+        self.assertEqual(loader.validators[urls[1]]["ETag"], '"/api/v2/pokemon/2/"')
+        self.assertEqual(ResponseValidator.objects.count(), 1)
+
+    def test_load__conditional_recording__records_not_modified_entities(self):
+        url = f"{self.base_url}/api/v2/pokemon/1/"
+        ResponseValidator.objects.create(url=url, etag='"/api/v2/pokemon/1/"')
+
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ResponseCache(directory, mode="record")
+            result = AsyncBatchEntityLoader(
+                urls=[url], conditional=True, response_cache=cache
+            ).load()
+
+            self.assertEqual(result, [{"url": "/api/v2/pokemon/1/"}])
+            self.assertIsNotNone(cache.get(url))
+
+    def test_load__record_then_replay__returns_same_data(self):
+        urls = [f"{self.base_url}/api/v2/pokemon/{i}/" for i in range(1, 4)]
+        with tempfile.TemporaryDirectory() as directory:
+            recorded = AsyncBatchEntityLoader(
+                urls=urls, response_cache=ResponseCache(directory, mode="record")
+            ).load()
+            self.server.shutdown()
+            try:
+                replayed = AsyncBatchEntityLoader(
+                    urls=urls, response_cache=ResponseCache(directory, mode="replay")
+                ).load()
+            finally:
+                threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        self.assertEqual(replayed, recorded)
+
+    def test_load__projection__returns_projected_data(self):
+        urls = [f"{self.base_url}/api/v2/pokemon/{i}/" for i in range(1, 3)]
+
+        loader = AsyncBatchEntityLoader(urls=urls, projection=("missing",))
+        result = loader.load()
+
+        self.assertEqual(result, [{}, {}])
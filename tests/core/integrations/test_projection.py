@@ -0,0 +1,71 @@
+import asyncio
+import io
+import json
+from unittest import TestCase
+
+from core.integrations.projection import (
+    build_projection_tree,
+    parse_projected,
+    parse_projected_async,
+    project,
+)
+
+
+class AsyncBytesReader:
+    def __init__(self, content: bytes):
+        self.file = io.BytesIO(content)
+
+    async def read(self, n: int = -1) -> bytes:
+        return self.file.read(n)
+
+
+class ProjectionTest(TestCase):
+    def setUp(self):
+        self.data = {
+            "id": 1,
+            "name": "bulbasaur",
+            "height": 0.7,
+            "moves": [{"move": {"name": "razor-wind"}, "version_group_details": []}],
+            "sprites": {
+                "front_default": "https://example.com/1.png",
+                "versions": {"generation-i": {"red-blue": {"front_default": None}}},
+            },
+            "types": [
+                {"slot": 1, "type": {"name": "grass", "url": "https://x/type/12/"}},
+                {"slot": 2, "type": {"name": "poison", "url": "https://x/type/4/"}},
+            ],
+        }
+        self.tree = build_projection_tree(
+            ["id", "name", "height", "sprites.front_default", "types.type.name"]
+        )
+        self.projected = {
+            "id": 1,
+            "name": "bulbasaur",
+            "height": 0.7,
+            "sprites": {"front_default": "https://example.com/1.png"},
+            "types": [{"type": {"name": "grass"}}, {"type": {"name": "poison"}}],
+        }
+
+    def test_build_projection_tree__nested_and_overlapping_paths(self):
+        tree = build_projection_tree(["sprites.front_default", "sprites", "id"])
+
+        self.assertEqual(tree, {"sprites": True, "id": True})
+
+    def test_project__returns_selected_values(self):
+        self.assertEqual(project(self.data, self.tree), self.projected)
+
+    def test_parse_projected__returns_selected_values(self):
+        content = json.dumps(self.data).encode()
+
+        self.assertEqual(
+            parse_projected(io.BytesIO(content), self.tree), self.projected
+        )
+
+    def test_parse_projected_async__returns_selected_values(self):
+        content = json.dumps(self.data).encode()
+
+        result = asyncio.run(
+            parse_projected_async(AsyncBytesReader(content), self.tree)
+        )
+
+        self.assertEqual(result, self.projected)
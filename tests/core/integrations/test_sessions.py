@@ -0,0 +1,51 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from core.integrations.sessions import close_sessions, get_pool_stats, get_session
+
+
+class GetSessionTest(TestCase):
+    def tearDown(self):
+        close_sessions()
+
+    def test_get_session__same_options__returns_same_session(self):
+        session_1 = get_session(pool_maxsize=5)
+        session_2 = get_session(pool_maxsize=5)
+
+        self.assertIs(session_1, session_2)
+
+    def test_get_session__different_options__returns_different_sessions(self):
+        session_1 = get_session(pool_maxsize=5)
+        session_2 = get_session(pool_maxsize=10)
+
+        self.assertIsNot(session_1, session_2)
+
+    def test_get_session__pool_options__configures_adapter(self):
+        session = get_session(pool_connections=2, pool_maxsize=7, pool_block=False)
+        adapter = session.get_adapter("https://pokeapi.co/api/v2/pokemon/")
+
+        self.assertEqual(adapter._pool_connections, 2)
+        self.assertEqual(adapter._pool_maxsize, 7)
+        self.assertEqual(adapter._pool_block, False)
+        self.assertIn("gzip", session.headers["Accept-Encoding"])
+
+    def test_get_session__process_forked__returns_new_session(self):
+        session_1 = get_session()
+
+        with patch("core.integrations.sessions.os.getpid", return_value=-1):
+            session_2 = get_session()
+
+        self.assertIsNot(session_1, session_2)
+
+    def test_get_pool_stats__pool_used__returns_host_stats(self):
+        session = get_session(pool_maxsize=3)
+        session.get_adapter("https://pokeapi.co/").poolmanager.connection_from_url(
+            "https://pokeapi.co/"
+        )
+
+        stats = get_pool_stats()
+
+        self.assertEqual(len(stats), 1)
+        self.assertEqual(stats[0]["host"], "pokeapi.co")
+        self.assertEqual(stats[0]["maxsize"], 3)
+        self.assertEqual(stats[0]["idle_connections"], 0)
@@ -1,12 +1,33 @@
-from unittest.mock import Mock, patch
+import io
+import json
+from unittest.mock import DEFAULT, Mock, patch
 
+from celery import chord, group
+from celery.exceptions import Retry
+from django.conf import settings
+from django.db import DatabaseError, OperationalError
 from django.test import TestCase, override_settings
 from pokemons.models import Ability, Pokemon, Type
 
-from core.integrations.tasks import load_entity_task, save_entity_task
+from core.integrations.loaders import LoaderException, RateLimited
+from core.integrations.tasks import (
+    load_entities_task,
+    load_entity_task,
+    load_page_task,
+    process_entities_task,
+    process_entity_task,
+    record_task_failure,
+    save_entity_task,
+    save_page_task,
+    save_transformed_task,
+    save_with_validators,
+    transform,
+)
+from core.integrations.tracking import set_entity_count, start_run
+from core.models import ResponseValidator, SyncRun
 
 
-@patch("core.integrations.loaders.requests.get")
+@patch("core.integrations.sessions.requests.Session.get")
 @override_settings(CELERY_TASK_ALWAYS_EAGER=True)
 class LoadEntityTaskSaveEntityTaskChainTest(TestCase):
     def setUp(self):
@@ -55,7 +76,9 @@ class LoadEntityTaskSaveEntityTaskChainTest(TestCase):
 
     def test_chain__creates_pokemon_types_and_abilities(self, mocked_get):
         mocked_get.return_value = Mock(
-            status_code=200, json=Mock(return_value=self.data)
+            status_code=200,
+            headers={},
+            raw=io.BytesIO(json.dumps(self.data).encode()),
         )
         source = "pokemon"
         url = "https://pokeapi.co/api/v2/pokemon/42/"
@@ -67,3 +90,535 @@ class LoadEntityTaskSaveEntityTaskChainTest(TestCase):
         self.assertEqual(Pokemon.objects.count(), 1)
         self.assertEqual(Ability.objects.count(), 1)
         self.assertEqual(Type.objects.count(), 2)
+
+    def test_chain__run_id__records_stages_and_finishes_run(self, mocked_get):
+        content = json.dumps(self.data).encode()
+        mocked_get.return_value = Mock(
+            status_code=200, headers={}, raw=io.BytesIO(content)
+        )
+        source = "pokemon"
+        url = "https://pokeapi.co/api/v2/pokemon/42/"
+        run = start_run(source)
+        set_entity_count(run.pk, 1)
+
+        chain = load_entity_task.si(url, source, run_id=run.pk) | save_entity_task.s(
+            source, run_id=run.pk
+        )
+
+        chain.delay()
+
+        run.refresh_from_db()
+        self.assertEqual(run.status, SyncRun.Status.FINISHED)
+        self.assertEqual(run.processed, 1)
+        load_stage = run.stages.get(name="load_entity")
+        self.assertEqual(load_stage.tasks, 1)
+        self.assertEqual(load_stage.bytes_downloaded, len(content))
+        save_stage = run.stages.get(name="save_entity")
+        self.assertEqual(save_stage.items, 1)
+        self.assertGreater(save_stage.queries, 0)
+
+    def test_load_entity_task__returns_only_projected_data(self, mocked_get):
+        mocked_get.return_value = Mock(
+            status_code=200,
+            headers={},
+            raw=io.BytesIO(json.dumps(self.data).encode()),
+        )
+
+        result = load_entity_task.delay(
+            "https://pokeapi.co/api/v2/pokemon/42/", "pokemon"
+        ).get()
+
+        self.assertEqual(
+            result["data"]["sprites"],
+            {"front_default": self.data["sprites"]["front_default"]},
+        )
+        self.assertEqual(result["data"]["types"], self.data["types"])
+
+    def test_chain__validators__stores_them_with_saved_pokemon(self, mocked_get):
+        mocked_get.return_value = Mock(
+            status_code=200,
+            headers={"ETag": '"abc"'},
+            raw=io.BytesIO(json.dumps(self.data).encode()),
+        )
+        source = "pokemon"
+        url = "https://pokeapi.co/api/v2/pokemon/42/"
+
+        chain = load_entity_task.si(url, source) | save_entity_task.s(source)
+        chain.delay()
+
+        validator = ResponseValidator.objects.get(url=url)
+        self.assertEqual(validator.etag, '"abc"')
+        self.assertEqual(validator.model, "pokemons.Pokemon")
+        self.assertEqual(validator.object_id, 42)
+
+    def test_chain__save_fails__does_not_store_validators(self, mocked_get):
+        mocked_get.return_value = Mock(
+            status_code=200,
+            headers={"ETag": '"abc"'},
+            raw=io.BytesIO(json.dumps(self.data).encode()),
+        )
+        source = "pokemon"
+        url = "https://pokeapi.co/api/v2/pokemon/42/"
+
+        chain = load_entity_task.si(url, source) | save_entity_task.s(source)
+        with patch(
+            "pokemons.integrations.updaters.PokemonUpdater.handle_many_to_many_fields",
+            side_effect=DatabaseError,
+        ):
+            result = chain.delay()
+
+        self.assertTrue(result.failed())
+
+        self.assertFalse(Pokemon.objects.exists())
+        self.assertFalse(ResponseValidator.objects.exists())
+
+    def test_chain__not_modified__skips_saving(self, mocked_get):
+        mocked_get.return_value = Mock(status_code=304, headers={})
+        source = "pokemon"
+        url = "https://pokeapi.co/api/v2/pokemon/42/"
+
+        chain = load_entity_task.si(url, source) | save_entity_task.s(source)
+
+        chain.delay()
+
+        self.assertEqual(Pokemon.objects.count(), 0)
+
+
+@override_settings(CELERY_TASK_ALWAYS_EAGER=True)
+@patch("core.integrations.loaders.DefaultEntityLoader.load")
+class ProcessEntityTaskTest(TestCase):
+    def setUp(self):
+        self.url = "https://pokeapi.co/api/v2/ability/1/"
+        self.data = {"id": 1, "name": "stench", "is_main_series": True}
+
+    def test_chain__passes_transformed_data_and_saves(self, mocked_load):
+        mocked_load.return_value = {**self.data, "effect_entries": [{}] * 10}
+
+        result = process_entity_task.delay(self.url, "ability").get()
+        save_transformed_task.delay(result, "ability")
+
+        self.assertEqual(result["data"], self.data)
+        self.assertTrue(Ability.objects.filter(id=1, name="stench").exists())
+
+    def test_process_entity_task__save__saves_and_returns_none(self, mocked_load):
+        mocked_load.return_value = self.data
+
+        result = process_entity_task.delay(self.url, "ability", save=True).get()
+
+        self.assertIsNone(result)
+        self.assertEqual(Ability.objects.count(), 1)
+
+    def test_process_entity_task__not_modified__returns_no_data(self, mocked_load):
+        mocked_load.return_value = None
+
+        result = process_entity_task.delay(self.url, "ability").get()
+        save_transformed_task.delay(result, "ability")
+
+        self.assertIsNone(result["data"])
+        self.assertEqual(Ability.objects.count(), 0)
+
+    @patch("core.integrations.loaders.AsyncBatchEntityLoader.load")
+    def test_process_entities_task__save__saves_modified_entities(
+        self, mocked_batch_load, mocked_load
+    ):
+        mocked_batch_load.return_value = [self.data, None]
+        data_sources = {
+            **settings.DATA_SOURCES,
+            "ability": {
+                **settings.DATA_SOURCES["ability"],
+                "entity_loader": {
+                    "class": "core.integrations.loaders.AsyncBatchEntityLoader",
+                },
+            },
+        }
+
+        urls = [self.url, "https://pokeapi.co/api/v2/ability/2/"]
+        with self.settings(DATA_SOURCES=data_sources):
+            process_entities_task.delay(urls, "ability", save=True)
+
+        self.assertEqual(Ability.objects.count(), 1)
+
+
+@override_settings(CELERY_TASK_ALWAYS_EAGER=True)
+class LoadEntitiesTaskSavePageTaskChainTest(TestCase):
+    @patch("core.integrations.loaders.AsyncBatchEntityLoader.load")
+    def test_chain__creates_abilities(self, mocked_load):
+        mocked_load.return_value = [
+            {"id": 1, "name": "stench", "is_main_series": True},
+            {"id": 2, "name": "drizzle", "is_main_series": True},
+        ]
+        source = "ability"
+        urls = [
+            "https://pokeapi.co/api/v2/ability/1/",
+            "https://pokeapi.co/api/v2/ability/2/",
+        ]
+
+        data_sources = {
+            **settings.DATA_SOURCES,
+            source: {
+                **settings.DATA_SOURCES[source],
+                "entity_loader": {
+                    "class": "core.integrations.loaders.AsyncBatchEntityLoader",
+                },
+            },
+        }
+        with self.settings(DATA_SOURCES=data_sources):
+            chain = load_entities_task.si(urls, source) | save_page_task.s(source)
+            chain.delay()
+
+        self.assertEqual(Ability.objects.count(), 2)
+        self.assertEqual(Ability.objects.get(id=2).name, "drizzle")
+
+
+@override_settings(CELERY_TASK_ALWAYS_EAGER=True)
+@patch("core.integrations.loaders.DefaultPageLoader.load")
+class LoadPageTaskTest(TestCase):
+    def setUp(self):
+        self.entity_urls = [
+            "https://pokeapi.co/api/v2/ability/1/",
+            "https://pokeapi.co/api/v2/ability/2/",
+        ]
+
+    def get_data_sources(self, pipeline: str) -> dict:
+        return {
+            **settings.DATA_SOURCES,
+            "ability": {**settings.DATA_SOURCES["ability"], "pipeline": pipeline},
+        }
+
+    def test_load_page_task__bulk_updater__saves_page_with_chord(
+        self, mocked_page_load
+    ):
+        mocked_page_load.return_value = (self.entity_urls, None)
+
+        with (
+            self.settings(DATA_SOURCES=self.get_data_sources("chain")),
+            patch.object(load_page_task, "replace") as mocked_replace,
+        ):
+            load_page_task.delay("ability")
+
+        [canvas], _ = mocked_replace.call_args
+        self.assertIsInstance(canvas, chord)
+        self.assertEqual(len(canvas.tasks), 2)
+        self.assertEqual(canvas.body.task, save_page_task.name)
+
+    def test_load_page_task__fused_pipeline__saves_transformed_page_with_chord(
+        self, mocked_page_load
+    ):
+        mocked_page_load.return_value = (self.entity_urls, None)
+
+        with (
+            self.settings(DATA_SOURCES=self.get_data_sources("fused")),
+            patch.object(load_page_task, "replace") as mocked_replace,
+        ):
+            load_page_task.delay("ability")
+
+        [canvas], _ = mocked_replace.call_args
+        self.assertIsInstance(canvas, chord)
+        self.assertEqual(canvas.tasks[0].task, process_entity_task.name)
+        self.assertEqual(canvas.body.task, save_transformed_task.name)
+
+    def test_load_page_task__inline_pipeline__saves_in_entity_tasks(
+        self, mocked_page_load
+    ):
+        mocked_page_load.return_value = (self.entity_urls, None)
+
+        with (
+            self.settings(DATA_SOURCES=self.get_data_sources("inline")),
+            patch.object(load_page_task, "replace") as mocked_replace,
+        ):
+            load_page_task.delay("ability")
+
+        [canvas], _ = mocked_replace.call_args
+        self.assertIsInstance(canvas, group)
+        self.assertEqual([task.kwargs["save"] for task in canvas.tasks], [True, True])
+
+    def test_load_page_task__next_url__schedules_next_page(self, mocked_page_load):
+        next_url = "https://pokeapi.co/api/v2/ability/?offset=2&limit=2"
+        mocked_page_load.return_value = (self.entity_urls, next_url)
+
+        with patch.object(load_page_task, "replace") as mocked_replace:
+            load_page_task.delay("ability")
+
+        [canvas], _ = mocked_replace.call_args
+        self.assertIsInstance(canvas, group)
+        self.assertEqual(canvas.tasks[1].task, load_page_task.name)
+        self.assertEqual(canvas.tasks[1].args, ("ability", next_url))
+
+    @patch("core.integrations.loaders.DefaultPageLoader.get_page_urls")
+    def test_load_page_task__eager_loader__schedules_all_pages(
+        self, mocked_get_page_urls, mocked_page_load
+    ):
+        page_urls = [
+            "https://pokeapi.co/api/v2/ability/?offset=2&limit=2",
+            "https://pokeapi.co/api/v2/ability/?offset=4&limit=2",
+        ]
+        mocked_page_load.return_value = (self.entity_urls, page_urls[0])
+        mocked_get_page_urls.return_value = page_urls
+
+        with patch.object(load_page_task, "replace") as mocked_replace:
+            load_page_task.delay("ability")
+
+        [canvas], _ = mocked_replace.call_args
+        page_tasks = canvas.tasks[1:]
+        self.assertEqual(
+            [task.args for task in page_tasks], [("ability", url) for url in page_urls]
+        )
+        self.assertTrue(all(task.kwargs["follow_next"] is False for task in page_tasks))
+
+    def test_load_page_task__run_id__records_page_and_passes_run_id(
+        self, mocked_page_load
+    ):
+        mocked_page_load.return_value = (self.entity_urls, None)
+        run = start_run("ability")
+
+        with (
+            self.settings(DATA_SOURCES=self.get_data_sources("inline")),
+            patch.object(load_page_task, "replace") as mocked_replace,
+        ):
+            load_page_task.delay("ability", run_id=run.pk)
+
+        [canvas], _ = mocked_replace.call_args
+        self.assertEqual(
+            [task.kwargs["run_id"] for task in canvas.tasks], [run.pk, run.pk]
+        )
+        page_stage = run.stages.get(name="load_page")
+        self.assertEqual((page_stage.tasks, page_stage.items), (1, 2))
+
+    def test_load_page_task__not_following_next__schedules_only_entities(
+        self, mocked_page_load
+    ):
+        next_url = "https://pokeapi.co/api/v2/ability/?offset=4&limit=2"
+        mocked_page_load.return_value = (self.entity_urls, next_url)
+
+        with patch.object(load_page_task, "replace") as mocked_replace:
+            load_page_task.delay("ability", next_url, follow_next=False)
+
+        [canvas], _ = mocked_replace.call_args
+        self.assertIsInstance(canvas, chord)
+
+
+@patch("core.integrations.loaders.DefaultEntityLoader.load")
+class RetryWhenRateLimitedTest(TestCase):
+    def test_load_entity_task__rate_limited__retries_after_delay(self, mocked_load):
+        mocked_load.side_effect = RateLimited(retry_after=10)
+
+        with patch.object(
+            load_entity_task, "retry", side_effect=Retry()
+        ) as mocked_retry:
+            with self.assertRaises(Retry):
+                load_entity_task("https://pokeapi.co/api/v2/ability/1/", "ability")
+
+        _, kwargs = mocked_retry.call_args
+        self.assertGreaterEqual(kwargs["countdown"], 10)
+        self.assertLessEqual(kwargs["countdown"], 15)
+
+
+@override_settings(CELERY_TASK_ALWAYS_EAGER=True)
+@patch("core.integrations.loaders.DefaultEntityLoader.load")
+class FailedEntityTest(TestCase):
+    def setUp(self):
+        self.urls = [
+            "https://pokeapi.co/api/v2/ability/1/",
+            "https://pokeapi.co/api/v2/ability/2/",
+        ]
+        self.data = {"id": 1, "name": "stench", "is_main_series": True}
+
+    def test_load_entity_task__last_retry_failed__returns_failed_result(
+        self, mocked_load
+    ):
+        mocked_load.side_effect = LoaderException("Not found")
+
+        result = load_entity_task.apply(args=(self.urls[0], "ability"), retries=5)
+
+        self.assertEqual(result.result["url"], self.urls[0])
+        self.assertEqual(result.result["error"], "LoaderException: Not found")
+        self.assertEqual(result.result["stage"], "load_entity")
+
+    def test_load_entity_task__retries_left__retries(self, mocked_load):
+        mocked_load.side_effect = LoaderException("Not found")
+
+        with patch.object(load_entity_task, "retry", side_effect=Retry()):
+            with self.assertRaises(Retry):
+                load_entity_task(self.urls[0], "ability")
+
+    def test_chord__entity_failed__saves_others_and_finishes_run(self, mocked_load):
+        mocked_load.side_effect = [self.data, ValueError("Invalid data")]
+        run = start_run("ability")
+        set_entity_count(run.pk, 2)
+
+        chord(
+            (load_entity_task.si(url, "ability", run_id=run.pk) for url in self.urls),
+            save_page_task.s("ability", run_id=run.pk),
+        ).delay()
+
+        self.assertTrue(Ability.objects.filter(id=1).exists())
+        run.refresh_from_db()
+        self.assertEqual(run.status, SyncRun.Status.FINISHED)
+        self.assertEqual((run.processed, run.failures), (2, 1))
+        self.assertEqual(run.stages.get(name="load_entity").failures, 1)
+
+    def test_chord__fused_entity_failed__saves_others(self, mocked_load):
+        mocked_load.side_effect = [ValueError("Invalid data"), self.data]
+        run = start_run("ability")
+        set_entity_count(run.pk, 2)
+
+        chord(
+            (
+                process_entity_task.si(url, "ability", run_id=run.pk)
+                for url in self.urls
+            ),
+            save_transformed_task.s("ability", run_id=run.pk),
+        ).delay()
+
+        self.assertTrue(Ability.objects.filter(id=1).exists())
+        run.refresh_from_db()
+        self.assertEqual(run.status, SyncRun.Status.FINISHED)
+        self.assertEqual(run.stages.get(name="process_entity").failures, 1)
+
+
+@override_settings(CELERY_TASK_ALWAYS_EAGER=True)
+@patch("core.integrations.loaders.AsyncBatchEntityLoader.load", autospec=True)
+class FailedBatchEntityTest(TestCase):
+    def setUp(self):
+        self.urls = [
+            "https://pokeapi.co/api/v2/ability/1/",
+            "https://pokeapi.co/api/v2/ability/404/",
+            "https://pokeapi.co/api/v2/ability/3/",
+        ]
+        self.errors = {self.urls[1]: LoaderException("Unexpected status code 404")}
+        self.run = start_run("ability")
+        set_entity_count(self.run.pk, 3)
+        data_sources = {
+            **settings.DATA_SOURCES,
+            "ability": {
+                **settings.DATA_SOURCES["ability"],
+                "entity_loader": {
+                    "class": "core.integrations.loaders.AsyncBatchEntityLoader",
+                },
+            },
+        }
+        self.enterContext(self.settings(DATA_SOURCES=data_sources))
+
+    def load(self, loader):
+        entities_data = []
+        for url in loader.urls:
+            if url in self.errors:
+                loader.errors[url] = self.errors[url]
+                entities_data.append(None)
+            else:
+                pk = int(url.rstrip("/").rsplit("/", 1)[1])
+                entities_data.append(
+                    {"id": pk, "name": f"ability-{pk}", "is_main_series": True}
+                )
+        return entities_data
+
+    def test_load_entities_task__retries_left__retries_only_failed_urls(
+        self, mocked_load
+    ):
+        def load_once_failing(loader):
+            entities_data = self.load(loader)
+            self.errors.clear()
+            return entities_data
+
+        mocked_load.side_effect = load_once_failing
+
+        chain = load_entities_task.si(self.urls, "ability") | save_page_task.s(
+            "ability"
+        )
+        chain.delay()
+
+        [first_call, second_call] = mocked_load.call_args_list
+        self.assertEqual(first_call.args[0].urls, self.urls)
+        self.assertEqual(second_call.args[0].urls, [self.urls[1]])
+        self.assertEqual(Ability.objects.count(), 3)
+
+    def test_chain__url_not_found__saves_others_and_finishes_run(self, mocked_load):
+        mocked_load.side_effect = self.load
+
+        chain = load_entities_task.si(
+            self.urls, "ability", run_id=self.run.pk
+        ) | save_page_task.s("ability", run_id=self.run.pk)
+        chain.delay()
+
+        self.assertEqual(mocked_load.call_count, 6)  # the first attempt and 5 retries
+        self.assertEqual(set(Ability.objects.values_list("id", flat=True)), {1, 3})
+        self.run.refresh_from_db()
+        self.assertEqual(self.run.status, SyncRun.Status.FINISHED)
+        self.assertEqual((self.run.processed, self.run.failures), (3, 1))
+        self.assertEqual(self.run.stages.get(name="load_entity").failures, 1)
+
+    def test_process_entities_task__transform_failed__saves_others(self, mocked_load):
+        self.errors.clear()
+        mocked_load.side_effect = self.load
+
+        with patch(
+            "core.integrations.tasks.transform",
+            wraps=transform,
+            side_effect=[DEFAULT, ValueError("Invalid data"), DEFAULT],
+        ):
+            process_entities_task.delay(
+                self.urls, "ability", save=True, run_id=self.run.pk
+            )
+
+        self.assertEqual(mocked_load.call_count, 1)
+        self.assertEqual(set(Ability.objects.values_list("id", flat=True)), {1, 3})
+        self.run.refresh_from_db()
+        self.assertEqual(self.run.status, SyncRun.Status.FINISHED)
+        self.assertEqual((self.run.processed, self.run.failures), (3, 1))
+        self.assertEqual(self.run.stages.get(name="process_entity").failures, 1)
+
+
+@override_settings(CELERY_TASK_ALWAYS_EAGER=True)
+class SaveTaskRetryTest(TestCase):
+    def test_save_page_task__deadlock__retries(self):
+        results = [
+            {
+                "url": "https://pokeapi.co/api/v2/ability/1/",
+                "data": {"id": 1, "name": "stench", "is_main_series": True},
+                "validators": None,
+            }
+        ]
+
+        with patch(
+            "core.integrations.tasks.save_with_validators",
+            wraps=save_with_validators,
+            side_effect=[OperationalError("deadlock detected"), DEFAULT],
+        ) as mocked_save:
+            save_page_task.delay(results, "ability")
+
+        self.assertEqual(mocked_save.call_count, 2)
+        self.assertTrue(Ability.objects.filter(id=1).exists())
+
+
+class RecordTaskFailureTest(TestCase):
+    def setUp(self):
+        self.run = start_run("ability")
+        set_entity_count(self.run.pk, 3)
+
+    def test_record_task_failure__entities_failed__counts_them_as_processed(self):
+        urls = ["https://pokeapi.co/api/v2/ability/1/"] * 2
+
+        record_task_failure(
+            sender=load_entities_task,
+            args=(urls, "ability"),
+            kwargs={"run_id": self.run.pk},
+        )
+
+        self.run.refresh_from_db()
+        self.assertEqual((self.run.failures, self.run.processed), (2, 2))
+        self.assertEqual(self.run.stages.get(name="load_entity").failures, 2)
+
+    def test_record_task_failure__page_failed__fails_run(self):
+        record_task_failure(
+            sender=load_page_task, args=("ability",), kwargs={"run_id": self.run.pk}
+        )
+
+        self.run.refresh_from_db()
+        self.assertEqual(self.run.status, SyncRun.Status.FAILED)
+        self.assertIsNotNone(self.run.finished_at)
+
+    def test_record_task_failure__without_run__does_nothing(self):
+        record_task_failure(sender=load_page_task, args=("ability",), kwargs={})
+
+        self.run.refresh_from_db()
+        self.assertEqual(self.run.status, SyncRun.Status.RUNNING)
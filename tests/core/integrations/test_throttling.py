@@ -0,0 +1,101 @@
+import asyncio
+import threading
+from unittest import TestCase
+from unittest.mock import AsyncMock, Mock, patch
+
+import redis
+
+from core.integrations.loaders import RateLimited
+from core.integrations.throttling import RateLimiter
+
+
+class RateLimiterTest(TestCase):
+    def setUp(self):
+        self.rate_limiter = RateLimiter(
+            "pokemon", rate=5, max_wait=1, redis_url="redis://localhost:6379/3"
+        )
+        self.rate_limiter.acquire_script = Mock(return_value=b"0")
+        self.rate_limiter.feedback_script = Mock(return_value=b"5.2")
+
+    def test_acquire__token_available__does_not_wait(self):
+        with patch("core.integrations.throttling.time.sleep") as mocked_sleep:
+            self.rate_limiter.acquire()
+
+        mocked_sleep.assert_not_called()
+        self.rate_limiter.acquire_script.assert_called_once_with(
+            keys=["ratelimit:pokemon:bucket", "ratelimit:pokemon:state"],
+            args=[5, 5, 3600],
+        )
+
+    def test_acquire__bucket_empty__waits_for_token(self):
+        self.rate_limiter.acquire_script.side_effect = [b"0.2", b"0"]
+
+        with patch("core.integrations.throttling.time.sleep") as mocked_sleep:
+            self.rate_limiter.acquire()
+
+        mocked_sleep.assert_called_once_with(0.2)
+
+    def test_acquire__wait_longer_than_max_wait__raise_rate_limited(self):
+        self.rate_limiter.acquire_script.return_value = b"30"
+
+        with self.assertRaises(RateLimited) as cm:
+            self.rate_limiter.acquire()
+
+        self.assertEqual(cm.exception.retry_after, 30)
+
+    def test_acquire__redis_unavailable__does_not_limit(self):
+        self.rate_limiter.acquire_script.side_effect = redis.ConnectionError()
+
+        self.rate_limiter.acquire()
+
+    def test_acquire_async__calls_redis_outside_event_loop(self):
+        threads = []
+        self.rate_limiter.acquire_script.side_effect = lambda **kwargs: (
+            threads.append(threading.get_ident()) or b"0"
+        )
+
+        asyncio.run(self.rate_limiter.acquire_async())
+
+        self.assertEqual(len(threads), 1)
+        self.assertNotEqual(threads[0], threading.get_ident())
+
+    def test_acquire_async__bucket_empty__waits_for_token(self):
+        self.rate_limiter.acquire_script.side_effect = [b"0.2", b"0"]
+
+        with patch(
+            "core.integrations.throttling.asyncio.sleep", new_callable=AsyncMock
+        ) as mocked_sleep:
+            asyncio.run(self.rate_limiter.acquire_async())
+
+        mocked_sleep.assert_awaited_once_with(0.2)
+
+    def test_record_async__calls_redis_outside_event_loop(self):
+        threads = []
+        self.rate_limiter.feedback_script.side_effect = lambda **kwargs: (
+            threads.append(threading.get_ident()) or b"5.2"
+        )
+
+        rate = asyncio.run(self.rate_limiter.record_async(200, 0.1))
+
+        self.assertEqual(rate, 5.2)
+        self.assertNotEqual(threads[0], threading.get_ident())
+
+    def test_record__healthy_response__increases_rate(self):
+        rate = self.rate_limiter.record(200, 0.1)
+
+        self.assertEqual(rate, 5.2)
+        _, kwargs = self.rate_limiter.feedback_script.call_args
+        self.assertEqual(kwargs["keys"], ["ratelimit:pokemon:state"])
+        self.assertEqual(kwargs["args"][6:8], [0, 0])
+
+    def test_record__too_many_requests__decreases_rate_and_pauses(self):
+        self.rate_limiter.record(429, 0.1, retry_after=3)
+
+        _, kwargs = self.rate_limiter.feedback_script.call_args
+        self.assertEqual(kwargs["args"][6:8], [1, 3])
+
+    def test_is_congested(self):
+        self.assertTrue(self.rate_limiter.is_congested(None, 0.1))
+        self.assertTrue(self.rate_limiter.is_congested(503, 0.1))
+        self.assertTrue(self.rate_limiter.is_congested(200, 5))
+        self.assertFalse(self.rate_limiter.is_congested(304, 0.1))
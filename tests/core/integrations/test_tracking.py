@@ -0,0 +1,78 @@
+from django.test import TestCase
+
+from core.integrations.tracking import (
+    LOAD_ENTITY,
+    SAVE_ENTITY,
+    STAGES,
+    record_failure,
+    set_entity_count,
+    start_run,
+    track_stage,
+)
+from core.models import ResponseValidator, SyncRun, SyncStage
+
+
+class TrackStageTest(TestCase):
+    def setUp(self):
+        self.run = start_run("pokemon")
+
+    def test_start_run__creates_all_stages(self):
+        self.assertEqual(
+            list(self.run.stages.values_list("name", flat=True)), list(STAGES)
+        )
+
+    def test_track_stage__records_task_statistics(self):
+        with track_stage(self.run.pk, LOAD_ENTITY) as stats:
+            ResponseValidator.objects.count()
+            stats.items = 1
+            stats.bytes_downloaded = 512
+
+        stage = self.run.stages.get(name=LOAD_ENTITY)
+        self.assertEqual(stage.tasks, 1)
+        self.assertEqual(stage.items, 1)
+        self.assertEqual(stage.bytes_downloaded, 512)
+        self.assertEqual(stage.queries, 1)
+        self.assertEqual(stage.seconds_max, stats.seconds)
+        self.assertEqual(stage.histogram["under_100ms"], 1)
+
+    def test_track_stage__block_raises__records_nothing(self):
+        with self.assertRaises(ValueError):
+            with track_stage(self.run.pk, LOAD_ENTITY):
+                raise ValueError
+
+        self.assertEqual(self.run.stages.get(name=LOAD_ENTITY).tasks, 0)
+
+    def test_track_stage__all_entities_processed__finishes_run(self):
+        set_entity_count(self.run.pk, 2)
+
+        for _ in range(2):
+            with track_stage(self.run.pk, SAVE_ENTITY) as stats:
+                stats.items = stats.processed = 1
+
+        self.run.refresh_from_db()
+        self.assertEqual(self.run.status, SyncRun.Status.FINISHED)
+        self.assertEqual(self.run.processed, 2)
+        self.assertIsNotNone(self.run.finished_at)
+        self.assertIsNotNone(self.run.entities_per_second)
+
+    def test_track_stage__without_run__records_nothing(self):
+        with track_stage(None, LOAD_ENTITY) as stats:
+            stats.items = 1
+
+        self.assertFalse(SyncStage.objects.filter(tasks__gt=0).exists())
+
+    def test_record_failure__last_entity__finishes_run(self):
+        set_entity_count(self.run.pk, 1)
+
+        record_failure(self.run.pk, SAVE_ENTITY, 1)
+
+        self.run.refresh_from_db()
+        self.assertEqual(self.run.status, SyncRun.Status.FINISHED)
+        self.assertEqual(self.run.failures, 1)
+
+
+class SyncStageTest(TestCase):
+    def test_get_bucket(self):
+        self.assertEqual(SyncStage.get_bucket(0.05), "under_100ms")
+        self.assertEqual(SyncStage.get_bucket(0.7), "under_1s")
+        self.assertEqual(SyncStage.get_bucket(60), "over_5s")
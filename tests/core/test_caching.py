@@ -0,0 +1,26 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from core.caching import DATASET_VERSION_KEY, bump_dataset_version, get_dataset_version
+
+
+class DatasetVersionTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_get_dataset_version__called_twice__returns_same_version(self):
+        self.assertEqual(get_dataset_version(), get_dataset_version())
+
+    def test_bump_dataset_version__returns_new_version(self):
+        version = get_dataset_version()
+
+        bumped = bump_dataset_version()
+
+        self.assertNotEqual(bumped, version)
+        self.assertEqual(get_dataset_version(), bumped)
+
+    def test_get_dataset_version__version_evicted__returns_new_version(self):
+        version = get_dataset_version()
+        cache.delete(DATASET_VERSION_KEY)
+
+        self.assertNotEqual(get_dataset_version(), version)
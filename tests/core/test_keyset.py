@@ -0,0 +1,83 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase
+from pokemons.models import Type
+
+from core.keyset import (
+    Cursor,
+    InvalidCursor,
+    decode_cursor,
+    encode_cursor,
+    get_ordering,
+    get_page,
+)
+from tests.factories.pokemons import TypeFactory
+
+
+class GetOrderingTest(TestCase):
+    def test_get_ordering__default_ordering__appends_pk(self):
+        self.assertEqual(get_ordering(Type.objects.all()), ["name", "id"])
+
+    def test_get_ordering__pk_first__stops_at_pk(self):
+        self.assertEqual(get_ordering(Type.objects.order_by("-pk", "name")), ["-id"])
+
+    def test_get_ordering__relation__raise_improperly_configured(self):
+        with self.assertRaises(ImproperlyConfigured):
+            get_ordering(Type.objects.order_by("pokemons__name"))
+
+
+class CursorTest(TestCase):
+    def test_decode_cursor__encoded__returns_cursor(self):
+        cursor = Cursor(("Fire", 3), reverse=True)
+
+        encoded = encode_cursor(["name", "id"], cursor)
+
+        self.assertEqual(decode_cursor(["name", "id"], encoded), cursor)
+
+    def test_decode_cursor__other_ordering__raise_invalid_cursor(self):
+        encoded = encode_cursor(["name", "id"], Cursor(("Fire", 3)))
+
+        with self.assertRaises(InvalidCursor):
+            decode_cursor(["-name", "id"], encoded)
+
+    def test_decode_cursor__malformed__raise_invalid_cursor(self):
+        for encoded in ("not-base64!", "bm90IGpzb24", "WzEsMl0"):
+            with self.subTest(encoded), self.assertRaises(InvalidCursor):
+                decode_cursor(["name", "id"], encoded)
+
+
+class GetPageTest(TestCase):
+    def setUp(self):
+        names = ["Fire", "Water", "Fire", "Grass", "Fire", "Bug", "Water"]
+        self.types = [TypeFactory(name=name) for name in names]
+        self.ordering = ["name", "id"]
+        self.expected = sorted(self.types, key=lambda t: (t.name, t.id))
+
+    def test_get_page__next_cursors__return_all_rows_once(self):
+        rows, cursor = [], None
+        while True:
+            page, cursor, _ = get_page(Type.objects.all(), self.ordering, cursor, 2)
+            rows += page
+            if cursor is None:
+                break
+
+        self.assertEqual(rows, self.expected)
+
+    def test_get_page__previous_cursor__returns_previous_page(self):
+        first, cursor, _ = get_page(Type.objects.all(), self.ordering, None, 3)
+        second, _, previous = get_page(Type.objects.all(), self.ordering, cursor, 3)
+
+        page, next_cursor, previous_cursor = get_page(
+            Type.objects.all(), self.ordering, previous, 3
+        )
+
+        self.assertEqual(page, first)
+        self.assertIsNone(previous_cursor)
+        self.assertEqual(next_cursor, cursor)
+
+    def test_get_page__descending__returns_rows_in_order(self):
+        ordering = ["-name", "-id"]
+        first, cursor, _ = get_page(Type.objects.all(), ordering, None, 4)
+        second, next_cursor, _ = get_page(Type.objects.all(), ordering, cursor, 4)
+
+        self.assertEqual(first + second, self.expected[::-1])
+        self.assertIsNone(next_cursor)
@@ -0,0 +1,50 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+from pokemons.models import Pokemon
+
+from tests.factories.pokemons import PokemonFactory
+
+
+class TrigramIContainsTest(TestCase):
+    def setUp(self):
+        self.pikachu = PokemonFactory(name="Pikachu")
+        self.percent = PokemonFactory(name="100%_sure")
+        PokemonFactory(name="Charmander")
+
+    def test_filter__matches_case_insensitively(self):
+        pokemons = Pokemon.objects.filter(name__trigram_icontains="KACH")
+
+        self.assertEqual(list(pokemons), [self.pikachu])
+
+    def test_filter__wildcards__matched_literally(self):
+        self.assertEqual(
+            list(Pokemon.objects.filter(name__trigram_icontains="%_")), [self.percent]
+        )
+        self.assertEqual(
+            list(Pokemon.objects.filter(name__trigram_icontains="_")), [self.percent]
+        )
+
+    @skipUnless(connection.vendor == "postgresql", "ILIKE is used only on PostgreSQL")
+    def test_filter__postgresql__compiles_to_ilike(self):
+        sql = str(Pokemon.objects.filter(name__trigram_icontains="char").query)
+
+        self.assertIn('"name" ILIKE', sql)
+        self.assertNotIn("UPPER", sql)
+
+
+class TrigramIStartsWithTest(TestCase):
+    def setUp(self):
+        self.pikachu = PokemonFactory(name="Pikachu")
+        PokemonFactory(name="Raichu")
+
+    def test_filter__matches_prefix_case_insensitively(self):
+        pokemons = Pokemon.objects.filter(name__trigram_istartswith="PIK")
+
+        self.assertEqual(list(pokemons), [self.pikachu])
+
+    def test_filter__infix__not_matched(self):
+        pokemons = Pokemon.objects.filter(name__trigram_istartswith="chu")
+
+        self.assertEqual(list(pokemons), [])
@@ -0,0 +1,87 @@
+from unittest.mock import Mock, patch
+
+import redis
+from django.test import TestCase
+from django.urls import reverse
+from prometheus_client import REGISTRY
+
+from core.integrations.tasks import (
+    load_page_task,
+    observe_task_duration,
+    start_task_timer,
+)
+from core.metrics import QueueDepthCollector, record_cache_lookup
+
+
+def get_sample_value(name: str, labels: dict[str, str]) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class MetricsMiddlewareTest(TestCase):
+    def test_request__observes_duration_and_queries_by_url_name(self):
+        labels = {"view": "pokemons_api:type-list"}
+        count_before = get_sample_value(
+            "http_request_duration_seconds_count",
+            {**labels, "method": "GET", "status": "200"},
+        )
+        queries_before = get_sample_value("http_request_db_queries_sum", labels)
+
+        self.client.get(reverse("pokemons_api:type-list"))
+
+        self.assertEqual(
+            get_sample_value(
+                "http_request_duration_seconds_count",
+                {**labels, "method": "GET", "status": "200"},
+            ),
+            count_before + 1,
+        )
+        self.assertGreater(
+            get_sample_value("http_request_db_queries_sum", labels), queries_before
+        )
+
+    def test_request__not_found__labelled_unresolved(self):
+        labels = {"view": "<unresolved>", "method": "GET", "status": "404"}
+        before = get_sample_value("http_request_duration_seconds_count", labels)
+
+        self.client.get("/does-not-exist/")
+
+        self.assertEqual(
+            get_sample_value("http_request_duration_seconds_count", labels),
+            before + 1,
+        )
+
+
+@patch("core.integrations.throttling.get_redis")
+class MetricsViewTest(TestCase):
+    def test_get__returns_metrics_with_queue_lengths(self, mocked_get_redis):
+        mocked_get_redis.return_value = Mock(llen=Mock(return_value=7))
+        record_cache_lookup("response", hit=True)
+
+        response = self.client.get(reverse("metrics"))
+
+        self.assertEqual(response.status_code, 200)
+        content = response.content.decode()
+        self.assertIn('celery_queue_length{queue="celery"} 7.0', content)
+        self.assertIn('cache_requests_total{cache="response",result="hit"}', content)
+
+    def test_collect__redis_unavailable__skips_queue(self, mocked_get_redis):
+        mocked_get_redis.return_value = Mock(
+            llen=Mock(side_effect=redis.ConnectionError)
+        )
+
+        [gauge] = QueueDepthCollector("redis://localhost:6379/1", ["celery"]).collect()
+
+        self.assertEqual(gauge.samples, [])
+
+
+class TaskDurationTest(TestCase):
+    def test_observe_task_duration__observes_by_task_and_state(self):
+        labels = {"task": load_page_task.name, "state": "success"}
+        before = get_sample_value("celery_task_duration_seconds_count", labels)
+
+        start_task_timer(task_id="42")
+        observe_task_duration(task_id="42", task=load_page_task, state="SUCCESS")
+
+        self.assertEqual(
+            get_sample_value("celery_task_duration_seconds_count", labels), before + 1
+        )
@@ -0,0 +1,110 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from pokemons.models import Pokemon, Type
+
+from core import prefix_index
+from core.caching import bump_dataset_version
+from core.prefix_index import (
+    PrefixIndex,
+    clear_prefix_indexes,
+    get_prefix_index,
+    warm_prefix_indexes,
+)
+from tests.factories.pokemons import PokemonFactory, TypeFactory
+
+
+class PrefixIndexTest(SimpleTestCase):
+    def setUp(self):
+        self.index = PrefixIndex(
+            [("Pikachu", 1), ("pidgey", 2), ("Raichu", 3), ("Pichu", 4), ("Zubat", 5)]
+        )
+
+    def test_startswith__returns_ids_in_name_order(self):
+        self.assertEqual(self.index.startswith("pi"), [4, 2, 1])
+
+    def test_startswith__case_insensitive(self):
+        self.assertEqual(self.index.startswith("PIK"), [1])
+
+    def test_startswith__limit__returns_first_ids(self):
+        self.assertEqual(self.index.startswith("pi", limit=2), [4, 2])
+
+    def test_startswith__no_match__returns_empty_list(self):
+        self.assertEqual(self.index.startswith("pz"), [])
+        self.assertEqual(self.index.startswith("zz"), [])
+
+    def test_startswith__empty_prefix__returns_all_ids(self):
+        self.assertEqual(self.index.startswith(""), [4, 2, 1, 3, 5])
+
+    def test_startswith__whole_name__returns_its_id(self):
+        self.assertEqual(self.index.startswith("zubat"), [5])
+
+
+class GetPrefixIndexTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        clear_prefix_indexes()
+        self.pikachu = PokemonFactory(name="Pikachu")
+
+    def test_get_prefix_index__built_once_per_dataset_version(self):
+        with self.assertNumQueries(1):
+            get_prefix_index(Pokemon)
+        with self.assertNumQueries(0):
+            index = get_prefix_index(Pokemon)
+
+        self.assertEqual(index.startswith("pika"), [self.pikachu.id])
+
+    @override_settings(PREFIX_INDEX_REBUILD_INTERVAL=0)
+    def test_get_prefix_index__dataset_version_bumped__serves_old_while_rebuilding(
+        self,
+    ):
+        get_prefix_index(Pokemon)
+        pikipek = PokemonFactory(name="Pikipek")
+        bump_dataset_version()
+
+        with mock.patch.object(prefix_index.threading, "Thread") as mocked_thread:
+            with self.assertNumQueries(0):
+                old = get_prefix_index(Pokemon)
+            # A concurrent lookup doesn't start another rebuild
+            get_prefix_index(Pokemon)
+        [(_, kwargs)] = mocked_thread.call_args_list
+        prefix_index.rebuild(*kwargs["args"])
+
+        self.assertEqual(old.startswith("pik"), [self.pikachu.id])
+        index = get_prefix_index(Pokemon)
+        self.assertEqual(index.startswith("pik"), [self.pikachu.id, pikipek.id])
+
+    def test_get_prefix_index__rebuilt_recently__not_rebuilt(self):
+        get_prefix_index(Pokemon)
+        bump_dataset_version()
+
+        with mock.patch.object(prefix_index.threading, "Thread") as mocked_thread:
+            get_prefix_index(Pokemon)
+
+        mocked_thread.assert_not_called()
+
+
+class WarmPrefixIndexesTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        clear_prefix_indexes()
+
+    @override_settings(PREFIX_INDEX_MODELS=["pokemons.Pokemon", "pokemons.Type"])
+    def test_warm_prefix_indexes__builds_indexes_of_models(self):
+        fire = TypeFactory(name="fire")
+
+        warm_prefix_indexes()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_prefix_index(Type).startswith("fi"), [fire.id])
+            get_prefix_index(Pokemon)
+
+    def test_warm_prefix_indexes__error__logged(self):
+        with (
+            mock.patch.object(
+                prefix_index, "build_prefix_index", side_effect=RuntimeError
+            ),
+            self.assertLogs("core.prefix_index", level="ERROR"),
+        ):
+            warm_prefix_indexes()
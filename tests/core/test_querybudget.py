@@ -0,0 +1,55 @@
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from pokemons.views import TypeListView
+
+from core.querybudget import QueryBudgetExceeded, QueryRecorder
+from tests.factories.pokemons import TypeFactory
+
+
+@patch.object(TypeListView, "query_budget", 1)
+class QueryBudgetMiddlewareTest(TestCase):
+    def setUp(self):
+        TypeFactory.create_batch(2)
+        self.url = reverse("pokemons:type_list")
+
+    @override_settings(QUERY_BUDGET_MODE="raise")
+    def test_request__over_budget__raise_query_budget_exceeded(self):
+        with self.assertRaisesMessage(QueryBudgetExceeded, "executed 2 queries"):
+            self.client.get(self.url)
+
+    @override_settings(QUERY_BUDGET_MODE="log")
+    def test_request__over_budget_in_log_mode__logs_violation(self):
+        with self.assertLogs("core.middleware", "WARNING") as cm:
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(cm.records[0].view, "pokemons:type_list")
+        self.assertEqual(cm.records[0].queries, 2)
+
+    @override_settings(QUERY_BUDGET_MODE="off")
+    def test_request__off__does_not_check(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+
+
+class QueryRecorderTest(TestCase):
+    def test_get_report__repeated_statement__exceeded(self):
+        recorder = QueryRecorder()
+        recorder.statements.update(["SELECT 1", "SELECT 2", "SELECT 2"])
+
+        report = recorder.get_report("view", budget=None, max_repeats=1)
+
+        self.assertTrue(report.exceeded)
+        self.assertEqual(report.repeated, [("SELECT 2", 2)])
+        self.assertIn("2x SELECT 2", report.format())
+
+    def test_get_report__within_budget__not_exceeded(self):
+        recorder = QueryRecorder()
+        recorder.statements.update(["SELECT 1", "SELECT 2"])
+
+        report = recorder.get_report("view", budget=2, max_repeats=1)
+
+        self.assertFalse(report.exceeded)
@@ -0,0 +1,55 @@
+from django.test import TestCase
+from pokemons.models import Pokemon
+
+from core.prefix_index import PrefixIndex
+from core.search import rank_matches
+from tests.factories.pokemons import PokemonFactory
+
+
+class RankMatchesTest(TestCase):
+    def setUp(self):
+        self.raichu = PokemonFactory(name="Raichu")
+        self.pikachu = PokemonFactory(name="Pikachu")
+        self.chuck = PokemonFactory(name="Chuck")
+        self.chimchar = PokemonFactory(name="Chimchar")
+        PokemonFactory(name="Bulbasaur")
+
+    def test_rank_matches__prefix_matches_first__then_others(self):
+        matches = rank_matches(Pokemon.objects.all(), "chu", limit=5)
+
+        self.assertEqual(matches, [self.chuck, self.pikachu, self.raichu])
+
+    def test_rank_matches__limit__returns_top_matches(self):
+        matches = rank_matches(Pokemon.objects.all(), "chu", limit=2)
+
+        self.assertEqual(matches, [self.chuck, self.pikachu])
+
+    def test_rank_matches__short_term__returns_only_prefix_matches(self):
+        matches = rank_matches(Pokemon.objects.all(), "ch", limit=5)
+
+        self.assertEqual(matches, [self.chimchar, self.chuck])
+
+    def test_rank_matches__blank_term__returns_nothing(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(rank_matches(Pokemon.objects.all(), "  ", limit=5), [])
+
+    def test_rank_matches__values__returns_projected_rows(self):
+        matches = rank_matches(Pokemon.objects.values("id", "name"), "pik", limit=5)
+
+        self.assertEqual(matches, [{"id": self.pikachu.id, "name": "Pikachu"}])
+
+    def test_rank_matches__prefix_index__prefix_matches_from_index(self):
+        index = PrefixIndex(Pokemon.objects.values_list("name", "pk"))
+
+        with self.assertNumQueries(2):
+            matches = rank_matches(Pokemon.objects.all(), "chu", limit=5, index=index)
+
+        self.assertEqual(matches, [self.chuck, self.pikachu, self.raichu])
+
+    def test_rank_matches__prefix_index_without_matches__no_prefix_query(self):
+        index = PrefixIndex(Pokemon.objects.values_list("name", "pk"))
+
+        with self.assertNumQueries(1):
+            matches = rank_matches(Pokemon.objects.all(), "ach", limit=5, index=index)
+
+        self.assertEqual(matches, [self.pikachu])
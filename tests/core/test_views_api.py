@@ -0,0 +1,45 @@
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.integrations.tracking import start_run
+
+
+class SyncRunListAPIViewTest(APITestCase):
+    def setUp(self):
+        self.url = reverse("core_api:sync-run-list")
+        self.run = start_run("pokemon")
+        start_run("ability")
+
+    def test_get__staff_user__returns_runs_with_stages(self):
+        self.client.force_authenticate(User(username="admin", is_staff=True))
+
+        response = self.client.get(self.url, {"source": "pokemon"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        [run] = response.data["results"]
+        self.assertEqual(run["id"], self.run.pk)
+        self.assertEqual(run["status"], "running")
+        self.assertEqual(len(run["stages"]), 4)
+        self.assertEqual(run["stages"][0]["histogram"]["under_100ms"], 0)
+
+    def test_get__anonymous_user__forbidden(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class SyncRunDetailAPIViewTest(APITestCase):
+    def setUp(self):
+        self.run = start_run("pokemon")
+        self.url = reverse("core_api:sync-run-detail", kwargs={"pk": self.run.pk})
+
+    def test_get__staff_user__returns_run(self):
+        self.client.force_authenticate(User(username="admin", is_staff=True))
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["source"], "pokemon")
+        self.assertIsNone(response.data["entity_count"])
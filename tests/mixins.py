@@ -0,0 +1,47 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+from django.db import connection
+from django.http import HttpResponse
+from django.urls import resolve
+
+from core.querybudget import QueryRecorder, get_query_budget
+
+
+class QueryBudgetMixin:
+    """
+    Mixin of TestCase asserting the number of queries and repeated SQL statements.
+    """
+
+    @contextmanager
+    def assertMaxQueries(
+        self, budget: int | None, max_repeats: int | None = 1
+    ) -> Iterator[QueryRecorder]:
+        """
+        Assert that the block executes at most `budget` queries and no SQL statement
+        more than `max_repeats` times.
+        """
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            yield recorder
+
+        report = recorder.get_report("block", budget, max_repeats)
+        if report.exceeded:
+            self.fail(report.format())
+
+    def assertWithinQueryBudget(self, url: str, **extra) -> HttpResponse:
+        """
+        Assert that a GET request of the URL stays within the query budget of its view.
+
+        Returns:
+            The response
+        """
+        match = resolve(urlsplit(url).path)
+        budget = get_query_budget(match.func)
+        self.assertIsNotNone(budget, f"{match.view_name} declares no query budget")
+
+        with self.assertMaxQueries(budget):
+            response = self.client.get(url, **extra)
+        self.assertEqual(response.status_code, 200)
+        return response
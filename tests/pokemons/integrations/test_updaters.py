@@ -1,8 +1,14 @@
+from datetime import timedelta
+
+from django.db import connection
 from django.test import TestCase
-from pokemons.integrations.updaters import PokemonUpdater
-from pokemons.models import Ability, Pokemon, PokemonType, Type
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from pokemons.integrations.updaters import PokemonBulkUpdater, PokemonUpdater
+from pokemons.models import Ability, Pokemon, PokemonAbility, PokemonType, Type
 
-from core.integrations.updaters import DefaultUpdater
+from core.caching import get_dataset_version
+from core.integrations.updaters import BulkUpdater, DefaultUpdater
 from tests.factories.pokemons import AbilityFactory, PokemonFactory
 
 
@@ -43,6 +49,51 @@ class DefaultUpdaterTestCase(TestCase):
         self.assertEqual(ability.name, "drizzle")
         self.assertEqual(ability.is_main_series, True)
 
+    def test_update__same_data_saved__skips_writing(self):
+        DefaultUpdater(model_name="pokemons.Ability", data=self.data).create_or_update()
+
+        updater = DefaultUpdater(model_name="pokemons.Ability", data=self.data)
+        with self.assertNumQueries(1):
+            updater.create_or_update()
+
+        self.assertFalse(updater.changed)
+
+    def test_update__data_changed__updates_entity_and_fingerprint(self):
+        DefaultUpdater(model_name="pokemons.Ability", data=self.data).create_or_update()
+        fingerprint = Ability.objects.get(id=2).fingerprint
+
+        data = {**self.data, "name": "new_name"}
+        updater = DefaultUpdater(model_name="pokemons.Ability", data=data)
+        updater.create_or_update()
+
+        ability = Ability.objects.get(id=2)
+        self.assertTrue(updater.changed)
+        self.assertEqual(ability.name, "new_name")
+        self.assertNotEqual(ability.fingerprint, fingerprint)
+
+    def test_update__data_changed__bumps_dataset_version_on_commit(self):
+        version = get_dataset_version()
+
+        updater = DefaultUpdater(model_name="pokemons.Ability", data=self.data)
+        with self.captureOnCommitCallbacks(execute=True):
+            updater.create_or_update()
+
+        self.assertNotEqual(get_dataset_version(), version)
+
+    def test_update__same_data_saved__keeps_dataset_version(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            DefaultUpdater(
+                model_name="pokemons.Ability", data=self.data
+            ).create_or_update()
+        version = get_dataset_version()
+
+        updater = DefaultUpdater(model_name="pokemons.Ability", data=self.data)
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            updater.create_or_update()
+
+        self.assertEqual(callbacks, [])
+        self.assertEqual(get_dataset_version(), version)
+
 
 class PokemonUpdaterTestCase(TestCase):
     def setUp(self):
@@ -117,3 +168,174 @@ class PokemonUpdaterTestCase(TestCase):
 
     def test_update__entities_exist__updates_entity(self):
         pokemon = PokemonFactory(id=42)
+
+    def test_update__same_data_saved__skips_many_to_many_fields(self):
+        PokemonUpdater(model_name="pokemons.Pokemon", data=self.data).create_or_update()
+        PokemonType.objects.all().delete()
+
+        updater = PokemonUpdater(model_name="pokemons.Pokemon", data=self.data)
+        with self.assertNumQueries(1):
+            updater.create_or_update()
+
+        self.assertEqual(PokemonType.objects.count(), 0)
+
+    def test_update__more_relations__same_number_of_queries(self):
+        with CaptureQueriesContext(connection) as context:
+            PokemonUpdater(
+                model_name="pokemons.Pokemon", data=self.data
+            ).create_or_update()
+        queries_number = len(context.captured_queries)
+
+        data = {
+            **self.data,
+            "id": 43,
+            "abilities": self.data["abilities"]
+            + [
+                {
+                    "ability": {"id": 34, "name": "chlorophyll"},
+                    "is_hidden": True,
+                    "slot": 3,
+                }
+            ],
+            "types": self.data["types"][:1],
+        }
+        with CaptureQueriesContext(connection) as context:
+            PokemonUpdater(model_name="pokemons.Pokemon", data=data).create_or_update()
+
+        self.assertEqual(len(context.captured_queries), queries_number)
+        self.assertEqual(PokemonAbility.objects.filter(pokemon_id=43).count(), 2)
+
+    def test_update__type_removed__deletes_stale_link(self):
+        PokemonUpdater(model_name="pokemons.Pokemon", data=self.data).create_or_update()
+
+        data = {**self.data, "types": self.data["types"][:1]}
+        PokemonUpdater(model_name="pokemons.Pokemon", data=data).create_or_update()
+
+        self.assertEqual(
+            list(PokemonType.objects.values_list("type_id", "slot")), [(12, 1)]
+        )
+
+    def test_update__data_changed__updates_modification_times(self):
+        PokemonUpdater(model_name="pokemons.Pokemon", data=self.data).create_or_update()
+        past = timezone.now() - timedelta(days=1)
+        for model in [Pokemon, Type, Ability]:
+            model.objects.update(updated_at=past)
+
+        data = {**self.data, "weight": 70}
+        PokemonUpdater(model_name="pokemons.Pokemon", data=data).create_or_update()
+
+        self.assertGreater(Pokemon.objects.get(id=42).updated_at, past)
+        self.assertGreater(Type.objects.get(id=12).updated_at, past)
+        self.assertGreater(Ability.objects.get(id=65).updated_at, past)
+
+    def test_update__type_removed__updates_modification_time_of_type(self):
+        PokemonUpdater(model_name="pokemons.Pokemon", data=self.data).create_or_update()
+        past = timezone.now() - timedelta(days=1)
+        Type.objects.update(updated_at=past)
+
+        data = {**self.data, "types": self.data["types"][:1]}
+        PokemonUpdater(model_name="pokemons.Pokemon", data=data).create_or_update()
+
+        self.assertGreater(Type.objects.get(id=4).updated_at, past)
+
+
+class BulkUpdaterTestCase(TestCase):
+    def test_update__creates_and_updates_entities(self):
+        AbilityFactory(id=1, name="old_name", is_main_series=False)
+        data = [
+            {"id": 1, "name": "stench", "is_main_series": True},
+            {"id": 2, "name": "drizzle", "is_main_series": True},
+        ]
+
+        updater = BulkUpdater(model_name="pokemons.Ability", data=data)
+        updater.create_or_update()
+
+        self.assertEqual(Ability.objects.count(), 2)
+        self.assertEqual(Ability.objects.get(id=1).name, "stench")
+        self.assertEqual(Ability.objects.get(id=2).name, "drizzle")
+        self.assertEqual(len(updater.instances), 2)
+
+    def test_upsert__unsorted_rows__inserts_them_in_key_order(self):
+        rows = [
+            {"id": 3, "name": "speed-boost", "is_main_series": True},
+            {"id": 1, "name": "stench", "is_main_series": True},
+            {"id": 2, "name": "drizzle", "is_main_series": True},
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            instances = BulkUpdater.upsert(Ability, rows)
+
+        self.assertEqual([instance.id for instance in instances], [1, 2, 3])
+        sql = queries.captured_queries[-1]["sql"]
+        self.assertLess(sql.index("stench"), sql.index("drizzle"))
+        self.assertLess(sql.index("drizzle"), sql.index("speed-boost"))
+
+    def test_update__some_entities_unchanged__writes_only_changed(self):
+        data = [
+            {"id": 1, "name": "stench", "is_main_series": True},
+            {"id": 2, "name": "drizzle", "is_main_series": True},
+        ]
+        BulkUpdater(model_name="pokemons.Ability", data=data).create_or_update()
+
+        data[1] = {"id": 2, "name": "new_name", "is_main_series": True}
+        updater = BulkUpdater(model_name="pokemons.Ability", data=data)
+        updater.create_or_update()
+
+        self.assertEqual(updater.changed_entities, [data[1]])
+        self.assertEqual(Ability.objects.get(id=2).name, "new_name")
+
+
+class PokemonBulkUpdaterTestCase(TestCase):
+    def get_pokemon_data(self, id_: int, types: list[tuple[int, str]]) -> dict:
+        return {
+            "id": id_,
+            "name": f"pokemon-{id_}",
+            "weight": 10,
+            "height": 1,
+            "front_sprite": None,
+            "abilities": [
+                {
+                    "ability": {"id": 65, "name": "overgrow"},
+                    "is_hidden": False,
+                    "slot": 1,
+                }
+            ],
+            "types": [
+                {"slot": slot, "type": {"id": type_id, "name": name}}
+                for slot, (type_id, name) in enumerate(types, start=1)
+            ],
+        }
+
+    def test_update__shared_relations__creates_entities_once(self):
+        data = [
+            self.get_pokemon_data(1, [(12, "grass"), (4, "poison")]),
+            self.get_pokemon_data(2, [(12, "grass")]),
+        ]
+
+        PokemonBulkUpdater(model_name="pokemons.Pokemon", data=data).create_or_update()
+
+        self.assertEqual(Pokemon.objects.count(), 2)
+        self.assertEqual(Type.objects.count(), 2)
+        self.assertEqual(Ability.objects.count(), 1)
+        self.assertEqual(PokemonType.objects.count(), 3)
+        self.assertEqual(PokemonAbility.objects.count(), 2)
+
+    def test_update__more_entities__same_number_of_queries(self):
+        data = [self.get_pokemon_data(1, [(12, "grass")])]
+        with CaptureQueriesContext(connection) as context:
+            PokemonBulkUpdater(
+                model_name="pokemons.Pokemon", data=data
+            ).create_or_update()
+        queries_number = len(context.captured_queries)
+
+        data = [
+            self.get_pokemon_data(id_, [(12, "grass"), (100 + id_, f"type-{id_}")])
+            for id_ in range(2, 22)
+        ]
+        with CaptureQueriesContext(connection) as context:
+            PokemonBulkUpdater(
+                model_name="pokemons.Pokemon", data=data
+            ).create_or_update()
+
+        self.assertEqual(len(context.captured_queries), queries_number)
+        self.assertEqual(Pokemon.objects.count(), 21)
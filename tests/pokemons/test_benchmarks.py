@@ -0,0 +1,71 @@
+from django.test import TestCase
+from pokemons.benchmarks import (
+    MISSING_TERM,
+    SEARCHES,
+    flush,
+    get_scenarios,
+    get_search_queryset,
+    get_search_terms,
+    seed,
+)
+from pokemons.models import Pokemon, PokemonAbility, PokemonType, Type
+
+from core.benchmarks.load import InProcessTarget
+
+
+class SeedTest(TestCase):
+    def test_seed__inserts_pokemons_with_types_and_abilities(self):
+        seed(25, types=3, abilities=4, batch_size=10, seed=1)
+
+        self.assertEqual(Pokemon.objects.count(), 25)
+        self.assertEqual(Type.objects.count(), 3)
+        self.assertEqual(PokemonType.objects.values("pokemon").distinct().count(), 25)
+        self.assertEqual(
+            PokemonAbility.objects.values("pokemon").distinct().count(), 25
+        )
+
+    def test_flush__deletes_dataset(self):
+        seed(5, types=2, abilities=2)
+
+        flush()
+
+        self.assertFalse(Pokemon.objects.exists())
+        self.assertFalse(Type.objects.exists())
+
+
+class GetScenariosTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed(30, types=3, abilities=4, seed=1)
+
+    def test_get_scenarios__all_requests_succeed(self):
+        # Requests over their query budgets fail in tests
+        target = InProcessTarget()
+
+        for scenario in get_scenarios(seed=1):
+            with self.subTest(scenario.name):
+                sample = target.request(scenario.get_path(), scenario.headers)
+
+                self.assertEqual(sample.status, 200)
+
+
+class SearchTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed(30, types=3, abilities=4, seed=1)
+
+    def get_ids(self, search: str, lookup: str, term: str) -> set[int]:
+        return {row["pk"] for row in get_search_queryset(search, lookup, term)}
+
+    def test_get_search_queryset__lookups_return_same_matches(self):
+        fragment, name, missing = get_search_terms(seed=1)
+
+        self.assertEqual(missing, MISSING_TERM)
+        for search in SEARCHES:
+            for term in [fragment, name, missing]:
+                with self.subTest(search=search, term=term):
+                    self.assertEqual(
+                        self.get_ids(search, "trigram_icontains", term),
+                        self.get_ids(search, "icontains", term),
+                    )
+        self.assertTrue(self.get_ids("pokemon.name", "trigram_icontains", name))
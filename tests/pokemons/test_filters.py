@@ -19,6 +19,12 @@ class TypeFilterTest(TestCase):
             filterset.qs, [self.type_1], transform=lambda x: x, ordered=False
         )
 
+    def test_filter_by_name_icontains__uses_trigram_lookup(self):
+        name_filter = TypeFilter.base_filters["name__icontains"]
+
+        self.assertEqual(name_filter.lookup_expr, "trigram_icontains")
+        self.assertEqual(name_filter.label, "Name contains")
+
     def test_ordering(self):
         filter_data = {"o": "id"}
         filterset = TypeFilter(filter_data, queryset=Type.objects.all())
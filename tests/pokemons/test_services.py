@@ -1,6 +1,13 @@
+from django.core.cache import cache
 from django.test import RequestFactory, SimpleTestCase, TestCase
-from pokemons.services import PokemonComparisonInformation, change_filter_ordering
-
+from pokemons.services import (
+    PokemonComparisonInformation,
+    change_filter_ordering,
+    search_pokemons,
+)
+
+from core.caching import bump_dataset_version
+from core.prefix_index import clear_prefix_indexes
 from tests.factories.pokemons import PokemonFactory
 
 
@@ -127,3 +134,45 @@ class PokemonComparisonInformationTestCase(TestCase):
 
         self.comparison_info.add_pokemon(3)
         self.assertTrue(self.comparison_info.is_full())
+
+
+class SearchPokemonsTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        clear_prefix_indexes()
+        self.pikachu = PokemonFactory(name="Pikachu")
+        self.raichu = PokemonFactory(name="Raichu")
+
+    def test_search_pokemons__returns_ranked_projected_matches(self):
+        pokemons = search_pokemons(" CHU ")
+
+        self.assertEqual(
+            [pokemon["id"] for pokemon in pokemons], [self.pikachu.id, self.raichu.id]
+        )
+        self.assertEqual(set(pokemons[0]), {"id", "name", "front_sprite"})
+
+    def test_search_pokemons__limit__returns_top_matches(self):
+        pokemons = search_pokemons("chu", limit=1)
+
+        self.assertEqual([pokemon["id"] for pokemon in pokemons], [self.pikachu.id])
+
+    def test_search_pokemons__repeated_term__served_from_cache(self):
+        search_pokemons("pika")
+
+        with self.assertNumQueries(0):
+            pokemons = search_pokemons("Pika")
+        self.assertEqual([pokemon["id"] for pokemon in pokemons], [self.pikachu.id])
+
+    def test_search_pokemons__dataset_version_bumped__searches_again(self):
+        search_pokemons("pik")
+        PokemonFactory(name="Pikipek")
+        self.assertEqual(len(search_pokemons("pik")), 1)
+        bump_dataset_version()
+
+        pokemons = search_pokemons("pik")
+
+        self.assertEqual(len(pokemons), 2)
+
+    def test_search_pokemons__blank_term__returns_nothing(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(search_pokemons(""), [])
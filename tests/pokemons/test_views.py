@@ -1,7 +1,16 @@
-from django.test import TestCase
+from unittest import skipUnless
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
 from django.urls import reverse
+from pokemons.models import PokemonAbility, PokemonType
+from pokemons.views import PokemonListView
 
+from core.caching import bump_dataset_version
+from core.prefix_index import clear_prefix_indexes
 from tests.factories.pokemons import AbilityFactory, PokemonFactory, TypeFactory
+from tests.mixins import QueryBudgetMixin
 
 
 class PokemonDetailViewTest(TestCase):
@@ -17,6 +26,23 @@ class PokemonDetailViewTest(TestCase):
 
         self.assertContains(response, self.pokemon.name)
 
+    def test_get__with_matching_etag__returns_304(self):
+        url = reverse("pokemons:pokemon_detail", kwargs={"pk": self.pokemon.id})
+        etag = self.client.get(url).headers["ETag"]
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, headers={"If-None-Match": etag})
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_get__htmx_request__returns_other_etag(self):
+        url = reverse("pokemons:pokemon_detail", kwargs={"pk": self.pokemon.id})
+
+        page = self.client.get(url)
+        partial = self.client.get(url, headers={"HX-Request": "true"})
+
+        self.assertNotEqual(page.headers["ETag"], partial.headers["ETag"])
+
 
 class ChangePageViewTest(TestCase):
     def test_get(self):
@@ -122,6 +148,36 @@ class ComparisonPokemonListViewTest(TestCase):
         self.assertContains(response, "Squirtle")
 
 
+class PokemonTypeaheadViewTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        clear_prefix_indexes()
+        self.pikachu = PokemonFactory(name="Pikachu")
+        self.raichu = PokemonFactory(name="Raichu")
+        PokemonFactory(name="Charmander")
+
+    def test_get__returns_ranked_matches(self):
+        response = self.client.get(
+            reverse("pokemons:pokemon_typeahead"), data={"q": "chu"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [pokemon["id"] for pokemon in response.context["pokemons"]],
+            [self.pikachu.id, self.raichu.id],
+        )
+        self.assertContains(
+            response, reverse("pokemons:comparison_add_pokemon", args=[self.pikachu.id])
+        )
+        self.assertNotContains(response, "Charmander")
+
+    def test_get__no_term__returns_empty_list(self):
+        response = self.client.get(reverse("pokemons:pokemon_typeahead"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["pokemons"], [])
+
+
 class ComparisonAddPokemonViewTest(TestCase):
     def setUp(self):
         session = self.client.session
@@ -261,3 +317,249 @@ class PokemonListViewTest(TestCase):
         self.assertContains(response, self.pokemon1.name)
         self.assertContains(response, self.pokemon2.name)
         self.assertNotContains(response, self.pokemon3.name)
+
+
+@override_settings(HTML_KEYSET_PAGINATION=True)
+class KeysetPaginationViewTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.size = PokemonListView.paginate_by
+        self.names = [f"Pokemon {i:03}" for i in range(self.size * 2 + 1)]
+        for name in self.names:
+            PokemonFactory(name=name)
+        self.url = reverse("pokemons:pokemon_list")
+
+    def get_page(self, **data):
+        response = self.client.get(self.url, data=data, headers={"HX-Request": "true"})
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def get_names(self, response) -> list[str]:
+        return [pokemon.name for pokemon in response.context["pokemons"]]
+
+    def test_get__without_cursor__returns_first_page_with_next_cursor(self):
+        response = self.get_page()
+
+        page = response.context["page_obj"]
+        self.assertEqual(self.get_names(response), self.names[: self.size])
+        self.assertTrue(page.has_next())
+        self.assertFalse(page.has_previous())
+        self.assertTemplateUsed(response, "pokemons/keyset_pagination.html")
+        self.assertTemplateNotUsed(response, "pokemons/pagination.html")
+
+    def test_get__with_cursors__pages_forward_and_back(self):
+        first = self.get_page()
+        second = self.get_page(cursor=first.context["page_obj"].next_cursor)
+        third = self.get_page(cursor=second.context["page_obj"].next_cursor)
+        back = self.get_page(cursor=third.context["page_obj"].previous_cursor)
+
+        self.assertEqual(self.get_names(second), self.names[self.size : self.size * 2])
+        self.assertEqual(self.get_names(third), self.names[self.size * 2 :])
+        self.assertFalse(third.context["page_obj"].has_next())
+        self.assertEqual(self.get_names(back), self.get_names(second))
+        self.assertTrue(back.context["page_obj"].has_previous())
+
+    def test_get__with_ordering__pages_in_ordering(self):
+        names = self.names[::-1]
+
+        first = self.get_page(o="-name")
+        second = self.get_page(o="-name", cursor=first.context["page_obj"].next_cursor)
+
+        self.assertEqual(self.get_names(first), names[: self.size])
+        self.assertEqual(self.get_names(second), names[self.size : self.size * 2])
+
+    def test_get__with_cursor_of_other_ordering__returns_first_page(self):
+        first = self.get_page()
+
+        response = self.get_page(
+            o="-name", cursor=first.context["page_obj"].next_cursor
+        )
+
+        self.assertEqual(self.get_names(response), self.names[::-1][: self.size])
+
+    def test_get__with_invalid_cursor__returns_first_page(self):
+        response = self.get_page(cursor="invalid")
+
+        self.assertEqual(self.get_names(response), self.names[: self.size])
+
+    def test_get__with_filter__counts_filtered_list(self):
+        PokemonFactory(name="Zubat")
+
+        response = self.get_page(name__icontains="Pokemon")
+
+        self.assertEqual(response.context["page_obj"].count, len(self.names))
+        self.assertContains(response, f"{len(self.names)} total")
+
+    @override_settings(HTML_KEYSET_COUNT_TIMEOUT=0)
+    def test_get__with_count_timeout_zero__shows_no_count(self):
+        response = self.get_page()
+
+        self.assertIsNone(response.context["page_obj"].count)
+        self.assertNotContains(response, " total")
+
+    def test_get__with_cached_count__returns_cached_count(self):
+        self.get_page(name__icontains="Pokemon")
+        PokemonFactory(name="Pokemon 999")
+
+        response = self.get_page(name__icontains="Pokemon")
+
+        self.assertEqual(response.context["page_obj"].count, len(self.names))
+
+    @skipUnless(connection.vendor == "postgresql", "estimates exist only on Postgres")
+    def test_get__without_filter__counts_or_estimates_in_one_query(self):
+        # The page, the prefetched types and abilities, and the count
+        with self.assertNumQueries(4):
+            response = self.get_page()
+        page = response.context["page_obj"]
+        self.assertEqual((page.count, page.approximate), (len(self.names), False))
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE pokemons_pokemon")
+        response = self.get_page()
+
+        page = response.context["page_obj"]
+        self.assertEqual((page.count, page.approximate), (len(self.names), True))
+
+    def test_get__type_and_ability_lists__paginate_by_cursor(self):
+        TypeFactory.create_batch(self.size + 1)
+        AbilityFactory.create_batch(self.size + 1)
+        for name in ["pokemons:type_list", "pokemons:ability_list"]:
+            with self.subTest(name=name):
+                response = self.client.get(reverse(name))
+
+                page = response.context["page_obj"]
+                self.assertEqual(len(page.object_list), self.size)
+                self.assertTrue(page.has_next())
+
+    @override_settings(HTML_KEYSET_PAGINATION=False)
+    def test_get__with_keyset_pagination_disabled__uses_paginator(self):
+        response = self.get_page()
+
+        self.assertEqual(response.context["paginator"].count, len(self.names))
+        self.assertTemplateUsed(response, "pokemons/pagination.html")
+
+
+@override_settings(VIEW_CACHE=True)
+class VersionedCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.pokemon = PokemonFactory(name="Pikachu")
+        self.url = reverse("pokemons:pokemon_list")
+
+    def test_get__cached__returns_cached_response_without_queries(self):
+        first = self.client.get(self.url)
+
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second.headers["Content-Type"], first.headers["Content-Type"])
+        self.assertIn("HX-Request", second.headers["Vary"])
+
+    def test_get__htmx_request__caches_partial_separately(self):
+        self.client.get(self.url)
+
+        response = self.client.get(self.url, headers={"HX-Request": "true"})
+
+        self.assertNotContains(response, "<body>")
+
+    def test_get__other_filter__misses_cache(self):
+        self.client.get(self.url, data={"name__icontains": "pika"})
+        PokemonFactory(name="Raichu")
+
+        response = self.client.get(self.url, data={"name__icontains": "rai"})
+
+        self.assertContains(response, "Raichu")
+
+    def test_get__blank_and_unknown_params__share_cache_entry(self):
+        self.client.get(self.url, data={"name__icontains": "pika"})
+
+        with self.assertNumQueries(0):
+            self.client.get(
+                self.url, data={"name__icontains": " pika ", "o": "", "_": "1"}
+            )
+
+    def test_get__dataset_version_bumped__returns_fresh_response(self):
+        self.client.get(self.url)
+        PokemonFactory(name="Raichu")
+
+        stale = self.client.get(self.url)
+        bump_dataset_version()
+        fresh = self.client.get(self.url)
+
+        self.assertNotContains(stale, "Raichu")
+        self.assertContains(fresh, "Raichu")
+
+    def test_get__detail_view__cached_by_pk(self):
+        type_, other = TypeFactory(name="Fire"), TypeFactory(name="Water")
+        url = reverse("pokemons:type_detail", kwargs={"pk": type_.pk})
+        self.client.get(url)
+
+        response = self.client.get(
+            reverse("pokemons:type_detail", kwargs={"pk": other.pk})
+        )
+
+        self.assertContains(response, "Water")
+        with self.assertNumQueries(0):
+            self.client.get(url)
+
+    def test_get__not_found__not_cached(self):
+        url = reverse("pokemons:pokemon_detail", kwargs={"pk": 999})
+        self.client.get(url)
+        PokemonFactory(id=999, name="Raichu")
+
+        response = self.client.get(url)
+
+        self.assertContains(response, "Raichu")
+
+
+class QueryBudgetTest(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        self.types = TypeFactory.create_batch(3)
+        self.abilities = AbilityFactory.create_batch(3)
+        self.pokemons = PokemonFactory.create_batch(3, name="Pokemon")
+        for pokemon in self.pokemons:
+            for slot, (type_, ability) in enumerate(
+                zip(self.types, self.abilities), start=1
+            ):
+                PokemonType.objects.create(pokemon=pokemon, type=type_, slot=slot)
+                PokemonAbility.objects.create(
+                    pokemon=pokemon, ability=ability, slot=slot
+                )
+
+        session = self.client.session
+        session["pokemon_comparison_ids"] = [pokemon.id for pokemon in self.pokemons]
+        session.save()
+
+    def test_list_views__within_budget(self):
+        for name in ["pokemon_list", "type_list", "ability_list"]:
+            with self.subTest(name=name):
+                self.assertWithinQueryBudget(reverse(f"pokemons:{name}"))
+
+    @override_settings(HTML_KEYSET_PAGINATION=True)
+    def test_list_views__with_keyset_pagination__within_budget(self):
+        cache.clear()
+        for name in ["pokemon_list", "type_list", "ability_list"]:
+            with self.subTest(name=name):
+                url = reverse(f"pokemons:{name}")
+                response = self.assertWithinQueryBudget(url)
+                cursor = response.context["page_obj"].next_cursor
+                self.assertWithinQueryBudget(f"{url}?cursor={cursor}")
+
+    def test_detail_views__within_budget(self):
+        urls = [
+            reverse("pokemons:pokemon_detail", kwargs={"pk": self.pokemons[0].pk}),
+            reverse("pokemons:type_detail", kwargs={"pk": self.types[0].pk}),
+            reverse("pokemons:ability_detail", kwargs={"pk": self.abilities[0].pk}),
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertWithinQueryBudget(url)
+
+    def test_comparison_views__within_budget(self):
+        self.assertWithinQueryBudget(reverse("pokemons:comparison"))
+        self.assertWithinQueryBudget(
+            reverse("pokemons:comparison_pokemon_list") + "?name__icontains=pok"
+        )
+        self.assertWithinQueryBudget(reverse("pokemons:pokemon_typeahead") + "?q=pok")
@@ -1,9 +1,15 @@
+from datetime import timedelta
+
 from django.urls import reverse
-from pokemons.models import PokemonType
+from django.utils import timezone
+from django.utils.http import http_date
+from pokemons.models import Pokemon, PokemonType
 from rest_framework import status
 from rest_framework.test import APITestCase
 
+from core.caching import bump_dataset_version
 from tests.factories.pokemons import AbilityFactory, PokemonFactory, TypeFactory
+from tests.mixins import QueryBudgetMixin
 
 
 class TypeListAPIViewTest(APITestCase):
@@ -145,3 +151,161 @@ class AbilityDetailAPIViewTest(APITestCase):
         response = self.client.get(invalid_url)
 
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class KeysetPaginationAPITest(APITestCase):
+    def setUp(self):
+        self.url = reverse("pokemons_api:type-list")
+        names = ["Fire", "Water", "Fire", "Grass", "Bug"]
+        self.types = [TypeFactory(name=name) for name in names]
+
+    def get_names(self, response) -> list[str]:
+        return [t["name"] for t in response.data["results"]]
+
+    def test_get__next_links__return_all_results_in_order(self):
+        names = []
+        url = f"{self.url}?limit=2"
+        while url:
+            response = self.client.get(url)
+            names += self.get_names(response)
+            url = response.data["next"]
+
+        self.assertEqual(names, ["Bug", "Fire", "Fire", "Grass", "Water"])
+
+    def test_get__previous_link__returns_previous_page(self):
+        first = self.client.get(f"{self.url}?limit=2")
+        second = self.client.get(first.data["next"])
+
+        response = self.client.get(second.data["previous"])
+
+        self.assertEqual(self.get_names(response), ["Bug", "Fire"])
+        self.assertIsNone(response.data["previous"])
+
+    def test_get__ordering__paginates_in_ordering(self):
+        first = self.client.get(f"{self.url}?limit=3&o=-name")
+        second = self.client.get(first.data["next"])
+
+        self.assertEqual(
+            self.get_names(first) + self.get_names(second),
+            ["Water", "Grass", "Fire", "Fire", "Bug"],
+        )
+
+    def test_get__cursor_of_other_ordering__returns_404(self):
+        first = self.client.get(f"{self.url}?limit=2")
+
+        response = self.client.get(first.data["next"].replace("limit=2", "o=-name"))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_get__count_false__omits_count(self):
+        response = self.client.get(f"{self.url}?count=false")
+
+        self.assertNotIn("count", response.data)
+        self.assertEqual(len(response.data["results"]), 5)
+
+    def test_get__default__includes_count(self):
+        response = self.client.get(f"{self.url}?limit=2")
+
+        self.assertEqual(response.data["count"], 5)
+
+    def test_get__name_filter__returns_matching_results(self):
+        response = self.client.get(f"{self.url}?name__icontains=fir")
+
+        self.assertEqual(self.get_names(response), ["Fire", "Fire"])
+
+
+class ConditionalAPITest(APITestCase):
+    def setUp(self):
+        self.pokemon = PokemonFactory(name="Pikachu")
+        self.detail_url = reverse(
+            "pokemons_api:pokemon-detail", kwargs={"pk": self.pokemon.pk}
+        )
+        self.list_url = reverse("pokemons_api:pokemon-list")
+
+    def test_get__detail__returns_validators(self):
+        response = self.client.get(self.detail_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.headers["ETag"].startswith('W/"'))
+        self.assertEqual(
+            response.headers["Last-Modified"],
+            http_date(int(self.pokemon.updated_at.timestamp())),
+        )
+
+    def test_get__detail_with_matching_etag__returns_304_with_one_query(self):
+        etag = self.client.get(self.detail_url).headers["ETag"]
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.detail_url, headers={"If-None-Match": etag})
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+
+    def test_get__detail_with_last_modified__returns_304(self):
+        last_modified = self.client.get(self.detail_url).headers["Last-Modified"]
+
+        response = self.client.get(
+            self.detail_url, headers={"If-Modified-Since": last_modified}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_get__detail_modified__returns_200(self):
+        etag = self.client.get(self.detail_url).headers["ETag"]
+        Pokemon.objects.filter(pk=self.pokemon.pk).update(
+            updated_at=timezone.now() + timedelta(seconds=1)
+        )
+
+        response = self.client.get(self.detail_url, headers={"If-None-Match": etag})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_get__detail_other_format__returns_other_etag(self):
+        json = self.client.get(self.detail_url).headers["ETag"]
+
+        api = self.client.get(self.detail_url, headers={"Accept": "text/html"})
+
+        self.assertNotEqual(api.headers["ETag"], json)
+
+    def test_get__list_with_matching_etag__returns_304_without_query(self):
+        etag = self.client.get(self.list_url).headers["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.list_url, headers={"If-None-Match": etag})
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertNotIn("Last-Modified", response.headers)
+
+    def test_get__list_with_other_filter__returns_200(self):
+        etag = self.client.get(self.list_url).headers["ETag"]
+
+        response = self.client.get(
+            self.list_url,
+            data={"name__icontains": "pika"},
+            headers={"If-None-Match": etag},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_get__list_after_sync__returns_200(self):
+        etag = self.client.get(self.list_url).headers["ETag"]
+        bump_dataset_version()
+
+        response = self.client.get(self.list_url, headers={"If-None-Match": etag})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class QueryBudgetAPITest(QueryBudgetMixin, APITestCase):
+    def setUp(self):
+        self.types = TypeFactory.create_batch(3)
+        self.pokemons = PokemonFactory.create_batch(3)
+        for pokemon in self.pokemons:
+            for slot, type_ in enumerate(self.types, start=1):
+                PokemonType.objects.create(pokemon=pokemon, type=type_, slot=slot)
+
+    def test_pokemon_views__within_budget(self):
+        self.assertWithinQueryBudget(reverse("pokemons_api:pokemon-list"))
+        self.assertWithinQueryBudget(
+            reverse("pokemons_api:pokemon-detail", kwargs={"pk": self.pokemons[0].pk})
+        )